@@ -2,29 +2,44 @@
 import sys
 import textwrap
 import argparse
-from platform import system
+from re import match
 
-from _libraries.pwd_generator_lib import PwdGen
-from _libraries.xkcd_generator_lib import XKCD
-from _libraries.menu_lib import Menu
+from _libraries.pwd_options_lib import CMD_OPTIONS_DEFAULTS
+from _libraries.dict_manifest_lib import DictionaryError
+from _libraries.policy_lib import parse_policy
+from _libraries import logger_lib
 # endregion
 
 
 class ArgumentParser():
+    # region ClassConst
+    # опции массовой (bulk) генерации и работы с сервисом генерации; при проверке допустимых сочетаний опций они не учитываются
+    # (см. __get_mode_argv). SERVICE_OPTIONS - опции со значением, SERVICE_FLAGS - опции без значения
+    SERVICE_OPTIONS = ['--bulk', '-o', '--output', '--workers', '--socket', '--http', '--profile-output', '--issued', '--sampling', '--pattern',
+                       '--rng', '--seed', '--min-length', '--max-length', '--length', '--require', '--forbid']
+    SERVICE_FLAGS = ['--client', '--benchmark', '--profile', '--unique', '--entropy']
+    # количество парольных фраз, которые накапливаются перед записью одним блоком, и размер буфера файла вывода
+    BULK_BLOCK_SIZE = 4096
+    BULK_BUFFER_SIZE = 1024 * 1024
+    # endregion ClassConst
+
     # default constructor
     def __init__(self, dict_filespath:str, conf_filename:str) -> None:
         # инициализация объекта, раелизующего интерфейс командной строки
         self.__parser = None
         self.__args = None
+        self.__argv = None
+        # объект, реализующий непосредственно генерацию парольных фраз, создается при первом обращении (см. __get_pwd_gen):
+        # режимы, которые его не используют (--help, --xkcd, --client), не загружают генератор, конфигурацию и словари
+        self.__pwd_gen = None
+        # объект параллельной генерации (см. __get_parallel_gen) используется для всех заданий запуска
+        self.__parallel_gen = None
         self.__xkcd_dict = dict_filespath + '/xkcd/eff_large_wordlist.txt'
+        self.__conf_filename = conf_filename
         self.__init_parser_obj()
 
-        # подготовка и инициализация объекта, реализующего непосредственно генерацию парольных фраз
-        if system() == 'Windows':
-            dict_filespath = dict_filespath + '/win'
-        else:
-            dict_filespath = dict_filespath + '/lin'
-        self.__pwd_gen = PwdGen(dict_filespath, conf_filename)
+        # каталог словарей (словари генератора PwdGen - см. __get_pwd_dict_filespath)
+        self.__dict_filespath = dict_filespath
     
     # default destructor
     def __del__(self):
@@ -55,9 +70,29 @@ class ArgumentParser():
                                         
                                 Generate passphrases with user (custom) parameters:
                                     pwdgen [-c COUNT] [-w WORD_COUNT] [-l LETTER_COUNT] [-n] [-s] [-u]
+
+                                Generate passphrases by a user pattern (a name from the [patterns] section of conf.ini or the pattern itself):
+                                    pwdgen [--compl {weak,standard,strong}] --pattern PATTERN [-c COUNT]
+
+                                Generate passphrases that satisfy a password policy (added to the [policy] section of conf.ini, if any):
+                                    pwdgen [--compl {weak,standard,strong}] [--min-length N] [--max-length N] [--require CLASSES] [--forbid CHARS]
+                                    pwdgen [--compl {weak,standard,strong}] --length N
                                    
-                                Generate password using xkcd library:
-                                    pwdgen [--xkcd {weak,standard,strong,super}] [-c COUNT]""")
+                                Generate password using xkcd library (optionally of the given length):
+                                    pwdgen [--xkcd {weak,standard,strong,super}] [-c COUNT] [--length N | --min-length N --max-length N]
+
+                                Bulk generation (any of the modes above, except the menu) streamed to stdout or a file:
+                                    pwdgen [--compl {weak,standard,strong}] --bulk N [--workers N] [-o OUTPUT]
+
+                                Run a generator service on a local Unix socket and request passwords from it:
+                                    pwdgen --serve [--socket SOCKET]
+                                    pwdgen --client [--socket SOCKET] [--compl {weak,standard,strong}] [-c COUNT]
+
+                                Run an HTTP generator service (GET /passphrase?compl=strong&count=N, GET /xkcd?compl=super):
+                                    pwdgen --http [HOST:]PORT
+
+                                Run the benchmark suite and print the results as JSON (or write them to a file):
+                                    pwdgen --benchmark [-o OUTPUT]""")
         )
         # добавление необходимых опций и их параметров (допустимые значения, значения по умолчанию, тип данных и прочее)
         self.__parser.add_argument('-m', '--main-menu',
@@ -74,20 +109,20 @@ class ArgumentParser():
                                    type=str,
                                    help='Complexity of the generated password (password is generated based on the xkcd library)')
         self.__parser.add_argument('-c', '--count',
-                                   choices=range(PwdGen.CMD_OPTIONS_DEFAULTS["count"]["min_val"], PwdGen.CMD_OPTIONS_DEFAULTS["count"]["max_val"] + 1),
-                                   default=PwdGen.CMD_OPTIONS_DEFAULTS["count"]["default"],
+                                   choices=range(CMD_OPTIONS_DEFAULTS["count"]["min_val"], CMD_OPTIONS_DEFAULTS["count"]["max_val"] + 1),
+                                   default=CMD_OPTIONS_DEFAULTS["count"]["default"],
                                    type=int,
                                    metavar='COUNT',
                                    help='Number of generated passwords') 
         self.__parser.add_argument('-w', '--word-count',
-                                   choices=range(PwdGen.CMD_OPTIONS_DEFAULTS["words_count"]["min_val"], PwdGen.CMD_OPTIONS_DEFAULTS["words_count"]["max_val"] + 1),
-                                   default=PwdGen.CMD_OPTIONS_DEFAULTS["words_count"]["default"],
+                                   choices=range(CMD_OPTIONS_DEFAULTS["words_count"]["min_val"], CMD_OPTIONS_DEFAULTS["words_count"]["max_val"] + 1),
+                                   default=CMD_OPTIONS_DEFAULTS["words_count"]["default"],
                                    type=int,
                                    metavar='WORD_COUNT',
                                    help='Number of words to be used in the passphrase')
         self.__parser.add_argument('-l', '--char-count',
-                                   choices=range(PwdGen.CMD_OPTIONS_DEFAULTS["char_count"]["min_val"], PwdGen.CMD_OPTIONS_DEFAULTS["char_count"]["max_val"] + 1),
-                                   default=PwdGen.CMD_OPTIONS_DEFAULTS["char_count"]["default"],
+                                   choices=range(CMD_OPTIONS_DEFAULTS["char_count"]["min_val"], CMD_OPTIONS_DEFAULTS["char_count"]["max_val"] + 1),
+                                   default=CMD_OPTIONS_DEFAULTS["char_count"]["default"],
                                    type=int,
                                    metavar='CHAR_COUNT',
                                    help='Number of first letters of each word to be used in the passphrase')
@@ -100,6 +135,160 @@ class ArgumentParser():
         self.__parser.add_argument('-u', '--upper-case',
                                    action='store_true',
                                    help='Use capital letters as part of the passphrase')
+        self.__parser.add_argument('--bulk',
+                                   type=self.__positive_int,
+                                   metavar='N',
+                                   help='Bulk mode: stream N generated passwords without the note (replaces -c,--count)')
+        self.__parser.add_argument('-o', '--output',
+                                   type=str,
+                                   metavar='OUTPUT',
+                                   help='Output file for the bulk mode and --benchmark (stdout by default; not accepted in other modes)')
+        self.__parser.add_argument('--workers',
+                                   type=self.__positive_int,
+                                   metavar='N',
+                                   help='Number of worker processes for the bulk mode (1 by default)')
+        self.__parser.add_argument('--unique',
+                                   action='store_true',
+                                   help='Guarantee that all generated passwords are distinct')
+        self.__parser.add_argument('--issued',
+                                   type=str,
+                                   metavar='FILE',
+                                   help='File of previously issued passwords (one per line) to exclude from the output (implies --unique)')
+        self.__parser.add_argument('--sampling',
+                                   choices=['word', 'prefix'],
+                                   default='word',
+                                   help='Word sampling: a random word (word, default) or a random distinct prefix of -l,--char-count letters '
+                                        '(prefix, maximum entropy per word)')
+        self.__parser.add_argument('--pattern',
+                                   type=str,
+                                   metavar='PATTERN',
+                                   help='Passphrase pattern: a pattern name from the [patterns] section of conf.ini or parts of speech '
+                                        '(ADJF ADVB NOUN NUMR INFN) separated by spaces, each with optional :LETTER_COUNT and '
+                                        ':{lower,title,upper} rules, e.g. "ADJF:4 NOUN INFN NUMR:upper NOUN" (replaces the pattern '
+                                        'chosen by the word count)')
+        self.__parser.add_argument('--min-length',
+                                   type=self.__positive_int,
+                                   metavar='N',
+                                   help='Password policy: minimum password length (also set in the [policy] section of conf.ini)')
+        self.__parser.add_argument('--max-length',
+                                   type=self.__positive_int,
+                                   metavar='N',
+                                   help='Password policy: maximum password length')
+        self.__parser.add_argument('--length',
+                                   type=self.__positive_int,
+                                   metavar='N',
+                                   help='Exact password length (the same as --min-length N --max-length N); --length, --min-length '
+                                        'and --max-length also apply to --xkcd')
+        self.__parser.add_argument('--require',
+                                   type=str,
+                                   metavar='CLASSES',
+                                   help='Password policy: character classes every password must contain, comma-separated (e.g. digit,upper)')
+        self.__parser.add_argument('--forbid',
+                                   type=str,
+                                   metavar='CHARS',
+                                   help='Password policy: characters that must not appear in passwords (e.g. "\"\'\\\\")')
+        self.__parser.add_argument('--rng',
+                                   choices=['system', 'drbg'],
+                                   default='system',
+                                   help='Source of random bytes: the OS (system, default) or a SHAKE128-based deterministic generator '
+                                        'seeded from the OS (drbg)')
+        self.__parser.add_argument('--seed',
+                                   type=str,
+                                   metavar='SEED',
+                                   help='Seed the deterministic generator (implies --rng drbg): the same command and seed always produce '
+                                        'the same passwords. For benchmarks, tests and load generation only, never for real passwords')
+        self.__parser.add_argument('--entropy',
+                                   action='store_true',
+                                   help='Print the entropy estimate of the passwords instead of generating them (of all presets if used alone)')
+        self.__parser.add_argument('--serve',
+                                   action='store_true',
+                                   help='Run a password generator service on a local Unix socket')
+        self.__parser.add_argument('--client',
+                                   action='store_true',
+                                   help='Request passwords from a running generator service instead of generating them locally')
+        self.__parser.add_argument('--http',
+                                   type=str,
+                                   metavar='[HOST:]PORT',
+                                   help='Run an HTTP password generator service (host 127.0.0.1 by default)')
+        self.__parser.add_argument('--socket',
+                                   type=str,
+                                   metavar='SOCKET',
+                                   help='Unix socket of the generator service ($XDG_RUNTIME_DIR/pwdgen.sock by default)')
+        self.__parser.add_argument('--profile',
+                                   action='store_true',
+                                   help='Print per-stage generation timings and RNG/dictionary counters to stderr at exit')
+        self.__parser.add_argument('--profile-output',
+                                   type=str,
+                                   metavar='PSTATS',
+                                   help='Also write cProfile statistics to PSTATS at exit (implies --profile)')
+        self.__parser.add_argument('--benchmark',
+                                   action='store_true',
+                                   help='Run the benchmark suite and print the results as JSON (or write them to -o OUTPUT)')
+
+    def __get_pwd_dict_filespath(self, ) -> str:
+        """
+        Получение каталога словарей генератора PwdGen (словари в кодировке UTF-8 и их манифест, см. dict_manifest_lib)
+        :return: каталог словарей
+        """
+        return self.__dict_filespath + '/ru'
+
+    def __get_pwd_gen(self, ):
+        """
+        Получение объекта, реализующего генерацию парольных фраз на основе слов русского языка. Объект (и модуль pwd_generator_lib)
+        создается при первом обращении, поэтому режимы, которые его не используют, запускаются быстрее
+        :return: объект PwdGen
+        """
+        if self.__pwd_gen is None:
+            from _libraries.pwd_generator_lib import PwdGen
+            self.__pwd_gen = PwdGen(self.__get_pwd_dict_filespath(), self.__conf_filename, randomizer=self.__get_randomizer('pwdgen'),
+                                    sampling=self.__args.sampling)
+        return self.__pwd_gen
+
+    def __get_xkcd(self, ):
+        """
+        Создание объекта, реализующего генерацию паролей на основе библиотеки xkcd (модуль xkcd_generator_lib импортируется только в режимах,
+        которые его используют)
+        :return: объект XKCD
+        """
+        from _libraries.xkcd_generator_lib import XKCD
+        return XKCD(self.__xkcd_dict, randomizer=self.__get_randomizer('xkcd'))
+
+    def __get_randomizer(self, engine:str):
+        """
+        Создание источника случайных чисел генератора паролей в соответствии с опциями --rng и --seed (см. drbg_lib)
+        :param engine: тип генератора: pwdgen или xkcd (строка персонализации детерминированного генератора)
+        :return: объект EntropyPool
+        """
+        from _libraries.drbg_lib import make_randomizer
+        return make_randomizer(self.__args.rng, self.__args.seed, engine)
+
+    @staticmethod
+    def __positive_int(value:str) -> int:
+        """
+        Преобразование значения опции в целое положительное число (используется для опций --bulk и --workers)
+        :param value: значение опции, введенное пользователем
+        :return: целое положительное число
+        """
+        if match(r'^[0-9]+$', value) is None or int(value) < 1:
+            raise argparse.ArgumentTypeError(f'invalid positive int value: \'{value}\'')
+        return int(value)
+
+    def __get_mode_argv(self, ) -> list:
+        """
+        Получение аргументов командной строки без опций массовой генерации и работы с сервисом (SERVICE_OPTIONS, SERVICE_FLAGS)
+        и их значений. Допустимые сочетания остальных опций проверяются так же, как и без этих опций
+        :return: список аргументов командной строки
+        """
+        argv = list()
+        skip_value = False
+        for arg in sys.argv:
+            if skip_value:
+                skip_value = False
+            elif arg in self.SERVICE_OPTIONS:
+                skip_value = True
+            elif arg.split('=')[0] not in self.SERVICE_OPTIONS + self.SERVICE_FLAGS:
+                argv.append(arg)
+        return argv
 
     def parse_arguments(self, ) -> None:
         """
@@ -113,39 +302,105 @@ class ArgumentParser():
         """
         # обработки пользовательских опций в объекте ArgumentParser
         self.__args = self.__parser.parse_args()
-        
+        self.__argv = self.__get_mode_argv()
+
+        # профилирование включается до создания генераторов (генератор проверяет, включено ли профилирование, при создании)
+        if self.__args.profile or self.__args.profile_output:
+            from _libraries.profiler_lib import profiler
+            profiler.enable(self.__args.profile_output)
+        # пароли, сгенерированные с заданным seed, воспроизводимы и не должны использоваться как настоящие пароли
+        if self.__args.seed is not None:
+            sys.stderr.write('[Warning] --seed makes the output reproducible: use it for benchmarks and tests only\n')
+
+        # словари генератора PwdGen проверяются при первом обращении к ним; при ошибке словарей работа утилиты прекращается
+        # с сообщением в логе (ошибки всех словарей сообщаются сразу)
+        try:
+            self.__run_mode()
+        except DictionaryError as err:
+            logger_lib.error('Dictionaries', err)
+
+    def __run_mode(self, ) -> None:
+        """
+        Запуск режима работы утилиты в соответствии с использованными опциями (см. parse_arguments)
+        :return: None
+        """
         # логика обработки опций по допустимым шаблонам
-        # использованы опции -m,--main-menu -> вызов консольного тестового меню. Имеет наивысший приоритет
-        if self.__args.main_menu:
+        # опция --workers допустима только в режиме массовой генерации, выполняемой локально
+        if self.__args.workers and (not self.__args.bulk or self.__args.client):
+            self.__incorrect_cmd_options_handler()
+
+        # источник случайных байтов (опции --rng, --seed) и способ выбора слов (опция --sampling) задаются только для локальной генерации:
+        # сервис использует собственные
+        elif self.__args.client and (self.__args.rng != 'system' or self.__args.seed is not None or self.__args.sampling not in (None, 'word')):
+            self.__incorrect_cmd_options_handler()
+
+        # опция -o,--output задает файл вывода массовой генерации (без --entropy, которая выводит только оценку энтропии) и набора бенчмарков;
+        # в остальных режимах результат выводится в stdout, поэтому файл не был бы записан
+        elif self.__args.output and not ((self.__args.bulk and not self.__args.entropy) or self.__args.benchmark):
+            logger_lib.error('-o/--output', 'the option is only supported with --bulk or --benchmark')
+
+        # опция --length задает минимальную и максимальную длину сразу, поэтому не сочетается с --min-length и --max-length
+        elif self.__args.length is not None and (self.__args.min_length is not None or self.__args.max_length is not None):
+            self.__incorrect_cmd_options_handler()
+
+        # использована опция --serve -> запуск сервиса генерации паролей. Допустимо указание только сокета сервиса
+        elif self.__args.serve:
+            if len(self.__argv) == 2 and not self.__args.client and not self.__args.bulk:
+                self.__serve()
+            else:
+                self.__incorrect_cmd_options_handler()
+
+        # использована опция --http -> запуск HTTP-сервиса генерации паролей. Допустимо указание только адреса сервиса
+        elif self.__args.http:
+            if len(self.__argv) == 1 and not self.__args.client and not self.__args.bulk:
+                self.__serve_http()
+            else:
+                self.__incorrect_cmd_options_handler()
+
+        # использована опция --benchmark -> запуск набора бенчмарков. Допустимо указание только файла для записи результатов
+        elif self.__args.benchmark:
+            if len(self.__argv) == 1 and not self.__args.client and not self.__args.bulk and not self.__args.workers:
+                self.__run_benchmark()
+            else:
+                self.__incorrect_cmd_options_handler()
+
+        # использована только опция --entropy -> вывод оценки энтропии паролей всех пресетов (способ выбора слов --sampling
+        # применяется к пресетам PwdGen таблицы)
+        elif (self.__args.entropy and len(self.__argv) == 1 and not self.__args.client and not self.__args.bulk
+              and not self.__has_pwdgen_options(with_sampling=False)
+              and not self.__get_policy_options()):
+            self.__print_entropy_table()
+
+        # использованы опции -m,--main-menu -> вызов консольного тестового меню
+        elif self.__args.main_menu:
             # при использовании -m,--main-menu не допустимо использовать какие-либо дополнительные опции, поэтому длина массива sys.argv не может превышать 2
             # в противном случае - неверный формат ввода
             if len(sys.argv) == 2:
-                menu = Menu(self.__pwd_gen)
+                from _libraries.menu_lib import Menu
+                menu = Menu(self.__get_pwd_gen())
                 menu.show_main_menu()
                 del menu
             else:
                 self.__incorrect_cmd_options_handler()
         
         # использована опция --xkcd -> генерирование парольных фраз на основе библиотеки xkcd
-        elif '--xkcd' in sys.argv:
+        elif '--xkcd' in self.__argv:
             # допустимо указание только шаблона сложности пароля (длина массива sys.argv строго равна 3)
             # и/или число гененрируемых парольных фраз (длина sys.argv может быть увеличена до 5)
-            # в противном случае - неверный формат ввода
-            if len(sys.argv) == 3 or (len(sys.argv) == 5 and ('--count' in sys.argv or '-c' in sys.argv)):
-                xkcd_obj = XKCD(self.__xkcd_dict)
-                # генерируем парольные фразы и выводим пользователю
-                for ind in range(int(self.__args.count)):
-                    print(xkcd_obj.generate_passphrase(self.__args.xkcd))
+            # в противном случае - неверный формат ввода; шаблоны парольных фраз (--pattern), способ выбора слов (--sampling) и требования политики паролей xkcd
+            # не использует, допустимо только ограничение длины пароля (--length, --min-length, --max-length)
+            if (len(self.__argv) == 3 or (len(self.__argv) == 5 and ('--count' in self.__argv or '-c' in self.__argv))) and not self.__has_pwdgen_options():
+                self.__print_xkcd_passphrase(pwd_complexity=self.__args.xkcd)
             else:
                 self.__incorrect_cmd_options_handler()
         
         # использована опция --compl -> генерирование парольных фраз по предустановленным шаблонам
-        elif '--compl' in sys.argv:
+        elif '--compl' in self.__argv:
             # допустимо указание только шаблона сложности парольной фразы (длина массива sys.argv строго равна 3)
             # и/или число гененрируемых парольных фраз (длина sys.argv может быть увеличена до 5)
             # в противном случае - неверный формат ввода
-            if len(sys.argv) == 3 or (len(sys.argv) == 5 and ('--count' in sys.argv or '-c' in sys.argv)):
-                self.__print_passphrase(pwd_options=self.__pwd_gen.get_passphrase_options(self.__args.compl))
+            if len(self.__argv) == 3 or (len(self.__argv) == 5 and ('--count' in self.__argv or '-c' in self.__argv)):
+                self.__print_passphrase(pwd_options=self.__get_pwd_gen().get_passphrase_options(self.__args.compl))
             else:
                 self.__incorrect_cmd_options_handler()
         
@@ -153,8 +408,8 @@ class ArgumentParser():
         # 1. вызов без параметров (длина sys.argv строго равна 1) - генерирование дефолтного числа парольных фраз по стандартному шаблону
         # 2. использованы толшько параметры -c,--count (длина sys.argv строго равна 3) - тождественно вызову утилиты в формате --compl COMPL -c COUNT, 
         #   описанному выше; из за явного отсутствия опиции --compl треует отдельной обработки
-        elif len(sys.argv) == 1 or (len(sys.argv) == 3 and ('--count' in sys.argv or '-c' in sys.argv)):
-            self.__print_passphrase(pwd_options=self.__pwd_gen.get_passphrase_options(self.__args.compl))
+        elif len(self.__argv) == 1 or (len(self.__argv) == 3 and ('--count' in self.__argv or '-c' in self.__argv)):
+            self.__print_passphrase(pwd_options=self.__get_pwd_gen().get_passphrase_options(self.__args.compl))
         
         # все прочие случаи - они же описывают использование всех прочих опций при вызове утилиты и реализуют пользовательские (кастомные) настройки парольных фраз
         else:
@@ -179,10 +434,420 @@ class ArgumentParser():
         :param pwd_options: словарь с параметрами генерируемой парольной фразы
         :return: None
         """
-        # генерируем парольные фразы и выводим пользователю
-        for ind in range(int(self.__args.count)):
-            passphrase = self.__pwd_gen.generate_passphrase(pwd_options)
-            print(f"{''.join(passphrase[0])}\t {' '.join(passphrase[1])}")
+        # шаблон парольной фразы (опция --pattern) проверяется локально; сервису (опция --client) передается как есть и проверяется им
+        if self.__args.pattern is not None and not self.__args.client:
+            pattern = self.__get_pwd_gen().get_pattern(self.__args.pattern)
+            if pattern is None:
+                return
+            pwd_options = dict(pwd_options, pattern=pattern)
+        # политика паролей (секция policy конфигурационного файла и опции --min-length, --max-length, --require, --forbid) компилируется
+        # вместе с шаблоном; сервису передаются только опции, политику его конфигурационного файла сервис применяет сам
+        if not self.__args.client:
+            policy = self.__get_pwd_gen().get_policy(self.__get_policy_options())
+            if policy is None:
+                return
+            if policy:
+                pwd_options = dict(pwd_options, policy=policy)
+                error = self.__get_pwd_gen().get_policy_error(pwd_options)
+                if error is not None:
+                    logger_lib.error('Policy', error)
+                    return
+        # при использовании опции --entropy вместо генерации выводится оценка энтропии парольной фразы
+        if self.__args.entropy:
+            self.__print_entropy('pwdgen', self.__get_pwd_gen().get_entropy(pwd_options))
+            return
+        # в режиме массовой генерации оценка энтропии выводится в stderr, чтобы не смешиваться с потоком паролей
+        if self.__args.bulk and not self.__args.client:
+            self.__write_bulk_entropy(self.__get_pwd_gen().get_entropy(pwd_options))
+
+        def make_lines(count:int):
+            # при использовании опции --client парольные фразы запрашиваются у сервиса генерации
+            if self.__args.client:
+                request = {'engine': 'pwdgen', 'options': dict(pwd_options)}
+                if self.__args.pattern is not None:
+                    request['pattern'] = self.__args.pattern
+                if self.__get_policy_options():
+                    request['policy'] = self.__get_policy_options()
+                response = self.__request_service(request, count)
+                if response is None:
+                    return None
+                return (f'{password}\t {phrase}' for password, phrase in zip(response['passwords'], response['phrases']))
+            # в режиме массовой генерации с несколькими рабочими процессами парольные фразы создаются параллельно (см. parallel_lib)
+            if self.__is_parallel():
+                return (line for block in self.__get_parallel_gen().generate_passphrase_blocks(pwd_options, count) for line in block.splitlines())
+            # в режиме массовой генерации парольные фразы создаются пакетами по BULK_BLOCK_SIZE
+            if self.__args.bulk:
+                passphrases = (passphrase
+                               for start in range(0, count, self.BULK_BLOCK_SIZE)
+                               for passphrase in self.__get_pwd_gen().generate_batch(pwd_options, min(self.BULK_BLOCK_SIZE, count - start)))
+            else:
+                passphrases = self.__get_pwd_gen().generate_passphrases(pwd_options, count)
+            return (f"{''.join(passphrase[0])}\t {' '.join(passphrase[1])}" for passphrase in passphrases)
+
+        if self.__is_parallel():
+            # словари загружаются (и при необходимости помещаются в кэш) до запуска рабочих процессов, которые затем используют кэш
+            self.__get_pwd_gen().load_dictionaries()
+            if not self.__is_unique():
+                self.__write_bulk_blocks(self.__get_parallel_gen().generate_passphrase_blocks(pwd_options, self.__args.bulk))
+                return
+        # уникальность определяется паролем (строка до символа табуляции), а не исходной фразой
+        lines = self.__get_lines(make_lines, key=lambda line: line.split('\t', 1)[0])
+        if lines is None:
+            return
+
+        # в режиме массовой генерации парольные фразы выводятся потоком, без примечания
+        if self.__args.bulk:
+            self.__write_bulk(lines)
+            return
+
+        # выводим парольные фразы пользователю
+        for line in lines:
+            print(line)
         
-        print(f'\r\n[Note]\r\nThe password is formed from the first {pwd_options["char_count"]} letters of each word.')
+        if self.__args.pattern is not None:
+            print(f'\r\n[Note]\r\nThe password is formed from the first letters of each word (pattern {pwd_options.get("pattern", self.__args.pattern)}; '
+                  f'{pwd_options["char_count"]} letters unless set by the pattern).')
+        else:
+            print(f'\r\n[Note]\r\nThe password is formed from the first {pwd_options["char_count"]} letters of each word.')
         print(f'Numbers are used only at the beginning of the password; special characters are used as separators between words')
+        if pwd_options.get('policy'):
+            print(f'Passwords satisfy the password policy: {self.__describe_policy(pwd_options["policy"])}')
+
+    def __get_policy_options(self, ) -> dict:
+        """
+        Параметры политики паролей, заданные опциями командной строки
+        :return: словарь: параметр политики -> значение (см. policy_lib); пустой словарь, если опции не использованы
+        """
+        min_length = self.__args.length if self.__args.length is not None else self.__args.min_length
+        max_length = self.__args.length if self.__args.length is not None else self.__args.max_length
+        options = {'min_length': min_length, 'max_length': max_length, 'require': self.__args.require, 'forbid': self.__args.forbid}
+        return {name: value for name, value in options.items() if value is not None}
+
+    def __has_pwdgen_options(self, with_sampling:bool=True) -> bool:
+        """
+        Проверка, использованы ли опции, которые применяются только к генератору PwdGen (шаблон, способ выбора слов и требования
+        политики паролей; ограничение длины пароля применяется и к генератору XKCD)
+        :param with_sampling: учитывать способ выбора слов (опция --sampling)
+        :return: True/False
+        """
+        return (self.__args.pattern is not None or (with_sampling and self.__args.sampling not in (None, 'word'))
+                or self.__args.require is not None or self.__args.forbid is not None)
+
+    @staticmethod
+    def __describe_policy(policy:dict) -> str:
+        """
+        Описание политики паролей для примечания к сгенерированным парольным фразам
+        :param policy: политика в каноническом виде (см. policy_lib)
+        :return: описание политики
+        """
+        items = list()
+        if policy["min_length"] is not None:
+            items.append(f'at least {policy["min_length"]} characters')
+        if policy["max_length"] is not None:
+            items.append(f'at most {policy["max_length"]} characters')
+        if policy["require"]:
+            items.append(f'contains {", ".join(policy["require"])}')
+        if policy["forbid"]:
+            items.append(f'without {policy["forbid"]}')
+        return '; '.join(items)
+
+    def __print_xkcd_passphrase(self, pwd_complexity:str) -> None:
+        """
+        Метод для выполнения запроса для генерации паролей на основе библиотеки xkcd и вывода сгенерированных паролей
+        :param pwd_complexity: сложность генерируемого пароля
+        :return: None
+        """
+        # ограничение длины пароля (опции --length, --min-length, --max-length) проверяется так же, как параметры политики паролей;
+        # сервису (опция --client) передается как есть и проверяется им
+        policy = self.__get_policy_options()
+        try:
+            lengths = parse_policy(policy)
+        except ValueError as err:
+            logger_lib.error('Length', err)
+            return
+        min_length, max_length = lengths["min_length"], lengths["max_length"]
+        if not self.__args.client:
+            error = self.__get_xkcd().get_length_error(pwd_complexity, min_length, max_length)
+            if error is not None:
+                logger_lib.error('Length', error)
+                return
+        if self.__args.entropy:
+            self.__print_entropy('xkcd', self.__get_xkcd().get_entropy(pwd_complexity, min_length, max_length))
+            return
+        if self.__args.bulk and not self.__args.client:
+            self.__write_bulk_entropy(self.__get_xkcd().get_entropy(pwd_complexity, min_length, max_length))
+
+        def make_lines(count:int):
+            # при использовании опции --client пароли запрашиваются у сервиса генерации
+            if self.__args.client:
+                request = {'engine': 'xkcd', 'preset': pwd_complexity}
+                if policy:
+                    request['policy'] = policy
+                response = self.__request_service(request, count)
+                return response['passwords'] if response is not None else None
+            if self.__is_parallel():
+                return (line for block in self.__get_parallel_gen().generate_xkcd_blocks(pwd_complexity, count, min_length, max_length)
+                        for line in block.splitlines())
+            if self.__args.bulk:
+                # в режиме массовой генерации пароли создаются пакетами по BULK_BLOCK_SIZE
+                return (password
+                        for start in range(0, count, self.BULK_BLOCK_SIZE)
+                        for password in self.__get_xkcd().generate_batch(pwd_complexity, min(self.BULK_BLOCK_SIZE, count - start),
+                                                                         min_length, max_length))
+            return self.__get_xkcd().generate_passphrases(pwd_complexity, count, min_length, max_length)
+
+        if not self.__args.client:
+            # словарь загружается (и при необходимости помещается в кэш) до запуска рабочих процессов параллельной генерации
+            self.__get_xkcd()
+            if self.__is_parallel() and not self.__is_unique():
+                self.__write_bulk_blocks(self.__get_parallel_gen().generate_xkcd_blocks(pwd_complexity, self.__args.bulk, min_length, max_length))
+                return
+        passwords = self.__get_lines(make_lines)
+        if passwords is None:
+            return
+
+        # генерируем парольные фразы и выводим пользователю (в режиме массовой генерации - потоком в файл или stdout)
+        if self.__args.bulk:
+            self.__write_bulk(passwords)
+        else:
+            for passphrase in passwords:
+                print(passphrase)
+
+    def __print_entropy(self, engine:str, entropy:dict) -> None:
+        """
+        Вывод оценки энтропии пароля с разбивкой по частям пароля (опция --entropy)
+        :param engine: генератор: pwdgen или xkcd
+        :param entropy: оценка энтропии (см. PwdGen.get_entropy, XKCD.get_entropy) или None, если ее не удалось получить
+        :return: None
+        """
+        if entropy is None:
+            return
+        print(f'Password entropy: {entropy["bits"]} bits')
+        for ind, word in enumerate(entropy["words"]):
+            if engine == 'xkcd':
+                print(f'    word {ind + 1}: {word["words"]} variants - {word["bits"]} bits')
+            else:
+                # слова с одинаковым префиксом дают одинаковый пароль, поэтому учитываются различные префиксы
+                print(f'    word {ind + 1} ({word["part"]}): {word["prefixes"]} distinct prefixes of {word["words"]} words - {word["bits"]} bits')
+        if engine == 'xkcd':
+            print(f'    delimiters - {entropy["delimiters"]} bits')
+        else:
+            print(f'    special characters - {entropy["specials"]} bits')
+            print(f'    numbers - {entropy["digits"]} bits')
+
+    def __print_entropy_table(self, ) -> None:
+        """
+        Вывод оценки энтропии паролей всех пресетов генераторов PwdGen и XKCD (опция --entropy без других опций)
+        :return: None
+        """
+        pwd_gen = self.__get_pwd_gen()
+        for preset in pwd_gen.get_passphrase_presets():
+            entropy = pwd_gen.get_entropy(pwd_gen.get_passphrase_options(preset))
+            print(f'{"pwdgen":<8}{preset:<10}{entropy["bits"] if entropy is not None else "-":>8} bits')
+        xkcd_obj = self.__get_xkcd()
+        for preset in xkcd_obj.get_passphrase_presets():
+            print(f'{"xkcd":<8}{preset:<10}{xkcd_obj.get_entropy(preset)["bits"]:>8} bits')
+
+    @staticmethod
+    def __write_bulk_entropy(entropy:dict) -> None:
+        """
+        Вывод оценки энтропии паролей в stderr в режиме массовой генерации
+        :param entropy: оценка энтропии или None, если ее не удалось получить
+        :return: None
+        """
+        if entropy is not None:
+            sys.stderr.write(f'[Entropy] {entropy["bits"]} bits per password\n')
+
+    def __serve(self, ) -> None:
+        """
+        Запуск сервиса генерации паролей на локальном Unix-сокете (см. server_lib)
+        :return: None
+        """
+        try:
+            from _libraries import server_lib
+        except (ImportError, AttributeError) as err:
+            # Unix-сокеты поддерживаются не на всех платформах
+            logger_lib.error('Generator service', err)
+            return
+        socket_path = self.__args.socket or server_lib.get_default_socket_path()
+        server_lib.serve(socket_path, self.__get_pwd_gen(), self.__get_xkcd())
+
+    def __run_benchmark(self, ) -> None:
+        """
+        Запуск набора бенчмарков (см. benchmark_lib) и вывод результатов в формате JSON в stdout или в файл (опция -o,--output)
+        :return: None
+        """
+        import json
+        from _libraries.benchmark_lib import Benchmark
+
+        results = json.dumps(Benchmark(self.__get_pwd_dict_filespath(), self.__xkcd_dict).run(), ensure_ascii=False, indent=2)
+        if not self.__args.output:
+            print(results)
+            return
+        try:
+            with open(self.__args.output, 'w', encoding='utf-8') as out_file:
+                out_file.write(results + '\n')
+        except Exception as err:
+            logger_lib.error(self.__args.output, err)
+
+    def __serve_http(self, ) -> None:
+        """
+        Запуск HTTP-сервиса генерации паролей (см. http_server_lib)
+        :return: None
+        """
+        from _libraries import http_server_lib
+
+        host, _, port = self.__args.http.rpartition(':')
+        if not port.isdigit():
+            self.__incorrect_cmd_options_handler()
+            return
+        http_server_lib.serve(host or '127.0.0.1', int(port), self.__get_pwd_gen(), self.__get_xkcd())
+
+    def __request_service(self, request:dict, count:int) -> dict:
+        """
+        Отправка запроса сервису генерации паролей
+        :param request: запрос (без количества паролей)
+        :param count: количество паролей
+        :return: ответ сервиса или None в случае ошибки (ошибка записывается в лог)
+        """
+        try:
+            from _libraries import server_lib
+            client = server_lib.PwdGenClient(self.__args.socket or server_lib.get_default_socket_path())
+            request['count'] = count
+            response = client.request(request)
+            client.close()
+        except Exception as err:
+            logger_lib.error('Generator service', err)
+            return None
+        if 'error' in response:
+            logger_lib.error('Generator service', response['error'])
+            return None
+        return response
+
+    def __is_parallel(self, ) -> bool:
+        """
+        Проверка, выполняется ли массовая генерация заданиями parallel_lib: несколькими рабочими процессами (опция --workers) или
+        с заданным seed. Задания с seed получают начальное значение по номеру задания, поэтому при любом количестве рабочих процессов
+        (в том числе без --workers) выводятся одни и те же пароли
+        :return: True/False
+        """
+        return bool(self.__args.bulk and not self.__args.client
+                    and ((self.__args.workers and self.__args.workers > 1) or self.__args.seed is not None))
+
+    def __is_unique(self, ) -> bool:
+        """
+        Проверка, требуется ли уникальность генерируемых паролей (опция --unique или --issued)
+        :return: True/False
+        """
+        return bool(self.__args.unique or self.__args.issued)
+
+    def __get_lines(self, make_lines, key=None):
+        """
+        Получение строк с паролями для вывода (количество определяется опциями -c,--count или --bulk). При использовании опций
+        --unique, --issued повторы (и ранее выданные пароли) отбрасываются, а недостающие строки генерируются дополнительно
+        :param make_lines: функция, генерирующая заданное количество строк (возвращает итерируемый объект или None в случае ошибки)
+        :param key: функция, выделяющая пароль из строки (по умолчанию - строка целиком)
+        :return: итерируемый объект (генератор) строк или None в случае ошибки (ошибка записывается в лог)
+        """
+        count = self.__args.bulk or int(self.__args.count)
+        if not self.__is_unique():
+            return make_lines(count)
+
+        from _libraries.unique_lib import UniqueFilter
+        unique_filter = UniqueFilter(count)
+        if self.__args.issued and unique_filter.load_issued(self.__args.issued, key) < 0:
+            return None
+        return self.__get_unique_lines(make_lines, unique_filter, count, key)
+
+    def __get_unique_lines(self, make_lines, unique_filter, count:int, key=None):
+        """
+        Генератор уникальных строк: строки, пароль которых уже содержится в множестве выданных паролей, отбрасываются, и вместо них
+        генерируются новые. Если очередной раунд генерации не дал ни одного нового пароля (пространство паролей исчерпано),
+        генерация прекращается с ошибкой. По завершении статистика (память множества, скорость) выводится в stderr
+        :param make_lines: функция, генерирующая заданное количество строк
+        :param unique_filter: объект UniqueFilter (множество выданных паролей)
+        :param count: количество строк
+        :param key: функция, выделяющая пароль из строки (по умолчанию - строка целиком)
+        :return: генератор строк
+        """
+        from time import perf_counter
+        from itertools import islice
+
+        start = perf_counter()
+        produced = 0
+        while produced < count:
+            lines = make_lines(count - produced)
+            if lines is None:
+                return
+            round_produced = 0
+            # строки проверяются пакетами по BULK_BLOCK_SIZE (см. UniqueFilter.add_batch)
+            lines = iter(lines)
+            while block := list(islice(lines, self.BULK_BLOCK_SIZE)):
+                added = unique_filter.add_batch([key(line) for line in block] if key is not None else block)
+                for line, is_added in zip(block, added):
+                    if is_added:
+                        round_produced += 1
+                        yield line
+            produced += round_produced
+            if round_produced == 0:
+                logger_lib.error('Unique generation', f'only {produced} of {count} unique passwords could be generated '
+                                                      f'(the password space of the preset is exhausted)')
+                break
+        elapsed = perf_counter() - start
+        stats = unique_filter.get_stats()
+        sys.stderr.write(f'[Unique] {produced} unique passwords in {elapsed:.2f} s ({produced / max(elapsed, 1e-9):.0f} passwords/s), '
+                         f'{stats["rejected"]} duplicates rejected, seen-set {stats["items"]} hashes / {stats["memory_mb"]} MiB\n')
+
+    def __get_parallel_gen(self, ):
+        """
+        Получение объекта параллельной (многопроцессной) генерации для режима массовой генерации (опция --workers или --seed);
+        объект создается при первом обращении, поэтому номера заданий продолжаются при догенерации (--unique)
+        :return: объект ParallelGen
+        """
+        if self.__parallel_gen is None:
+            from _libraries.parallel_lib import ParallelGen
+            self.__parallel_gen = ParallelGen(self.__args.workers or 1, self.__get_pwd_dict_filespath(), self.__conf_filename, self.__xkcd_dict,
+                                              sampling=self.__args.sampling, rng=self.__args.rng, seed=self.__args.seed)
+        return self.__parallel_gen
+
+    def __write_bulk(self, lines) -> None:
+        """
+        Потоковый вывод результатов массовой генерации в файл (опция -o,--output) или stdout. Строки накапливаются блоками
+        по BULK_BLOCK_SIZE, поэтому потребление памяти не зависит от количества строк
+        :param lines: итерируемый объект (генератор) строк для вывода
+        :return: None
+        """
+        def get_blocks():
+            block = list()
+            for line in lines:
+                block.append(line)
+                if len(block) == self.BULK_BLOCK_SIZE:
+                    yield '\n'.join(block) + '\n'
+                    block.clear()
+            if block:
+                yield '\n'.join(block) + '\n'
+
+        self.__write_bulk_blocks(get_blocks())
+
+    def __write_bulk_blocks(self, blocks) -> None:
+        """
+        Потоковый вывод блоков строк в файл (опция -o,--output) или stdout через буферизованный поток
+        :param blocks: итерируемый объект (генератор) блоков строк; каждый блок завершается символом новой строки
+        :return: None
+        """
+        if self.__args.output:
+            try:
+                out_file = open(self.__args.output, 'w', encoding='utf-8', buffering=self.BULK_BUFFER_SIZE)
+            except Exception as err:
+                logger_lib.error(self.__args.output, err)
+                return
+        else:
+            out_file = sys.stdout
+
+        try:
+            for block in blocks:
+                out_file.write(block)
+            out_file.flush()
+        finally:
+            if out_file is not sys.stdout:
+                out_file.close()
@@ -0,0 +1,270 @@
+# region Import
+import os
+import sys
+import shutil
+import platform
+import tempfile
+import subprocess
+from os import path
+from re import split
+from statistics import median
+from time import perf_counter, strftime
+
+from _libraries import logger_lib
+
+# resource (пиковое потребление памяти) доступен не на всех платформах
+try:
+    import resource
+except ImportError:
+    resource = None
+# endregion
+
+
+# region Const
+DIR_BASE = '/'.join(split(r'[\\/]', path.abspath(__file__))[:-2])
+# версия формата результатов; увеличивается при изменении состава или смысла замеров
+BENCHMARK_FORMAT_VERSION = 1
+# количество парольных фраз в замерах скорости генерации (одиночной и пакетной) и массовой генерации
+SINGLE_COUNT = 20000
+BATCH_COUNT = 200000
+BULK_COUNT = 500000
+# количество запусков утилиты при замере времени запуска (берется медиана)
+STARTUP_RUNS = 3
+# режимы утилиты, время запуска которых замеряется: название -> аргументы командной строки main.py
+STARTUP_MODES = {
+    'help': ['--help'],
+    'xkcd': ['--xkcd', 'strong', '-c', '1'],
+    'compl': ['--compl', 'weak', '-c', '1'],
+    'custom': ['-c', '1', '-w', '3', '-n'],
+}
+# запуск main.py с выводом пикового потребления памяти процессом в stderr (используется отдельный запуск, чтобы импорт, необходимый
+# для замера, не учитывался во времени импорта модулей)
+STARTUP_RSS_WRAPPER = '''
+import sys
+sys.argv = sys.argv[1:]
+try:
+    import runpy
+    runpy.run_path(sys.argv[0], run_name='__main__')
+finally:
+    from _libraries.benchmark_lib import get_peak_rss_mb
+    sys.stderr.write(f'\\npeak_rss_mb: {get_peak_rss_mb()}\\n')
+'''
+# endregion
+
+
+def get_peak_rss_mb() -> float:
+    """
+    Пиковое потребление памяти (resident set size) текущим процессом. В Linux значение берется из /proc/self/status (VmHWM):
+    ru_maxrss процесса, запущенного через fork и exec, включает потребление памяти родительским процессом
+    :return: пиковое потребление памяти в МиБ или None, если оно не может быть определено
+    """
+    try:
+        with open('/proc/self/status', 'r') as status_file:
+            for line in status_file:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 2)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss: в macOS - в байтах, в остальных системах - в килобайтах
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)
+
+
+def measure_startup(args:list, runs:int=STARTUP_RUNS, env:dict=None) -> dict:
+    """
+    Замер времени запуска утилиты: main.py запускается в отдельном процессе с опцией интерпретатора -X importtime
+    :param args: аргументы командной строки main.py
+    :param runs: количество запусков (берется медиана)
+    :param env: переменные окружения процесса (по умолчанию - окружение текущего процесса)
+    :return: словарь: wall_ms - время работы процесса, import_ms - суммарное время импорта модулей (мс),
+        peak_rss_mb - пиковое потребление памяти процессом (None, если не может быть определено)
+    """
+    wall_times = list()
+    import_times = list()
+    for ind in range(runs):
+        start = perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', f'{DIR_BASE}/main.py'] + args, cwd=DIR_BASE, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        wall_times.append((perf_counter() - start) * 1000)
+        # строки вида "import time: self [us] | cumulative | imported package"; сумма собственного времени - общее время импорта
+        import_times.append(sum(int(line.split(':', 1)[1].split('|')[0]) for line in result.stderr.splitlines()
+                                if line.startswith('import time:') and line.split(':', 1)[1].split('|')[0].strip().isdigit()) / 1000)
+
+    result = subprocess.run([sys.executable, '-c', STARTUP_RSS_WRAPPER, f'{DIR_BASE}/main.py'] + args, cwd=DIR_BASE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    peak_rss = [line.split(':', 1)[1].strip() for line in result.stderr.splitlines() if line.startswith('peak_rss_mb:')]
+    return {
+        'wall_ms': round(median(wall_times), 2),
+        'import_ms': round(median(import_times), 2),
+        'peak_rss_mb': float(peak_rss[-1]) if peak_rss and peak_rss[-1] != 'None' else None
+    }
+
+
+# набор бенчмарков утилиты: скорость генерации для каждого пресета (PwdGen и XKCD, по одной и пакетами), время загрузки словарей
+# (без кэша, с пустым и с заполненным кэшем), пиковое потребление памяти, время запуска в каждом режиме (cold - с пустым кэшем словарей,
+# warm - с заполненным) и скорость массовой генерации с записью в файл. Результаты возвращаются в виде словаря для вывода в формате JSON
+class Benchmark():
+    # default constructor
+    def __init__(self, dict_files_path:str, xkcd_filename:str) -> None:
+        self.__dict_files_path = dict_files_path
+        self.__xkcd_filename = xkcd_filename
+        # временный каталог для файла конфигурации, кэша словарей и результатов массовой генерации
+        self.__temp_dir = None
+
+    def run(self) -> dict:
+        """
+        Выполнение всех бенчмарков. Ошибка в отдельном замере не прерывает остальные: вместо результата замера записывается ошибка
+        :return: словарь с результатами
+        """
+        self.__temp_dir = tempfile.mkdtemp(prefix='pwdgen-benchmark-')
+        try:
+            results = {'format_version': BENCHMARK_FORMAT_VERSION, 'environment': self.__get_environment()}
+            for name, func in [('dictionaries', self.__bench_dictionaries),
+                               ('pwdgen', self.__bench_pwdgen),
+                               ('xkcd', self.__bench_xkcd),
+                               ('bulk', self.__bench_bulk),
+                               ('startup', self.__bench_startup)]:
+                try:
+                    results[name] = func()
+                except Exception as err:
+                    logger_lib.error(f'Benchmark {name}', err)
+                    results[name] = {'error': str(err)}
+            results['peak_rss_mb'] = get_peak_rss_mb()
+            return results
+        finally:
+            shutil.rmtree(self.__temp_dir, ignore_errors=True)
+
+    def __get_environment(self, ) -> dict:
+        """
+        Описание окружения, в котором выполняются бенчмарки (для сравнения результатов разных версий на одном оборудовании)
+        :return: словарь с параметрами окружения
+        """
+        from _libraries.pwd_generator_lib import _import_numpy
+
+        numpy = _import_numpy()
+        return {
+            'timestamp': strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'numpy': numpy.__version__ if numpy is not None else None
+        }
+
+    def __get_pwd_gen(self, cache_dir:str):
+        """
+        Создание генератора PwdGen с временным файлом конфигурации
+        :param cache_dir: каталог кэша словарей ('' - кэш отключен)
+        :return: объект PwdGen
+        """
+        from _libraries.pwd_generator_lib import PwdGen
+        return PwdGen(self.__dict_files_path, path.join(self.__temp_dir, 'conf.ini'), cache_dir=cache_dir)
+
+    def __bench_dictionaries(self, ) -> dict:
+        """
+        Время загрузки словарей PwdGen: без кэша (разбор текстовых словарей), с пустым кэшем (разбор и запись в кэш)
+        и с заполненным кэшем (отображение кэша в память)
+        :return: словарь с результатами (мс) и пиковым потреблением памяти после загрузки
+        """
+        cache_dir = path.join(self.__temp_dir, 'cache')
+        results = dict()
+        for name, dir_name in [('no_cache_ms', ''), ('cold_cache_ms', cache_dir), ('warm_cache_ms', cache_dir)]:
+            pwd_gen = self.__get_pwd_gen(dir_name)
+            start = perf_counter()
+            pwd_gen.load_dictionaries()
+            results[name] = round((perf_counter() - start) * 1000, 2)
+        results['peak_rss_mb'] = get_peak_rss_mb()
+        return results
+
+    def __bench_pwdgen(self, ) -> dict:
+        """
+        Скорость генерации парольных фраз PwdGen для каждого пресета: по одной (generate_passphrase) и пакетами (generate_batch)
+        :return: словарь: пресет -> {single_per_sec, batch_per_sec}
+        """
+        pwd_gen = self.__get_pwd_gen(path.join(self.__temp_dir, 'cache'))
+        pwd_gen.load_dictionaries()
+        results = dict()
+        for preset in pwd_gen.get_passphrase_presets():
+            pwd_options = pwd_gen.get_passphrase_options(preset)
+            try:
+                start = perf_counter()
+                for ind in range(SINGLE_COUNT):
+                    pwd_gen.generate_passphrase(pwd_options)
+                single = SINGLE_COUNT / (perf_counter() - start)
+                start = perf_counter()
+                pwd_gen.generate_batch(pwd_options, BATCH_COUNT)
+                batch = BATCH_COUNT / (perf_counter() - start)
+                results[preset] = {'single_per_sec': round(single), 'batch_per_sec': round(batch)}
+            except Exception as err:
+                logger_lib.error(f'Benchmark pwdgen {preset}', err)
+                results[preset] = {'error': str(err)}
+        return results
+
+    def __bench_xkcd(self, ) -> dict:
+        """
+        Скорость генерации паролей XKCD для каждого пресета: по одному (generate_passphrase) и пакетами (generate_batch)
+        :return: словарь: пресет -> {single_per_sec, batch_per_sec}
+        """
+        from _libraries.xkcd_generator_lib import XKCD
+
+        xkcd_obj = XKCD(self.__xkcd_filename)
+        results = dict()
+        for preset in xkcd_obj.get_passphrase_presets():
+            start = perf_counter()
+            for ind in range(SINGLE_COUNT):
+                xkcd_obj.generate_passphrase(preset)
+            single = SINGLE_COUNT / (perf_counter() - start)
+            start = perf_counter()
+            xkcd_obj.generate_batch(preset, BATCH_COUNT)
+            batch = BATCH_COUNT / (perf_counter() - start)
+            results[preset] = {'single_per_sec': round(single), 'batch_per_sec': round(batch)}
+        return results
+
+    def __bench_bulk(self, ) -> dict:
+        """
+        Скорость массовой генерации (как в режиме --bulk): парольные фразы создаются пакетами и записываются в файл блоками
+        :return: словарь: генератор -> {lines_per_sec, mb_per_sec}
+        """
+        from _libraries.argument_parser_lib import ArgumentParser
+        from _libraries.xkcd_generator_lib import XKCD
+
+        pwd_gen = self.__get_pwd_gen(path.join(self.__temp_dir, 'cache'))
+        pwd_options = pwd_gen.get_passphrase_options('weak')
+        xkcd_obj = XKCD(self.__xkcd_filename)
+        generators = {
+            'pwdgen_weak': lambda count: (f"{''.join(passphrase[0])}\t {' '.join(passphrase[1])}"
+                                          for passphrase in pwd_gen.generate_batch(pwd_options, count)),
+            'xkcd_super': lambda count: xkcd_obj.generate_batch('super', count)
+        }
+        results = dict()
+        for name, generate in generators.items():
+            out_filename = path.join(self.__temp_dir, f'bulk_{name}.txt')
+            try:
+                start = perf_counter()
+                with open(out_filename, 'w', encoding='utf-8', buffering=ArgumentParser.BULK_BUFFER_SIZE) as out_file:
+                    for block_start in range(0, BULK_COUNT, ArgumentParser.BULK_BLOCK_SIZE):
+                        out_file.write('\n'.join(generate(min(ArgumentParser.BULK_BLOCK_SIZE, BULK_COUNT - block_start))) + '\n')
+                elapsed = perf_counter() - start
+                results[name] = {'lines_per_sec': round(BULK_COUNT / elapsed),
+                                 'mb_per_sec': round(path.getsize(out_filename) / elapsed / (1024 * 1024), 2)}
+            except Exception as err:
+                logger_lib.error(f'Benchmark bulk {name}', err)
+                results[name] = {'error': str(err)}
+            finally:
+                if path.exists(out_filename):
+                    os.remove(out_filename)
+        return results
+
+    def __bench_startup(self, ) -> dict:
+        """
+        Время запуска утилиты в каждом режиме: cold - первый запуск с пустым кэшем словарей, warm - запуски с заполненным кэшем
+        :return: словарь: режим -> {cold, warm}
+        """
+        results = dict()
+        for mode, args in STARTUP_MODES.items():
+            env = dict(os.environ)
+            env['PWDGEN_CACHE_DIR'] = path.join(self.__temp_dir, f'startup_cache_{mode}')
+            results[mode] = {'cold': measure_startup(args, 1, env), 'warm': measure_startup(args, STARTUP_RUNS, env)}
+        return results
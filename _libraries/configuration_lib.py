@@ -1,5 +1,10 @@
 # region Import
-from contextlib import closing
+import os
+import stat
+import tempfile
+import threading
+from io import StringIO
+from contextlib import closing, contextmanager
 from configparser import ConfigParser
 from os import path
 
@@ -7,13 +12,70 @@ from _libraries import logger_lib
 # endregion
 
 
+# region Const
+# расширение файла блокировки, создаваемого рядом с конфигурационным файлом при первой записи. Файл блокировки не удаляется после записи:
+# процесс, ожидающий блокировку, удерживает открытый файл, и после удаления следующий процесс создал бы новый файл и получил
+# блокировку одновременно с ним
+CONF_LOCK_EXTENSION = '.lock'
+# endregion
+
+
+# кэш считанных конфигурационных файлов процесса: путь к файлу -> (время изменения и размер файла, секции с параметрами).
+# Файл разбирается повторно только при изменении времени изменения или размера, поэтому объекты Config одного процесса
+# (например, генераторы рабочих потоков сервиса) не считывают один и тот же файл многократно
+_settings_cache = dict()
+_settings_cache_lock = threading.Lock()
+
+
+@contextmanager
+def _lock_config_file(filename:str):
+    """
+    Монопольная блокировка конфигурационного файла на время записи (через файл блокировки рядом с ним), чтобы одновременно работающие
+    процессы утилиты не записывали файл одновременно
+    :param filename: конфигурационный файл (путь без символических ссылок, см. Config.write_settings)
+    :return: контекстный менеджер
+    """
+    with closing(open(filename + CONF_LOCK_EXTENSION, 'a')) as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _get_file_stamp(filename:str) -> tuple:
+    """
+    Отметка состояния файла, по которой определяется, изменился ли он
+    :param filename: файл
+    :return: кортеж (время изменения в наносекундах, размер) или None, если файл не существует
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 # Class for configuration
 # класс предназначен для работы с файлом, содержащим паользовательские (кастомные) параметры парольной фразы
 class Config():
     # default constructor
     def __init__(self, conf_filename:str, defaults:dict):
         self.__filename = conf_filename
-        self.__config = ConfigParser()
+        # подстановки (%) не используются: значения (например, запрещенные символы политики паролей) считываются как есть
+        self.__config = ConfigParser(interpolation=None)
+        # отметка состояния файла (см. _get_file_stamp) на момент последнего считывания или записи
+        self.__stamp = None
 
         # сохраняем все параметры по умолчанию для пользовательского пароля (они же - кастомные параметры)
         # необходимо для отката к дефотным параметрам в случаях:
@@ -27,40 +89,104 @@ class Config():
         # при инициализации объекта класса паользовательские параметры парольной фразы могут быть
         # - приняты по умолчанию
         # - считаны из конфигурационнного файла
-        
+
         # проверка существования файла conf.ini с пользовательскими параметрами парольной фразы
         # - если файл не найден, то он создается; параметры парольной фразы задаются значениями по умолчанию из defaults
         # - если файл существет, то секция пропускается
         if not path.exists(self.__filename):
             logger_lib.error(self.__filename, 'File not found')
             self.__create_config_file(defaults)
-        
+
         # счиитываем кастомные параметры парольной фразы
         self.read_settings()
-    
+
     # default destructor
     def __del__(self):
         del self.__config
-    
+
     # read parameters from file
     def read_settings(self) -> None:
+        """
+        Считывание параметров из конфигурационного файла. Разобранный файл хранится в кэше процесса и разбирается заново
+        только если файл изменился (изменились время изменения или размер)
+        :return: None
+        """
         try:
-            self.__config.read(self.__filename)
+            stamp = _get_file_stamp(self.__filename)
+            # файл не изменился после последнего считывания или записи этим объектом - параметры уже актуальны
+            if stamp is not None and stamp == self.__stamp:
+                return
+            key = path.abspath(self.__filename)
+            with _settings_cache_lock:
+                cached = _settings_cache.get(key)
+            config = ConfigParser(interpolation=None)
+            if cached is not None and cached[0] == stamp:
+                config.read_dict(cached[1])
+            else:
+                config.read(self.__filename)
+                with _settings_cache_lock:
+                    _settings_cache[key] = (stamp, {section: dict(config[section]) for section in config.sections()})
+            self.__config = config
+            self.__stamp = stamp
         except Exception as err:
             logger_lib.error(self.__filename, err)
 
+    def reload_settings(self) -> bool:
+        """
+        Повторное считывание параметров, если конфигурационный файл изменился после последнего считывания или записи
+        (например, другим процессом утилиты)
+        :return: True - файл изменился и параметры считаны заново, False - файл не изменился
+        """
+        if _get_file_stamp(self.__filename) == self.__stamp:
+            return False
+        self.read_settings()
+        return True
+
     # write parameters to file
     def write_settings(self) -> int:
-        try:            
-            # открытие файла на запись
-            # если файл содержит какие-либо данные, то они будут перезаписаны
-            # если файл не существует, то он будщет создан
-            with closing(open(self.__filename, "w")) as ini_file:
-                # запись параметров в указанный файл
-                self.__config.write(ini_file)
+        """
+        Запись параметров в конфигурационный файл. Запись выполняется под блокировкой файла во временный файл в том же каталоге,
+        который затем переименовывается, поэтому одновременно работающие процессы не видят частично записанный файл.
+        Если конфигурационный файл - символическая ссылка, записывается файл, на который она указывает (ссылка сохраняется);
+        временный файл получает права доступа исходного файла (новый файл - права по умолчанию с учетом umask).
+        Если файл уже содержит те же параметры, он не перезаписывается
+        :return: 0 - параметры записаны (или не изменились), -1 - в противном случае
+        """
+        sections = {section: dict(self.__config[section]) for section in self.__config.sections()}
+        buffer = StringIO()
+        self.__config.write(buffer)
+        try:
+            target = path.realpath(self.__filename)
+            with _lock_config_file(target):
+                key = path.abspath(self.__filename)
+                stamp = _get_file_stamp(self.__filename)
+                with _settings_cache_lock:
+                    cached = _settings_cache.get(key)
+                if cached is not None and cached[0] == stamp and stamp is not None and cached[1] == sections:
+                    self.__stamp = stamp
+                    return 0
+
+                tmp_fd, tmp_filename = tempfile.mkstemp(dir=path.dirname(target), prefix=path.basename(target) + '.')
+                try:
+                    with closing(os.fdopen(tmp_fd, 'w')) as ini_file:
+                        ini_file.write(buffer.getvalue())
+                    # mkstemp создает файл с правами 0600, поэтому права исходного файла переносятся на временный файл; отсутствующий файл
+                    # создается, чтобы получить права по умолчанию с учетом umask
+                    if stamp is None:
+                        open(target, 'a').close()
+                    os.chmod(tmp_filename, stat.S_IMODE(os.stat(target).st_mode))
+                    os.replace(tmp_filename, target)
+                except BaseException:
+                    os.remove(tmp_filename)
+                    raise
+                self.__stamp = _get_file_stamp(self.__filename)
+                with _settings_cache_lock:
+                    _settings_cache[key] = (self.__stamp, sections)
                 return 0
         except Exception as err:
             logger_lib.error(self.__filename, err)
+            # параметры объекта отличаются от файла, поэтому при следующем считывании файл должен быть считан заново
+            self.__stamp = None
             return -1
 
     def __create_config_file(self, options:dict) -> None:
@@ -77,7 +203,7 @@ class Config():
         # запись параметров в файл
         self.write_settings()
         logger_lib.info(self.__filename, 'file created')
-    
+
     def get_options(self) -> dict:
         """
         Метод преобразования считанных из конфигурационного файла кастомных параметров парольной фразы в словарь
@@ -88,14 +214,32 @@ class Config():
             options = dict()
             for option in self.__config['passphrase']:
                 options[option] = self.__config.get('passphrase', option)
-            return options 
+            return options
         except KeyError as err:
             # если в конфигурационном файле отсутствует секция passphrase с кастомными параметрами парольной фразы, то
-            # все секции конфигурационного файла удалюятся, а на их место заносится одна секция passphrase с параметрами по умолчанию
+            # секция passphrase заносится в конфигурационный файл с параметрами по умолчанию (остальные секции сохраняются)
             logger_lib.error('Get options', f'Section {err} not found. Default options will be used')
             self.set_defaults_options()
             return self.__defaults
-    
+
+    def get_patterns(self) -> dict:
+        """
+        Пользовательские шаблоны парольных фраз из секции patterns конфигурационного файла (см. pattern_lib)
+        :return: словарь: имя шаблона (в нижнем регистре) -> шаблон; пустой словарь, если секции нет
+        """
+        if not self.__config.has_section('patterns'):
+            return dict()
+        return {name: self.__config.get('patterns', name) for name in self.__config.options('patterns')}
+
+    def get_policy_options(self) -> dict:
+        """
+        Параметры политики паролей из секции policy конфигурационного файла (см. policy_lib)
+        :return: словарь: параметр политики -> значение (строка); пустой словарь, если секции нет
+        """
+        if not self.__config.has_section('policy'):
+            return dict()
+        return {name: self.__config.get('policy', name) for name in self.__config.options('policy')}
+
     def set_options(self, options:dict) -> int:
         """
         Метод преобразования введенных пользователем кастомных параметров парольной фразы в поля объекта ConfigParser
@@ -110,16 +254,16 @@ class Config():
             self.__config.set('passphrase', key, str(value))
         # запись изменений в файл
         return self.write_settings()
-    
+
     def set_defaults_options(self) -> int:
         """
         Сброс всех пользовательских параметров парольной фразы в значения по умолчанию. Метод применяется если:
         1. Не найдена секция passphrase в конфигурационном файле
         2. Название какого-либо из параметров секции passphrase изменено или параметр вовсе отсутсвует
+        Остальные секции (например, шаблоны парольных фраз patterns) сохраняются
         :return: 0 - параметры по умолчанию успешно записаны в конфигурационный файл, -1 - в противном случае
         """
-        # удаление всех текущих секций
-        for itm in self.__config.sections():
-            self.__config.remove_section(itm)
+        # удаление текущей секции passphrase
+        self.__config.remove_section('passphrase')
         # добавление секции passphrase с параметрами по умолчанию
         return self.set_options(self.__defaults)
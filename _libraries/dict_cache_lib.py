@@ -0,0 +1,156 @@
+# region Import
+import os
+import json
+import tempfile
+from os import path
+from hashlib import sha256
+from contextlib import closing
+
+from _libraries.dict_worker_lib import DictFileWorker, COMPILED_DICT_EXTENSION, COMPILED_DICT_VERSION
+from _libraries import logger_lib
+# endregion
+
+
+# region Const
+# переменная окружения, задающая каталог кэша словарей; пустое значение отключает кэш
+CACHE_DIR_ENV = 'PWDGEN_CACHE_DIR'
+CACHE_META_EXTENSION = '.json'
+# endregion
+
+
+def get_default_cache_dir() -> str:
+    """
+    Определение каталога кэша словарей по умолчанию: значение переменной окружения PWDGEN_CACHE_DIR, иначе
+    %LOCALAPPDATA%/pwdgen/cache в Windows и $XDG_CACHE_HOME/pwdgen (~/.cache/pwdgen) в остальных системах
+    :return: путь к каталогу кэша или None, если кэш отключен
+    """
+    if CACHE_DIR_ENV in os.environ:
+        return os.environ[CACHE_DIR_ENV] or None
+    # os.name вместо platform.system(): модуль platform заметно увеличивает время запуска утилиты
+    if os.name == 'nt':
+        return path.join(os.environ.get('LOCALAPPDATA', path.expanduser('~')), 'pwdgen', 'cache')
+    return path.join(os.environ.get('XDG_CACHE_HOME') or path.join(path.expanduser('~'), '.cache'), 'pwdgen')
+
+
+# постоянный (на диске) кэш предварительно обработанных словарей. Обработанный словарь (отфильтрованный, без символов новой строки,
+# с дополнительными полями, например формой слова в английской раскладке) хранится в скомпилированном формате и отображается
+# в память, поэтому повторный запуск утилиты не разбирает текстовые словари. Рядом хранятся метаданные исходного файла
+# (размер, время изменения, SHA-256), по которым проверяется актуальность кэша
+class DictCache(DictFileWorker):
+    # default constructor
+    def __init__(self, cache_dir:str=None) -> None:
+        DictFileWorker.__init__(self)
+        self.__cache_dir = cache_dir if cache_dir is not None else get_default_cache_dir()
+
+    def load(self, filename:str, variant:str, builder) -> list:
+        """
+        Загрузка обработанного словаря из кэша. Если кэш отсутствует или устарел, словарь обрабатывается функцией builder
+        и результат сохраняется в кэш для следующих запусков
+        :param filename: исходный (текстовый) файл словаря
+        :param variant: строка, описывающая способ обработки словаря (параметры фильтрации, преобразования и т.п.);
+            для разных вариантов обработки одного файла хранятся разные записи кэша
+        :param builder: функция без аргументов, возвращающая список полей обработанного словаря (каждое поле - список строк) или None
+        :return: список полей словаря (списки или поля скомпилированного словаря) или None, если словарь не удалось обработать
+        """
+        if not self.__cache_dir or filename is None or not path.exists(filename):
+            return builder()
+
+        key = sha256(f'{path.abspath(filename)}\0{variant}\0{COMPILED_DICT_VERSION}'.encode('utf-8')).hexdigest()[:32]
+        compiled_filename = path.join(self.__cache_dir, key + COMPILED_DICT_EXTENSION)
+        meta_filename = path.join(self.__cache_dir, key + CACHE_META_EXTENSION)
+
+        if self.__is_actual(filename, variant, compiled_filename, meta_filename):
+            compiled_dict = self._open_compiled_dict(compiled_filename)
+            if compiled_dict is not None:
+                return [compiled_dict.field(ind) for ind in range(compiled_dict.get_fields_count())]
+
+        fields = builder()
+        if fields is not None:
+            self.__store(filename, variant, fields, compiled_filename, meta_filename)
+        return fields
+
+    def __is_actual(self, filename:str, variant:str, compiled_filename:str, meta_filename:str) -> bool:
+        """
+        Проверка актуальности записи кэша. Запись актуальна, если размер и время изменения исходного файла совпадают с сохраненными;
+        если изменилось только время изменения (файл скопирован, восстановлен из репозитория и т.п.), сравнивается SHA-256 содержимого
+        :param filename: исходный файл словаря
+        :param variant: вариант обработки словаря
+        :param compiled_filename: файл кэша с обработанным словарем
+        :param meta_filename: файл метаданных записи кэша
+        :return: True - запись кэша актуальна, False - в противном случае
+        """
+        if not path.exists(compiled_filename) or not path.exists(meta_filename):
+            return False
+        try:
+            with closing(open(meta_filename, 'r', encoding='utf-8')) as meta_file:
+                meta = json.load(meta_file)
+            stat = os.stat(filename)
+            if meta.get('variant') != variant or meta.get('size') != stat.st_size:
+                return False
+            if meta.get('mtime_ns') == stat.st_mtime_ns:
+                return True
+            if meta.get('sha256') != self.__get_file_hash(filename):
+                return False
+            # содержимое не изменилось - обновляем время изменения, чтобы при следующих запусках не вычислять хэш
+            meta['mtime_ns'] = stat.st_mtime_ns
+            self.__write_atomic(meta_filename, json.dumps(meta).encode('utf-8'))
+            return True
+        except Exception as err:
+            logger_lib.warning(meta_filename, err)
+            return False
+
+    def __store(self, filename:str, variant:str, fields:list, compiled_filename:str, meta_filename:str) -> None:
+        """
+        Сохранение обработанного словаря и его метаданных в кэш. Файлы записываются во временные файлы и затем переименовываются,
+        поэтому параллельно запущенные процессы не увидят частично записанную запись кэша
+        :param filename: исходный файл словаря
+        :param variant: вариант обработки словаря
+        :param fields: список полей обработанного словаря
+        :param compiled_filename: файл кэша с обработанным словарем
+        :param meta_filename: файл метаданных записи кэша
+        :return: None
+        """
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            stat = os.stat(filename)
+            meta = {
+                'source': path.abspath(filename),
+                'variant': variant,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': self.__get_file_hash(filename)
+            }
+            tmp_fd, tmp_filename = tempfile.mkstemp(dir=self.__cache_dir, suffix=COMPILED_DICT_EXTENSION)
+            os.close(tmp_fd)
+            if self._write_compiled_dict(tmp_filename, fields) != 0:
+                os.remove(tmp_filename)
+                return
+            os.replace(tmp_filename, compiled_filename)
+            self.__write_atomic(meta_filename, json.dumps(meta).encode('utf-8'))
+        except Exception as err:
+            logger_lib.warning(self.__cache_dir, err)
+
+    def __write_atomic(self, filename:str, data:bytes) -> None:
+        """
+        Атомарная запись файла: данные записываются во временный файл в том же каталоге, который затем переименовывается
+        :param filename: файл, в который записываются данные
+        :param data: данные
+        :return: None
+        """
+        tmp_fd, tmp_filename = tempfile.mkstemp(dir=path.dirname(filename))
+        with closing(os.fdopen(tmp_fd, 'wb')) as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_filename, filename)
+
+    @staticmethod
+    def __get_file_hash(filename:str) -> str:
+        """
+        Вычисление SHA-256 содержимого файла
+        :param filename: файл
+        :return: хэш в шестнадцатеричном виде
+        """
+        file_hash = sha256()
+        with closing(open(filename, 'rb')) as src_file:
+            for chunk in iter(lambda: src_file.read(1024 * 1024), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
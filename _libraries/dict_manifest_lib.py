@@ -0,0 +1,119 @@
+# region Import
+import codecs
+from configparser import ConfigParser, Error as ConfigParserError
+from contextlib import closing
+from os import path
+
+from _libraries.dict_worker_lib import COMPILED_DICT_EXTENSION, CompiledDict
+# endregion
+
+
+# region Const
+# манифест словарей - файл в каталоге словарей, описывающий файл и кодировку словаря каждой части речи
+DICT_MANIFEST_FILENAME = 'manifest.ini'
+# размер блока, которым считывается начало словаря при проверке кодировки и наличия слов
+DICT_CHECK_BLOCK_SIZE = 1 << 16
+# endregion
+
+
+# ошибка словарей генератора: отсутствует манифест, словарь части речи отсутствует, пуст или не соответствует кодировке манифеста
+class DictionaryError(Exception):
+    pass
+
+
+# Class for dictionary manifest
+# манифест каталога словарей (DICT_MANIFEST_FILENAME): для каждой части речи (секция) - файл словаря (file) и его кодировка (encoding).
+# Манифест позволяет проверить все словари один раз до их загрузки и считывать словари в явно заданной кодировке,
+# а не в кодировке, принятой в системе
+class DictManifest():
+    # default constructor
+    def __init__(self, dict_files_path:str) -> None:
+        self.__dict_files_path = dict_files_path
+        self.__filename = f'{dict_files_path}/{DICT_MANIFEST_FILENAME}'
+        self.__config = ConfigParser()
+        try:
+            if not self.__config.read(self.__filename, encoding='utf-8'):
+                raise DictionaryError(f'{self.__filename}: dictionary manifest not found')
+        except ConfigParserError as err:
+            raise DictionaryError(f'{self.__filename}: {err}')
+
+    def get_parts(self) -> list:
+        """
+        Части речи, словари которых описаны в манифесте
+        :return: список условных обозначений частей речи
+        """
+        return self.__config.sections()
+
+    def get_filename(self, prt_of_sppech:str) -> str:
+        """
+        Файл словаря части речи
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: файл словаря (путь к нему)
+        """
+        return f'{self.__dict_files_path}/{self.__config.get(prt_of_sppech, "file")}'
+
+    def get_encoding(self, prt_of_sppech:str) -> str:
+        """
+        Кодировка словаря части речи (по умолчанию - utf-8)
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: кодировка файла словаря
+        """
+        return self.__config.get(prt_of_sppech, 'encoding', fallback='utf-8')
+
+    def check(self, prts_of_sppech:list) -> None:
+        """
+        Проверка словарей частей речи: словарь описан в манифесте, его кодировка известна, файл существует, начало файла
+        соответствует кодировке и словарь содержит хотя бы одно слово. Словарь, для которого есть только скомпилированный файл
+        (см. compile_dicts.py), должен содержать хотя бы одно слово. Проверяются все словари, и ошибки всех словарей
+        сообщаются одним исключением
+        :param prts_of_sppech: условные обозначения (сокращения) проверяемых словарей
+        :return: None
+        """
+        errors = list()
+        for prt in prts_of_sppech:
+            error = self.__check_dictionary(prt)
+            if error is not None:
+                errors.append(f'{prt}: {error}')
+        if errors:
+            raise DictionaryError(f'{self.__filename}: ' + '; '.join(errors))
+
+    def __check_dictionary(self, prt_of_sppech:str) -> str:
+        """
+        Проверка словаря одной части речи (см. check)
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: описание ошибки или None, если словарь корректен
+        """
+        if not self.__config.has_option(prt_of_sppech, 'file'):
+            return 'no dictionary in the manifest'
+        filename = self.get_filename(prt_of_sppech)
+        encoding = self.get_encoding(prt_of_sppech)
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)()
+        except LookupError:
+            return f'unknown encoding {encoding}'
+
+        if not path.exists(filename):
+            compiled_filename = path.splitext(filename)[0] + COMPILED_DICT_EXTENSION
+            if not path.exists(compiled_filename):
+                return f'{filename} not found'
+            try:
+                compiled_dict = CompiledDict(compiled_filename)
+            except Exception as err:
+                return f'{compiled_filename}: {err}'
+            words_count = len(compiled_dict)
+            compiled_dict.close()
+            return None if words_count else f'{compiled_filename} is empty'
+
+        # файл считывается блоками до первого слова, поэтому для непустого словаря проверяется только начало файла
+        try:
+            with closing(open(filename, 'rb')) as dict_file:
+                while True:
+                    block = dict_file.read(DICT_CHECK_BLOCK_SIZE)
+                    if decoder.decode(block, final=not block).strip():
+                        return None
+                    if not block:
+                        return f'{filename} is empty'
+        except UnicodeDecodeError as err:
+            return f'{filename} is not in {encoding} ({err.reason})'
+        except OSError as err:
+            return f'{filename}: {err}'
@@ -1,23 +1,222 @@
 # region Import
+import mmap
+from sys import byteorder
+from struct import Struct
+from array import array
+from collections.abc import Sequence
 from contextlib import closing
+from os import path
 
 from _libraries import logger_lib
 # endregion
 
 
+# region Const
+# формат скомпилированного (бинарного) словаря, все числа - little-endian:
+# [заголовок] [таблица смещений: words_count + 1 элементов uint32 на каждое поле] [упакованные слова в кодировке encoding]
+# смещения в таблице - абсолютные позиции в файле; слово i поля занимает байты [offsets[i], offsets[i + 1])
+COMPILED_DICT_MAGIC = b'PWDD'
+COMPILED_DICT_VERSION = 1
+COMPILED_DICT_ENCODING = 'utf-8'
+COMPILED_DICT_EXTENSION = '.pwdd'
+# magic, версия формата, количество полей у каждой записи, количество слов, кодировка (ascii, дополняется нулевыми байтами)
+COMPILED_DICT_HEADER = Struct('<4sHHI16s')
+COMPILED_DICT_OFFSET = Struct('<2I')
+# endregion
+
+
 class DictFileWorker():
     # default constructor
     def __init__(self) -> None:
         pass
-    
-    def _read_dict_file(self, filename:str) -> list:
+
+    def _read_dict_file(self, filename:str, encoding:str=None) -> list:
         """
         Считывание текстового файла в список строк (сериализация). Файл сичтывает полностью.
         :param filename: файл (имя файла и путь к нему), из которого считываются данные
+        :param encoding: кодировка файла; по умолчанию используется кодировка, принятая в системе
         :return: список строк, содержащихся в текстовом файле. Важно: каждый элемент списка - строка, содержащая на конце символ \n
         """
         try:
-            with closing(open(filename, "r")) as text_file:
+            with closing(open(filename, "r", encoding=encoding)) as text_file:
                 return text_file.readlines()
         except Exception as err:
             logger_lib.error(filename, err)
+
+    def _read_dict_words(self, filename:str, encoding:str=None) -> list:
+        """
+        Считывание слов словаря: символ новой строки (\n) удаляется, слова приводятся к нижнему регистру, пустые строки отбрасываются
+        :param filename: файл (имя файла и путь к нему), из которого считываются слова
+        :param encoding: кодировка файла; по умолчанию используется кодировка, принятая в системе
+        :return: список слов словаря или None, если файл не удалось считать
+        """
+        dict_content = self._read_dict_file(filename, encoding)
+        if dict_content is None:
+            return None
+        return [line.rstrip('\n').lower() for line in dict_content if line.rstrip('\n')]
+
+    def _load_dict_words(self, filename:str, encoding:str=None):
+        """
+        Загрузка слов словаря. Если рядом с текстовым файлом словаря есть скомпилированный словарь (COMPILED_DICT_EXTENSION),
+        который не старше текстового, то используется он (без разбора файла); иначе считывается текстовый файл
+        :param filename: текстовый файл словаря
+        :param encoding: кодировка текстового файла словаря; по умолчанию используется кодировка, принятая в системе
+        :return: список слов (list или CompiledDict) или None, если словарь не удалось считать
+        """
+        words = self._load_compiled_dict_file(filename)
+        if words is not None:
+            return words
+        return self._read_dict_words(filename, encoding)
+
+    def _load_compiled_dict_file(self, filename:str):
+        """
+        Открытие скомпилированного словаря, расположенного рядом с текстовым файлом словаря (см. compile_dicts.py), если он не старше текстового
+        :param filename: текстовый файл словаря
+        :return: объект CompiledDict или None, если актуального скомпилированного словаря нет
+        """
+        compiled_filename = path.splitext(filename)[0] + COMPILED_DICT_EXTENSION
+        if path.exists(compiled_filename) and (not path.exists(filename) or path.getmtime(compiled_filename) >= path.getmtime(filename)):
+            return self._open_compiled_dict(compiled_filename)
+        return None
+
+    def _compile_dict_file(self, filename:str, compiled_filename:str, encoding:str=None, translations:list=None) -> int:
+        """
+        Компиляция текстового словаря в бинарный формат (см. COMPILED_DICT_*): слова упаковываются подряд в кодировке UTF-8,
+        а перед ними записывается таблица смещений фиксированной ширины. Это позволяет выбрать слово i по двум смещениям без разбора всего файла
+        :param filename: текстовый файл словаря
+        :param compiled_filename: файл, в который будет записан скомпилированный словарь
+        :param encoding: кодировка текстового файла словаря; по умолчанию используется кодировка, принятая в системе
+        :param translations: таблицы преобразования символов (для str.translate); для каждой таблицы в запись словаря добавляется поле
+            с преобразованным словом (например, слово в английской раскладке клавиатуры)
+        :return: 0 - словарь успешно скомпилирован, -1 - в противном случае
+        """
+        words = self._read_dict_words(filename, encoding)
+        if words is None:
+            return -1
+        fields = [words]
+        for table in translations or list():
+            fields.append([word.translate(table) for word in words])
+        return self._write_compiled_dict(compiled_filename, fields)
+
+    def _write_compiled_dict(self, compiled_filename:str, fields:list) -> int:
+        """
+        Запись скомпилированного словаря. Каждая запись словаря может состоять из нескольких полей (например, слово и его форма в
+        другой раскладке); для каждого поля пишется своя таблица смещений
+        :param compiled_filename: файл, в который будет записан скомпилированный словарь
+        :param fields: список полей; каждое поле - список строк одинаковой длины (по количеству слов словаря)
+        :return: 0 - словарь успешно записан, -1 - в противном случае
+        """
+        words_count = len(fields[0])
+        blobs = [[word.encode(COMPILED_DICT_ENCODING) for word in field] for field in fields]
+        # слова всех полей располагаются сразу после заголовка и всех таблиц смещений
+        position = COMPILED_DICT_HEADER.size + len(fields) * (words_count + 1) * 4
+        offsets = array('I')
+        for blob in blobs:
+            for word in blob:
+                offsets.append(position)
+                position += len(word)
+            offsets.append(position)
+        # таблица смещений хранится в little-endian независимо от платформы
+        if byteorder == 'big':
+            offsets.byteswap()
+        if offsets.itemsize != 4 or position > 0xFFFFFFFF:
+            logger_lib.error(compiled_filename, 'Dictionary is too large for the compiled format')
+            return -1
+        try:
+            with closing(open(compiled_filename, "wb")) as bin_file:
+                bin_file.write(COMPILED_DICT_HEADER.pack(COMPILED_DICT_MAGIC, COMPILED_DICT_VERSION, len(fields), words_count,
+                                                         COMPILED_DICT_ENCODING.encode('ascii')))
+                bin_file.write(offsets.tobytes())
+                for blob in blobs:
+                    bin_file.write(b''.join(blob))
+                return 0
+        except Exception as err:
+            logger_lib.error(compiled_filename, err)
+            return -1
+
+    def _open_compiled_dict(self, compiled_filename:str):
+        """
+        Открытие скомпилированного словаря. Файл отображается в память (mmap) только на чтение, поэтому страницы файла разделяются
+        между процессами, а выбор слова не требует разбора всего словаря
+        :param compiled_filename: файл скомпилированного словаря
+        :return: объект CompiledDict или None, если словарь не удалось открыть
+        """
+        try:
+            return CompiledDict(compiled_filename)
+        except Exception as err:
+            logger_lib.error(compiled_filename, err)
+
+
+# скомпилированный словарь, отображенный в память; ведет себя как неизменяемый список слов (первого поля записей)
+class CompiledDict(Sequence):
+    # default constructor
+    def __init__(self, compiled_filename:str) -> None:
+        self.__mmap = None
+        with closing(open(compiled_filename, "rb")) as bin_file:
+            self.__mmap = mmap.mmap(bin_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, fields_count, words_count, encoding = COMPILED_DICT_HEADER.unpack_from(self.__mmap, 0)
+        if magic != COMPILED_DICT_MAGIC or version != COMPILED_DICT_VERSION:
+            self.__mmap.close()
+            raise ValueError('Unsupported compiled dictionary format')
+        self.__fields_count = fields_count
+        self.__words_count = words_count
+        self.__encoding = encoding.rstrip(b'\0').decode('ascii')
+
+    # default destructor
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        if self.__mmap is not None and not self.__mmap.closed:
+            self.__mmap.close()
+
+    def __len__(self) -> int:
+        return self.__words_count
+
+    def __getitem__(self, ind:int) -> str:
+        return self.get_field(ind, 0)
+
+    def get_fields_count(self) -> int:
+        """
+        Количество полей в каждой записи словаря
+        :return: количество полей
+        """
+        return self.__fields_count
+
+    def field(self, field:int):
+        """
+        Представление одного поля всех записей словаря в виде неизменяемого списка (без копирования данных)
+        :param field: номер поля записи
+        :return: объект CompiledDictField
+        """
+        if not 0 <= field < self.__fields_count:
+            raise IndexError('compiled dictionary field out of range')
+        return CompiledDictField(self, field)
+
+    def get_field(self, ind:int, field:int) -> str:
+        """
+        Получение поля записи словаря: из таблицы смещений поля считываются два соседних смещения, ограничивающие слово
+        :param ind: номер записи (слова) словаря; допускаются отрицательные номера, как у списков
+        :param field: номер поля записи
+        :return: значение поля записи (слово)
+        """
+        if ind < 0:
+            ind += self.__words_count
+        if not 0 <= ind < self.__words_count or not 0 <= field < self.__fields_count:
+            raise IndexError('compiled dictionary index out of range')
+        start, end = COMPILED_DICT_OFFSET.unpack_from(self.__mmap, COMPILED_DICT_HEADER.size + (field * (self.__words_count + 1) + ind) * 4)
+        return self.__mmap[start:end].decode(self.__encoding)
+
+
+# поле записей скомпилированного словаря; ведет себя как неизменяемый список значений этого поля
+class CompiledDictField(Sequence):
+    # default constructor
+    def __init__(self, compiled_dict:CompiledDict, field:int) -> None:
+        self.__compiled_dict = compiled_dict
+        self.__field = field
+
+    def __len__(self) -> int:
+        return len(self.__compiled_dict)
+
+    def __getitem__(self, ind:int) -> str:
+        return self.__compiled_dict.get_field(ind, self.__field)
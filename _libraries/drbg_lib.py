@@ -0,0 +1,80 @@
+# region Import
+import hashlib
+from os import urandom
+
+from _libraries.entropy_pool_lib import EntropyPool, ThreadLocalPool
+# endregion
+
+
+# region Const
+# источники случайных байтов генераторов паролей: system - ОС (os.urandom), drbg - детерминированный генератор HashDrbg
+RNG_MODES = ['system', 'drbg']
+# размер ключа HashDrbg в байтах
+DRBG_KEY_SIZE = 32
+# endregion
+
+
+# Class for hash-based deterministic random bit generator
+# детерминированный генератор случайных байтов на основе SHAKE128 (hashlib): блок с номером counter - это выход
+# SHAKE128(ключ || counter) нужной длины, поэтому блок любого размера вычисляется одним вызовом hashlib без обращений к ОС.
+# Ключ вычисляется из начального значения (seed) и строки персонализации (разные генераторы с одним seed получают независимые
+# потоки) или, если seed не задан, берется из os.urandom. Генератор с явным seed выдает одну и ту же последовательность байтов
+# при каждом запуске и предназначен только для бенчмарков, тестов и нагрузочного тестирования.
+# Объект используется как источник байтов пула энтропии (EntropyPool(source=HashDrbg(...)), см. make_randomizer)
+class HashDrbg():
+    # default constructor
+    def __init__(self, seed:str=None, personalization:str='') -> None:
+        self.__seed = seed
+        self.__personalization = personalization
+        self.__key = None
+        self.__counter = 0
+        self.reseed(seed)
+
+    def reseed(self, seed:str=None) -> None:
+        """
+        Установка нового начального значения; счетчик блоков сбрасывается
+        :param seed: начальное значение (None - ключ берется из os.urandom)
+        :return: None
+        """
+        self.__seed = seed
+        if seed is None:
+            self.__key = urandom(DRBG_KEY_SIZE)
+        else:
+            self.__key = hashlib.sha256(f'pwdgen-drbg\0{self.__personalization}\0{seed}'.encode('utf-8')).digest()
+        self.__counter = 0
+
+    def reset_after_fork(self) -> None:
+        """
+        Сброс генератора в дочернем процессе после fork: генератор без seed получает новый ключ от ОС, иначе дочерний процесс
+        выдавал бы те же байты, что и родительский. Генератор с seed не меняется (воспроизводимость задается явно, см. reseed)
+        :return: None
+        """
+        if self.__seed is None:
+            self.reseed()
+
+    def __call__(self, count:int) -> bytes:
+        """
+        Получение следующего блока случайных байтов
+        :param count: количество байтов
+        :return: случайные байты
+        """
+        block = hashlib.shake_128(self.__key + self.__counter.to_bytes(8, 'little')).digest(count)
+        self.__counter += 1
+        return block
+
+
+def make_randomizer(rng:str='system', seed:str=None, personalization:str=''):
+    """
+    Создание источника случайных чисел генератора паролей
+    :param rng: источник случайных байтов (см. RNG_MODES)
+    :param seed: начальное значение генератора drbg (None - ключ берется из os.urandom)
+    :param personalization: строка персонализации генератора drbg (например, имя генератора паролей), чтобы разные генераторы
+        с одним seed получали независимые последовательности
+    :return: объект EntropyPool: без seed - пул с отдельным буфером и источником для каждого потока (ThreadLocalPool), с seed - один пул
+        для всех потоков (последовательность воспроизводима только при генерации в одном потоке)
+    """
+    if seed is not None:
+        return EntropyPool(source=HashDrbg(seed, personalization))
+    if rng == 'drbg':
+        return ThreadLocalPool(source_factory=lambda: HashDrbg(None, personalization))
+    return ThreadLocalPool()
@@ -0,0 +1,111 @@
+# region Import
+from math import log2
+from functools import lru_cache
+# endregion
+
+
+# оценка энтропии генерируемых паролей (в битах, энтропия Шеннона распределения паролей). Пароль собирается из независимо выбранных
+# частей (слова, спецсимволы, цифры, разделители), поэтому энтропия пароля оценивается суммой энтропий частей. Оценка является
+# верхней границей: совпадение паролей, собранных из разных частей (например, слово, оканчивающееся символом, совпадающим
+# с соседним спецсимволом), не учитывается
+
+
+def get_distribution_entropy(counts) -> float:
+    """
+    Энтропия дискретного распределения, заданного количествами исходов (например, количеством слов словаря с одинаковым префиксом)
+    :param counts: итерируемый объект количеств исходов (целые положительные числа)
+    :return: энтропия в битах
+    """
+    counts = list(counts)
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    return log2(total) - sum(count * log2(count) for count in counts) / total
+
+
+@lru_cache(maxsize=None)
+def get_digits_entropy(max_count:int) -> float:
+    """
+    Энтропия числа, добавляемого в начало парольной фразы PwdGen: количество цифр выбирается равновероятно из 1..max_count,
+    цифры - равновероятно из 0..9, и число записывается без ведущих нулей (поэтому, например, число 7 получается при любом количестве цифр)
+    :param max_count: максимальное количество цифр
+    :return: энтропия в битах
+    """
+    entropy = 0.0
+    for length in range(1, max_count + 1):
+        # числа, запись которых состоит из length цифр (для length = 1 - в т.ч. 0), получаются при количестве цифр не менее length
+        values_count = 10 if length == 1 else 9 * 10 ** (length - 1)
+        probability = sum(10.0 ** -count for count in range(length, max_count + 1)) / max_count
+        entropy -= values_count * probability * log2(probability)
+    return entropy
+
+
+@lru_cache(maxsize=None)
+def _get_specials_layouts(words_count:int, max_count:int) -> tuple:
+    """
+    Распределения расположений спецсимволов в парольной фразе PwdGen при заданном количестве спецсимволов: каждый спецсимвол вставляется
+    в позицию randint(0, длина + 1) (позиции длина и длина + 1 равносильны добавлению в конец). Разные последовательности позиций могут
+    давать одинаковое расположение спецсимволов между словами, поэтому распределение вычисляется перебором всех последовательностей позиций
+    :param words_count: количество слов парольной фразы
+    :param max_count: максимальное количество спецсимволов
+    :return: кортеж словарей: i-й словарь - распределение расположений (расположение -> вероятность) при i + 1 спецсимволах
+    """
+    # расположение - последовательность слов (W) и спецсимволов (S)
+    layouts = list()
+    states = {(): 1.0}
+    for count in range(1, max_count + 1):
+        next_states = dict()
+        for state, probability in states.items():
+            sequence = list(state) or ['W'] * words_count
+            length = len(sequence)
+            for pos in range(length + 2):
+                next_sequence = sequence[:pos] + ['S'] + sequence[pos:]
+                key = tuple(next_sequence)
+                next_states[key] = next_states.get(key, 0.0) + probability / (length + 2)
+        states = next_states
+        layouts.append(states)
+    return tuple(layouts)
+
+
+@lru_cache(maxsize=None)
+def get_specials_entropy(words_count:int, max_count:int, alphabet_size:int) -> float:
+    """
+    Энтропия вставки спецсимволов в парольную фразу PwdGen: количество спецсимволов выбирается равновероятно из 1..max_count,
+    каждый спецсимвол - равновероятно из алфавита и вставляется в случайную позицию (см. _get_specials_layouts).
+    Символы выбираются независимо от позиций, поэтому к энтропии расположения добавляется log2(размер алфавита) на каждый спецсимвол
+    :param words_count: количество слов парольной фразы
+    :param max_count: максимальное количество спецсимволов
+    :param alphabet_size: количество спецсимволов в алфавите
+    :return: энтропия в битах
+    """
+    # расположения с разным количеством спецсимволов различны, поэтому распределение расположений - смесь распределений по количествам
+    layouts = dict()
+    for states in _get_specials_layouts(words_count, max_count):
+        for state, probability in states.items():
+            layouts[state] = layouts.get(state, 0.0) + probability / max_count
+    layout_entropy = -sum(probability * log2(probability) for probability in layouts.values())
+    mean_count = (max_count + 1) / 2
+    return layout_entropy + mean_count * log2(alphabet_size)
+
+
+def get_specials_count_entropy(words_count:int, count:int, alphabet_size:int) -> float:
+    """
+    Энтропия вставки заданного количества спецсимволов в парольную фразу PwdGen (расположение и символы, см. get_specials_entropy)
+    :param words_count: количество слов парольной фразы
+    :param count: количество спецсимволов
+    :param alphabet_size: количество спецсимволов в алфавите
+    :return: энтропия в битах
+    """
+    if count == 0:
+        return 0.0
+    layouts = _get_specials_layouts(words_count, count)[count - 1]
+    return -sum(probability * log2(probability) for probability in layouts.values()) + count * log2(alphabet_size)
+
+
+def get_uniform_entropy(count:int) -> float:
+    """
+    Энтропия равновероятного выбора из count различных вариантов
+    :param count: количество вариантов
+    :return: энтропия в битах
+    """
+    return log2(count) if count > 0 else 0.0
@@ -0,0 +1,211 @@
+# region Import
+import os
+from os import urandom
+from threading import Lock, local
+from weakref import WeakSet
+# endregion
+
+
+# все созданные пулы энтропии; после fork буферы пулов в дочернем процессе сбрасываются (см. EntropyPool.reset_after_fork), иначе дочерний
+# процесс выдавал бы те же случайные байты, что и родительский (и другие дочерние процессы)
+_pools = WeakSet()
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in list(_pools):
+        pool.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+# пул энтропии: криптографически стойкие случайные байты запрашиваются у ОС (os.urandom) большими блоками и далее раздаются
+# по частям, поэтому на выбор слова или символа не приходится отдельный системный вызов. Вместо ОС источником байтов может быть
+# любая функция source(count) -> bytes (например, детерминированный генератор drbg_lib.HashDrbg).
+# интерфейс (choice, randint, randrange, random) совместим с random.SystemRandom в объеме, используемом генераторами паролей
+class EntropyPool():
+    # region ClassConst
+    # размер блока байтов, запрашиваемого у ОС за один вызов
+    DEFAULT_BLOCK_SIZE = 64 * 1024
+    # endregion ClassConst
+
+    # default constructor
+    def __init__(self, block_size:int=DEFAULT_BLOCK_SIZE, source=urandom) -> None:
+        self.__block_size = block_size
+        self.__source = source
+        self.__buffer = b''
+        self.__position = 0
+        self.__lock = Lock()
+        # статистика: количество обращений к ОС за случайными байтами и количество выданных случайных значений
+        self.__refills_count = 0
+        self.__draws_count = 0
+        _pools.add(self)
+
+    def reset_after_fork(self) -> None:
+        """
+        Сброс буфера пула в дочернем процессе после fork: неиспользованные байты родительского процесса отбрасываются,
+        следующий запрос получит новый блок от источника. Блокировка создается заново, т.к. в момент fork она могла быть захвачена.
+        Источник, у которого есть метод reset_after_fork (см. drbg_lib.HashDrbg), также сбрасывается
+        :return: None
+        """
+        self.__buffer = b''
+        self.__position = 0
+        self.__lock = Lock()
+        if hasattr(self.__source, 'reset_after_fork'):
+            self.__source.reset_after_fork()
+
+    def reset(self) -> None:
+        """
+        Сброс буфера пула: неиспользованные байты отбрасываются, следующий запрос получит новый блок от источника
+        (используется после смены начального значения детерминированного источника)
+        :return: None
+        """
+        with self.__lock:
+            self.__buffer = b''
+            self.__position = 0
+
+    def getbytes(self, count:int) -> bytes:
+        """
+        Получение случайных байтов из пула. При исчерпании буфера он пополняется новым блоком от источника (по умолчанию - ОС)
+        :param count: количество байтов
+        :return: случайные байты
+        """
+        return self.__take(count, 0)
+
+    def __take(self, count:int, draws:int) -> bytes:
+        """
+        Выдача случайных байтов из буфера под блокировкой пула; под той же блокировкой увеличивается счетчик выданных значений,
+        поэтому статистика не теряет обращения при одновременной генерации в нескольких потоках
+        :param count: количество байтов
+        :param draws: на сколько увеличить количество выданных случайных значений (0 или 1)
+        :return: случайные байты
+        """
+        with self.__lock:
+            self.__draws_count += draws
+            if self.__position + count > len(self.__buffer):
+                # неиспользованный остаток буфера сохраняется, чтобы не расходовать энтропию впустую
+                self.__buffer = self.__buffer[self.__position:] + self.__source(max(self.__block_size, count))
+                self.__position = 0
+                self.__refills_count += 1
+            chunk = self.__buffer[self.__position:self.__position + count]
+            self.__position += count
+            return chunk
+
+    def randbelow(self, n:int) -> int:
+        """
+        Случайное целое число из диапазона [0, n) без смещения: берется минимально необходимое количество бит,
+        значения, выходящие за границу диапазона, отбрасываются (rejection sampling)
+        :param n: верхняя граница диапазона (не включается), n > 0
+        :return: случайное целое число
+        """
+        bits = (n - 1).bit_length()
+        if bits == 0:
+            with self.__lock:
+                self.__draws_count += 1
+            return 0
+        bytes_count = (bits + 7) // 8
+        shift = bytes_count * 8 - bits
+        # значение засчитывается один раз - при первом запросе байтов (повторные запросы - отброшенные значения)
+        draws = 1
+        while True:
+            value = int.from_bytes(self.__take(bytes_count, draws), 'little') >> shift
+            if value < n:
+                return value
+            draws = 0
+
+    def randrange(self, stop:int) -> int:
+        """
+        Случайное целое число из диапазона [0, stop) (аналог random.randrange с одним аргументом)
+        :param stop: верхняя граница диапазона (не включается)
+        :return: случайное целое число
+        """
+        if stop <= 0:
+            raise ValueError('empty range for randrange()')
+        return self.randbelow(stop)
+
+    def randint(self, a:int, b:int) -> int:
+        """
+        Случайное целое число из диапазона [a, b] (аналог random.randint)
+        :param a: нижняя граница диапазона
+        :param b: верхняя граница диапазона (включается)
+        :return: случайное целое число
+        """
+        if b < a:
+            raise ValueError('empty range for randint()')
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq):
+        """
+        Случайный элемент непустой последовательности (аналог random.choice)
+        :param seq: последовательность (список, строка, скомпилированный словарь и т.п.)
+        :return: случайный элемент последовательности
+        """
+        if not len(seq):
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[self.randbelow(len(seq))]
+
+    def random(self) -> float:
+        """
+        Случайное число с плавающей точкой из диапазона [0.0, 1.0) с 53 значащими битами (аналог random.random)
+        :return: случайное число
+        """
+        return (int.from_bytes(self.__take(7, 1), 'little') >> 3) * 2 ** -53
+
+    def get_stats(self) -> dict:
+        """
+        Статистика использования пула
+        :return: словарь: refills - количество обращений к источнику (по умолчанию - os.urandom), draws - количество выданных случайных значений
+        """
+        return {'refills': self.__refills_count, 'draws': self.__draws_count}
+
+
+# пул энтропии с отдельным буфером для каждого потока: каждый поток при первом обращении получает собственный объект EntropyPool
+# (хранится в данных потока threading.local), поэтому потоки, разделяющие один генератор паролей, не ожидают друг друга на блокировке
+# пула и не делят источник байтов. Источник создается для каждого потока функцией source_factory (например, собственный HashDrbg
+# без seed); по умолчанию каждый поток получает байты от ОС (os.urandom). Интерфейс совпадает с EntropyPool; reset и get_stats
+# относятся к пулу текущего потока
+class ThreadLocalPool():
+    # default constructor
+    def __init__(self, block_size:int=EntropyPool.DEFAULT_BLOCK_SIZE, source_factory=None) -> None:
+        self.__block_size = block_size
+        self.__source_factory = source_factory
+        self.__local = local()
+
+    def get_pool(self) -> EntropyPool:
+        """
+        Пул энтропии текущего потока (создается при первом обращении из потока). Атрибуты данных потока читаются медленнее обычных,
+        поэтому методы получают пул один раз и далее работают с обычным объектом EntropyPool
+        :return: объект EntropyPool
+        """
+        try:
+            return self.__local.pool
+        except AttributeError:
+            source = self.__source_factory() if self.__source_factory is not None else urandom
+            pool = EntropyPool(self.__block_size, source)
+            self.__local.pool = pool
+            return pool
+
+    def reset(self) -> None:
+        self.get_pool().reset()
+
+    def getbytes(self, count:int) -> bytes:
+        return self.get_pool().getbytes(count)
+
+    def randbelow(self, n:int) -> int:
+        return self.get_pool().randbelow(n)
+
+    def randrange(self, stop:int) -> int:
+        return self.get_pool().randrange(stop)
+
+    def randint(self, a:int, b:int) -> int:
+        return self.get_pool().randint(a, b)
+
+    def choice(self, seq):
+        return self.get_pool().choice(seq)
+
+    def random(self) -> float:
+        return self.get_pool().random()
+
+    def get_stats(self) -> dict:
+        return self.get_pool().get_stats()
@@ -0,0 +1,173 @@
+# region Import
+import os
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from _libraries.service_lib import PwdGenService
+from _libraries.pwd_options_lib import CMD_OPTIONS_DEFAULTS
+from _libraries import logger_lib
+# endregion
+
+
+# region Const
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 503: 'Service Unavailable'}
+# пользовательские параметры парольной фразы, которые можно передать в запросе вместо compl
+CUSTOM_OPTIONS = [key for key in CMD_OPTIONS_DEFAULTS if key != 'count']
+# endregion
+
+
+# HTTP-сервис генерации паролей на asyncio (без сторонних зависимостей). Обрабатываются запросы:
+#   GET /passphrase?compl=<weak|standard|strong|custom>&count=N - парольные фразы PwdGen (вместо compl допускается передать
+#       пользовательские параметры: words_count, char_count, use_numbers, use_special, use_upper_case)
+#   GET /xkcd?compl=<weak|standard|strong|super>&count=N - пароли на основе библиотеки xkcd (длина пароля ограничивается параметрами
+#       min_length и max_length)
+# ответ - JSON в формате service_lib. Генерация выполняется в пуле потоков, поэтому цикл событий не блокируется; количество
+# одновременно обрабатываемых запросов ограничено - при превышении лимита сразу возвращается 503
+class PwdGenHttpServer():
+    # region ClassConst
+    DEFAULT_MAX_IN_FLIGHT = 256
+    # endregion ClassConst
+
+    # default constructor
+    def __init__(self, pwd_gen, xkcd_obj, max_in_flight:int=DEFAULT_MAX_IN_FLIGHT, workers:int=None) -> None:
+        self.__service = PwdGenService(pwd_gen, xkcd_obj)
+        self.__pwd_gen = pwd_gen
+        self.__max_in_flight = max_in_flight
+        self.__in_flight = 0
+        self.__executor = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4))
+
+    async def start(self, host:str, port:int):
+        """
+        Запуск HTTP-сервиса
+        :param host: адрес, на котором принимаются соединения
+        :param port: порт
+        :return: объект asyncio.Server
+        """
+        return await asyncio.start_server(self.__handle_connection, host, port)
+
+    def close(self) -> None:
+        self.__executor.shutdown(wait=False)
+
+    async def __handle_connection(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        """
+        Обслуживание соединения: соединение поддерживается (keep-alive), пока клиент не закроет его или не запросит закрытие
+        :param reader: поток чтения соединения
+        :param writer: поток записи соединения
+        :return: None
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                request_line = lines[0].split()
+                headers = dict()
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                # тело запроса не используется, но должно быть считано, чтобы не нарушить разбор следующего запроса
+                content_length = headers.get('content-length', '0')
+                if content_length.isdigit() and int(content_length) > 0:
+                    await reader.readexactly(int(content_length))
+
+                keep_alive = len(request_line) == 3 and request_line[2] == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                status, response = await self.__dispatch(request_line)
+                body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                writer.write(f'HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n'
+                             f'Content-Type: application/json; charset=utf-8\r\n'
+                             f'Content-Length: {len(body)}\r\n'
+                             f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except Exception as err:
+            logger_lib.error('HTTP connection', err)
+        finally:
+            writer.close()
+
+    async def __dispatch(self, request_line:list) -> tuple:
+        """
+        Разбор строки запроса и генерация паролей в пуле потоков
+        :param request_line: строка запроса HTTP, разбитая на метод, путь и версию протокола
+        :return: кортеж (код ответа HTTP, ответ в формате service_lib)
+        """
+        if len(request_line) != 3:
+            return 400, {'error': 'malformed request line'}
+        if request_line[0] != 'GET':
+            return 405, {'error': 'only GET is supported'}
+        url = urlsplit(request_line[1])
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path not in ['/passphrase', '/xkcd']:
+            return 404, {'error': f'unknown path: {url.path}'}
+
+        count = query.get('count', '1')
+        request = {
+            'engine': 'xkcd' if url.path == '/xkcd' else 'pwdgen',
+            'preset': query.get('compl', 'standard'),
+            'count': int(count) if count.isdigit() else count
+        }
+        # пользовательские параметры парольной фразы (если переданы) используются вместо пресета; недостающие берутся из пресета custom
+        # при обработке запроса в пуле потоков (см. __handle_request)
+        custom_options = {key: query[key] for key in CUSTOM_OPTIONS if key in query} if request['engine'] == 'pwdgen' else None
+        # шаблон парольной фразы (имя шаблона из конфигурационного файла или сам шаблон) заменяет шаблон по количеству слов
+        if request['engine'] == 'pwdgen' and 'pattern' in query:
+            request['pattern'] = query['pattern']
+        # параметры политики паролей (см. policy_lib); для xkcd - только ограничение длины пароля
+        policy_keys = [key for key in ['min_length', 'max_length', 'require', 'forbid'] if key in query]
+        if policy_keys:
+            request['policy'] = {key: query[key] for key in policy_keys}
+
+        if self.__in_flight >= self.__max_in_flight:
+            return 503, {'error': 'too many requests in flight'}
+        self.__in_flight += 1
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(self.__executor, self.__handle_request, request, custom_options)
+        finally:
+            self.__in_flight -= 1
+        return (400 if 'error' in response else 200), response
+
+    def __handle_request(self, request:dict, custom_options:dict) -> dict:
+        """
+        Обработка запроса в пуле потоков. Кастомные параметры считываются здесь, а не в цикле событий: при изменении конфигурационного
+        файла их получение считывает файл (см. PwdGen.get_passphrase_options), что заблокировало бы все соединения
+        :param request: запрос (формат описан в service_lib)
+        :param custom_options: пользовательские параметры парольной фразы из запроса (None или пустой словарь - не переданы)
+        :return: ответ
+        """
+        if custom_options:
+            request = dict(request, options=dict(self.__pwd_gen.get_passphrase_options('custom'), **custom_options))
+        return self.__service.handle_request(request)
+
+
+def serve(host:str, port:int, pwd_gen, xkcd_obj, max_in_flight:int=PwdGenHttpServer.DEFAULT_MAX_IN_FLIGHT) -> None:
+    """
+    Запуск HTTP-сервиса генерации паролей; работает до прерывания (Ctrl+C / SIGINT)
+    :param host: адрес, на котором принимаются соединения
+    :param port: порт
+    :param pwd_gen: объект PwdGen
+    :param xkcd_obj: объект XKCD
+    :param max_in_flight: максимальное количество одновременно обрабатываемых запросов
+    :return: None
+    """
+    # словари загружаются до начала обслуживания запросов
+    pwd_gen.load_dictionaries()
+    http_server = PwdGenHttpServer(pwd_gen, xkcd_obj, max_in_flight)
+
+    async def run():
+        server = await http_server.start(host, port)
+        logger_lib.info(f'http://{host}:{port}', 'password generator HTTP service started')
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.close()
+    logger_lib.info(f'http://{host}:{port}', 'password generator HTTP service stopped')
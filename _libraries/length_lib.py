@@ -0,0 +1,166 @@
+# region Import
+from bisect import bisect_right
+from itertools import accumulate
+
+from _libraries.entropy_lib import get_distribution_entropy
+# endregion
+
+
+# выбор длин частей пароля заданной длины. Пароль состоит из позиций (слов), длина слова каждой позиции зависит от выбранного слова,
+# и дополнительной части (например, спецсимволы и цифры), вариант которой (метка) задает ее длину. Слова позиции разбиваются на корзины
+# по длине; если слово каждой позиции и вариант дополнительной части выбираются равновероятно и независимо, то при ограничении длины
+# пароля распределение остается равновероятным на множестве паролей допустимой длины. Поэтому сначала выбирается разбиение длины
+# (вариант дополнительной части и суммарная длина слов) с весом, равным количеству комбинаций слов такой длины, затем для каждой позиции
+# по очереди - длина слова с весом (размер корзины) * (количество комбинаций слов остальных позиций на оставшуюся длину), после чего слово
+# выбирается равновероятно из корзины. Количества комбинаций вычисляются один раз (динамическое программирование по позициям).
+# Все выборы делаются по одному случайному числу из [0, количество исходов): число однозначно раскладывается на номер разбиения,
+# длины и номера слов в корзинах (смешанная система счисления с основаниями - весами вариантов), поэтому выбор одного пароля требует
+# одного обращения к источнику случайных чисел и O(количество позиций) операций и не отбраковывает пароли
+
+
+# Class for length-constrained sampling
+# таблица выбора длин: количества комбинаций и накопленные веса вариантов для всех достижимых состояний (позиция, оставшаяся длина)
+class LengthSampler():
+    # default constructor
+    def __init__(self, bucket_sizes:list, extras:list, min_length:int=None, max_length:int=None) -> None:
+        """
+        :param bucket_sizes: для каждой позиции - словарь: длина слова -> количество слов такой длины (размер корзины)
+        :param extras: варианты дополнительной части: список кортежей (метка, длина, вес); вес - количество равновероятных исходов варианта
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        """
+        self.__bucket_sizes = [{length: size for length, size in sizes.items() if size > 0} for sizes in bucket_sizes]
+        # ways[i][R] - количество комбинаций слов позиций i..k-1 суммарной длины R
+        ways = [{0: 1}]
+        for sizes in reversed(self.__bucket_sizes):
+            current = dict()
+            for rest, rest_ways in ways[0].items():
+                for length, size in sizes.items():
+                    current[rest + length] = current.get(rest + length, 0) + size * rest_ways
+            ways.insert(0, current)
+        self.__ways = ways
+
+        min_length = min_length if min_length is not None else 0
+        # разбиения длины: (метка, длина дополнительной части, суммарная длина слов) и их веса
+        self.__splits = list()
+        weights = list()
+        for label, extra_length, weight in extras:
+            for words_length, words_ways in sorted(ways[0].items()):
+                length = extra_length + words_length
+                if length >= min_length and (max_length is None or length <= max_length):
+                    self.__splits.append((label, extra_length, words_length))
+                    weights.append(weight * words_ways)
+        self.__split_weights = list(accumulate(weights))
+        self.__total = self.__split_weights[-1] if weights else 0
+        # варианты длины слова позиции i при оставшейся длине R: (длины, накопленные веса); вычисляются при первом обращении
+        self.__choices = dict()
+
+    def get_total(self) -> int:
+        """
+        Количество равновероятных исходов (комбинаций слов и вариантов дополнительной части), удовлетворяющих ограничению длины
+        :return: количество исходов (0 - ограничению не удовлетворяет ни один пароль)
+        """
+        return self.__total
+
+    def get_lengths_range(self, extras:list) -> tuple:
+        """
+        Диапазон длин паролей без ограничения длины (для сообщения об ошибке)
+        :param extras: варианты дополнительной части (аналогично конструктору)
+        :return: кортеж (минимальная длина, максимальная длина)
+        """
+        lengths = [extra_length + words_length for label, extra_length, weight in extras for words_length in self.__ways[0]]
+        return min(lengths), max(lengths)
+
+    def draw(self, randbelow) -> tuple:
+        """
+        Выбор метки дополнительной части, длин слов всех позиций и номеров слов в корзинах
+        :param randbelow: функция randbelow(n) источника случайных чисел (целое число из [0, n))
+        :return: кортеж (метка, список длин слов по позициям, список номеров слов в корзинах соответствующих длин)
+        """
+        value = randbelow(self.__total)
+        split = bisect_right(self.__split_weights, value)
+        if split:
+            value -= self.__split_weights[split - 1]
+        label, extra_length, remaining = self.__splits[split]
+        # вес разбиения - (вес метки) * (количество комбинаций слов), остаток от деления равновероятен среди комбинаций слов
+        value %= self.__ways[0][remaining]
+        lengths = list()
+        positions = list()
+        for ind in range(len(self.__bucket_sizes)):
+            choice_lengths, choice_weights, rest_ways = self.__get_choices(ind, remaining)
+            choice = bisect_right(choice_weights, value)
+            if choice:
+                value -= choice_weights[choice - 1]
+            # вес варианта - (размер корзины) * (количество комбинаций слов остальных позиций)
+            position, value = divmod(value, rest_ways[choice])
+            lengths.append(choice_lengths[choice])
+            positions.append(position)
+            remaining -= choice_lengths[choice]
+        return label, lengths, positions
+
+    def __get_choices(self, ind:int, remaining:int) -> tuple:
+        """
+        Варианты длины слова позиции при заданной оставшейся длине: вес варианта - размер корзины, умноженный на количество комбинаций
+        слов остальных позиций на оставшуюся длину
+        :param ind: номер позиции
+        :param remaining: суммарная длина слов позиций ind..k-1
+        :return: кортеж (длины, накопленные веса, количества комбинаций слов остальных позиций)
+        """
+        key = (ind, remaining)
+        choices = self.__choices.get(key)
+        if choices is None:
+            lengths = list()
+            weights = list()
+            rests = list()
+            for length, size in sorted(self.__bucket_sizes[ind].items()):
+                rest_ways = self.__ways[ind + 1].get(remaining - length, 0)
+                if rest_ways:
+                    lengths.append(length)
+                    weights.append(size * rest_ways)
+                    rests.append(rest_ways)
+            choices = (lengths, list(accumulate(weights)), rests)
+            self.__choices[key] = choices
+        return choices
+
+    def get_distributions(self) -> tuple:
+        """
+        Распределения, необходимые для оценки энтропии паролей с ограничением длины (см. entropy_lib)
+        :return: кортеж: вероятности меток дополнительной части {метка: вероятность}; энтропия суммарной длины слов при известной метке;
+            для каждой позиции - (энтропия длины слова при известных длинах предыдущих позиций и суммарной длине, вероятности длин слова
+            {длина: вероятность})
+        """
+        labels = dict()
+        states = dict()
+        split_weights = self.__differences(self.__split_weights)
+        for (label, extra_length, words_length), weight in zip(self.__splits, split_weights):
+            labels[label] = labels.get(label, 0) + weight
+            states[words_length] = states.get(words_length, 0.0) + weight / self.__total
+        words_length_entropy = get_distribution_entropy(split_weights) - get_distribution_entropy(labels.values())
+        labels = {label: weight / self.__total for label, weight in labels.items()}
+
+        positions = list()
+        for ind in range(len(self.__bucket_sizes)):
+            next_states = dict()
+            lengths_probabilities = dict()
+            entropy = 0.0
+            for remaining, probability in states.items():
+                choice_lengths, choice_weights, rest_ways = self.__get_choices(ind, remaining)
+                weights = self.__differences(choice_weights)
+                choice_probabilities = [weight / choice_weights[-1] for weight in weights]
+                entropy += probability * get_distribution_entropy(weights)
+                for length, choice_probability in zip(choice_lengths, choice_probabilities):
+                    lengths_probabilities[length] = lengths_probabilities.get(length, 0.0) + probability * choice_probability
+                    next_states[remaining - length] = next_states.get(remaining - length, 0.0) + probability * choice_probability
+            positions.append((entropy, lengths_probabilities))
+            states = next_states
+        return labels, words_length_entropy, positions
+
+    @staticmethod
+    def __differences(cumulative:list) -> list:
+        """
+        Веса по накопленным весам
+        :param cumulative: накопленные веса
+        :return: веса
+        """
+        return [value - previous for previous, value in zip([0] + cumulative[:-1], cumulative)]
+
@@ -0,0 +1,200 @@
+# region Import
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.xkcd_generator_lib import XKCD
+from _libraries.entropy_pool_lib import EntropyPool
+from _libraries.drbg_lib import HashDrbg, make_randomizer
+from _libraries.pwd_options_lib import PassphraseOptions
+# endregion
+
+
+# region Const
+# количество парольных фраз в одном задании рабочего процесса
+CHUNK_SIZE = 16384
+# количество заданий на один рабочий процесс, находящихся в обработке одновременно; ограничивает объем памяти,
+# занятой готовыми, но еще не выведенными результатами
+CHUNKS_PER_WORKER = 2
+# минимальное количество парольных фраз в одном задании потока (см. generate_batch_threaded)
+THREAD_CHUNK_MIN_SIZE = 1024
+# endregion
+
+
+# параметры и генераторы рабочего процесса. Генераторы создаются один раз при первом задании соответствующего типа
+# и далее переиспользуются всеми заданиями процесса; словари загружаются из скомпилированных словарей или кэша словарей,
+# отображаемых в память, поэтому страницы словарей разделяются между рабочими процессами.
+# При заданном seed у генератора сохраняются его пул энтропии и детерминированный источник (_worker_drbgs), которые получают
+# новое начальное значение перед каждым заданием (см. _generate_chunk)
+_worker_params = dict()
+_worker_generators = dict()
+_worker_drbgs = dict()
+
+
+def _init_worker(dict_files_path:str, conf_filename:str, xkcd_filename:str, cache_dir:str, sampling:str, rng:str, seed:str) -> None:
+    """
+    Инициализация рабочего процесса (initializer ProcessPoolExecutor). Каждый генератор рабочего процесса использует
+    собственный пул энтропии, который получает случайные байты от ОС (os.urandom) или собственного детерминированного
+    генератора (см. drbg_lib) независимо от других процессов
+    :param dict_files_path: каталог словарей генератора PwdGen
+    :param conf_filename: файл конфигурации генератора PwdGen
+    :param xkcd_filename: файл словаря генератора XKCD
+    :param cache_dir: каталог кэша словарей (None - каталог по умолчанию)
+    :param sampling: способ выбора слов генератора PwdGen (см. PwdGen.SAMPLING_MODES)
+    :param rng: источник случайных байтов (см. drbg_lib.RNG_MODES)
+    :param seed: начальное значение детерминированного генератора (None - не задано)
+    :return: None
+    """
+    _worker_params.update(dict_files_path=dict_files_path, conf_filename=conf_filename, xkcd_filename=xkcd_filename, cache_dir=cache_dir,
+                          sampling=sampling, rng=rng, seed=seed)
+    _worker_generators.clear()
+    _worker_drbgs.clear()
+
+
+def _get_worker_generator(engine:str):
+    """
+    Получение генератора рабочего процесса (при первом обращении генератор создается и загружает словари)
+    :param engine: тип генератора: pwdgen или xkcd
+    :return: объект PwdGen или XKCD
+    """
+    if engine not in _worker_generators:
+        if _worker_params['seed'] is not None:
+            drbg = HashDrbg(_worker_params['seed'], engine)
+            randomizer = EntropyPool(source=drbg)
+            _worker_drbgs[engine] = (randomizer, drbg)
+        else:
+            randomizer = make_randomizer(_worker_params['rng'], personalization=engine)
+        if engine == 'xkcd':
+            _worker_generators[engine] = XKCD(_worker_params['xkcd_filename'], randomizer=randomizer, cache_dir=_worker_params['cache_dir'])
+        else:
+            pwd_gen = PwdGen(_worker_params['dict_files_path'], _worker_params['conf_filename'], randomizer=randomizer,
+                             cache_dir=_worker_params['cache_dir'], sampling=_worker_params['sampling'])
+            pwd_gen.load_dictionaries()
+            _worker_generators[engine] = pwd_gen
+    return _worker_generators[engine]
+
+
+def _generate_chunk(engine:str, options, count:int, chunk_index:int) -> str:
+    """
+    Задание рабочего процесса: генерирование count парольных фраз. Результат возвращается одной строкой (строки парольных фраз,
+    разделенные символом новой строки), чтобы передача результата в основной процесс не требовала сериализации множества объектов.
+    При заданном seed начальное значение генератора задания вычисляется из seed и номера задания, поэтому результат не зависит
+    от количества рабочих процессов и от того, какой процесс выполнил задание
+    :param engine: тип генератора: pwdgen или xkcd
+    :param options: словарь с параметрами парольной фразы (pwdgen) или кортеж (сложность пароля, минимальная длина, максимальная длина) (xkcd)
+    :param count: количество парольных фраз
+    :param chunk_index: номер задания
+    :return: блок строк с парольными фразами
+    """
+    generator = _get_worker_generator(engine)
+    if engine in _worker_drbgs:
+        randomizer, drbg = _worker_drbgs[engine]
+        drbg.reseed(f'{_worker_params["seed"]}#{chunk_index}')
+        randomizer.reset()
+    if engine == 'xkcd':
+        pwd_complexity, min_length, max_length = options
+        lines = generator.generate_batch(pwd_complexity, count, min_length, max_length)
+    else:
+        lines = (f"{''.join(passphrase[0])}\t {' '.join(passphrase[1])}" for passphrase in generator.generate_batch(options, count))
+    return '\n'.join(lines) + '\n'
+
+
+# параллельное (многопроцессное) генерирование больших объемов парольных фраз: запрос делится на задания по CHUNK_SIZE
+# парольных фраз, которые выполняются пулом рабочих процессов; результаты возвращаются в порядке заданий.
+# Номера заданий продолжаются от запроса к запросу (например, при догенерации вместо повторов в режиме --unique), поэтому
+# при заданном seed последовательные запросы не повторяют пароли. При одном рабочем процессе задания выполняются в текущем
+# процессе так же, как в рабочем, - результат с seed не зависит от количества рабочих процессов
+class ParallelGen():
+    # default constructor
+    def __init__(self, workers:int, dict_files_path:str, conf_filename:str, xkcd_filename:str, cache_dir:str=None, sampling:str='word',
+                 rng:str='system', seed:str=None) -> None:
+        self.__workers = workers
+        self.__initargs = (dict_files_path, conf_filename, xkcd_filename, cache_dir, sampling, rng, seed)
+        # номер следующего задания
+        self.__next_chunk = 0
+        # параметры генераторов текущего процесса заданы (см. __generate_local_blocks)
+        self.__is_local_initialized = False
+
+    def generate_passphrase_blocks(self, pwd_options:dict, count:int):
+        """
+        Параллельное генерирование парольных фраз генератором PwdGen
+        :param pwd_options: словарь с параметрами генерируемой парольной фразы
+        :param count: количество парольных фраз
+        :return: генератор блоков строк (строка парольной фразы - пароль и фраза, разделенные табуляцией)
+        """
+        return self.__generate_blocks('pwdgen', pwd_options, count)
+
+    def generate_xkcd_blocks(self, pwd_complexity:str, count:int, min_length:int=None, max_length:int=None):
+        """
+        Параллельное генерирование паролей генератором XKCD
+        :param pwd_complexity: сложность генерируемого пароля
+        :param count: количество паролей
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        :return: генератор блоков строк (по одному паролю в строке)
+        """
+        return self.__generate_blocks('xkcd', (pwd_complexity, min_length, max_length), count)
+
+    def __generate_blocks(self, engine:str, options, count:int):
+        """
+        Распределение заданий по рабочим процессам и сбор результатов в исходном порядке. Одновременно в обработке находится
+        не более workers * CHUNKS_PER_WORKER заданий, поэтому потребление памяти не зависит от общего количества парольных фраз
+        :param engine: тип генератора: pwdgen или xkcd
+        :param options: словарь с параметрами парольной фразы (pwdgen) или параметры пароля xkcd (см. _generate_chunk)
+        :param count: количество парольных фраз
+        :return: генератор блоков строк
+        """
+        if self.__workers <= 1:
+            yield from self.__generate_local_blocks(engine, options, count)
+            return
+        executor = ProcessPoolExecutor(max_workers=self.__workers, initializer=_init_worker, initargs=self.__initargs)
+        try:
+            pending = deque()
+            for start in range(0, count, CHUNK_SIZE):
+                pending.append(executor.submit(_generate_chunk, engine, options, min(CHUNK_SIZE, count - start), self.__next_chunk))
+                self.__next_chunk += 1
+                if len(pending) >= self.__workers * CHUNKS_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __generate_local_blocks(self, engine:str, options, count:int):
+        """
+        Выполнение заданий в текущем процессе (один рабочий процесс): задания те же, что у рабочих процессов, без затрат на их запуск
+        :param engine: тип генератора: pwdgen или xkcd
+        :param options: параметры парольной фразы (см. _generate_chunk)
+        :param count: количество парольных фраз
+        :return: генератор блоков строк
+        """
+        if not self.__is_local_initialized:
+            _init_worker(*self.__initargs)
+            self.__is_local_initialized = True
+        for start in range(0, count, CHUNK_SIZE):
+            chunk_index = self.__next_chunk
+            self.__next_chunk += 1
+            yield _generate_chunk(engine, options, min(CHUNK_SIZE, count - start), chunk_index)
+
+
+def generate_batch_threaded(pwd_gen:PwdGen, pwd_options:dict, count:int, threads:int=None) -> list:
+    """
+    Многопоточное генерирование парольных фраз одним генератором PwdGen (для встраивания генератора в многопоточные приложения).
+    Запрос делится на задания, которые выполняются пулом потоков; генератор разделяется потоками: словари и скомпилированные шаблоны
+    только читаются, каждый поток получает случайные байты из собственного буфера пула энтропии (см. entropy_pool_lib.ThreadLocalPool).
+    Параметры парольной фразы фиксируются (PassphraseOptions) до запуска заданий, поэтому все задания используют одни и те же параметры.
+    Потоки ускоряют генерацию на сборках CPython без GIL (free-threaded); при GIL выигрыш дают только участки, освобождающие GIL (numpy)
+    :param pwd_gen: генератор PwdGen
+    :param pwd_options: словарь с параметрами генерируемой парольной фразы
+    :param count: количество парольных фраз
+    :param threads: количество потоков (None - как в ThreadPoolExecutor: количество процессоров + 4, не более 32)
+    :return: список парольных фраз в формате PwdGen.generate_passphrase
+    """
+    pwd_options = PassphraseOptions(pwd_options)
+    threads = threads or min(32, (os.cpu_count() or 1) + 4)
+    chunk_size = max(THREAD_CHUNK_MIN_SIZE, -(-count // threads))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(pwd_gen.generate_batch, pwd_options, min(chunk_size, count - start))
+                   for start in range(0, count, chunk_size)]
+        return [passphrase for future in futures for passphrase in future.result()]
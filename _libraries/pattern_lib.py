@@ -0,0 +1,66 @@
+# region Import
+from _libraries.pwd_options_lib import CMD_OPTIONS_DEFAULTS
+# endregion
+
+
+# region Const
+# правила регистра слова шаблона: lower - все буквы строчные, title - первая буква заглавная, upper - все буквы заглавные
+PATTERN_CASES = ['lower', 'title', 'upper']
+# разделитель части речи и правил позиции шаблона
+PATTERN_RULES_SEPARATOR = ':'
+# максимальное количество слов шаблона
+PATTERN_MAX_WORDS = 16
+# endregion
+
+
+# шаблон парольной фразы - последовательность позиций через пробел; позиция - часть речи (условное обозначение словаря) и необязательные
+# правила через двоеточие в любом порядке: количество букв слова, используемых в пароле, и регистр слова (см. PATTERN_CASES).
+# Правило, не заданное для позиции, берется из параметров парольной фразы (char_count, use_upper_case). Пример:
+#   ADJF:4 NOUN:title INFN NUMR:5:upper NOUN
+
+
+def parse_pattern(pattern:str, parts_of_speech:list) -> list:
+    """
+    Разбор шаблона парольной фразы
+    :param pattern: шаблон
+    :param parts_of_speech: допустимые части речи
+    :return: список позиций шаблона - кортежей (часть речи, количество букв или None, регистр или None)
+    :raises ValueError: если шаблон содержит ошибку
+    """
+    slots = pattern.split()
+    if not slots:
+        raise ValueError('empty pattern')
+    if len(slots) > PATTERN_MAX_WORDS:
+        raise ValueError(f'too many words (maximum {PATTERN_MAX_WORDS})')
+
+    min_val = CMD_OPTIONS_DEFAULTS["char_count"]["min_val"]
+    max_val = CMD_OPTIONS_DEFAULTS["char_count"]["max_val"]
+    parsed = list()
+    for slot in slots:
+        prt, *rules = slot.split(PATTERN_RULES_SEPARATOR)
+        if prt not in parts_of_speech:
+            raise ValueError(f'unknown part of speech \'{prt}\' (expected one of {", ".join(parts_of_speech)})')
+        char_count = None
+        case = None
+        for rule in rules:
+            if rule.isdigit() and char_count is None:
+                char_count = int(rule)
+                if not min_val <= char_count <= max_val:
+                    raise ValueError(f'\'{slot}\': letter count must be in the range {min_val}..{max_val}')
+            elif rule in PATTERN_CASES and case is None:
+                case = rule
+            else:
+                raise ValueError(f'\'{slot}\': invalid rule \'{rule}\' (expected a letter count or one of {", ".join(PATTERN_CASES)})')
+        parsed.append((prt, char_count, case))
+    return parsed
+
+
+def format_pattern(parsed:list) -> str:
+    """
+    Запись разобранного шаблона (см. parse_pattern) в каноническом виде: позиции через один пробел, правила - в порядке
+    количество букв, регистр. Одинаковые шаблоны, записанные по-разному, получают одинаковую запись
+    :param parsed: список позиций шаблона
+    :return: шаблон
+    """
+    return ' '.join(PATTERN_RULES_SEPARATOR.join([prt] + [str(rule) for rule in (char_count, case) if rule is not None])
+                    for prt, char_count, case in parsed)
@@ -0,0 +1,76 @@
+# region Const
+# требования политики паролей: пароль содержит цифру (digit), заглавную букву (upper), спецсимвол (special)
+POLICY_REQUIREMENTS = ['digit', 'upper', 'special']
+# максимальная длина пароля, которую можно задать политикой
+POLICY_MAX_LENGTH = 256
+# endregion
+
+
+# политика паролей - ограничения, которым должен удовлетворять каждый сгенерированный пароль (в английской раскладке):
+#   min_length, max_length - минимальная и максимальная длина пароля (None - не ограничена);
+#   require - требования (см. POLICY_REQUIREMENTS);
+#   forbid - запрещенные символы (например, кавычки и обратная косая черта, которые могут появиться как спецсимволы
+#   или при смене раскладки букв х, ъ, ж, э, б, ю, ё).
+# Политика задается словарем с этими ключами (секция policy конфигурационного файла, опции командной строки, запрос к сервису);
+# PwdGen компилирует политику в отфильтрованные таблицы слов и алфавиты спецсимволов и цифр (см. PwdGen.__get_plan)
+
+
+def parse_policy(policy:dict) -> dict:
+    """
+    Разбор и проверка политики паролей
+    :param policy: словарь с параметрами политики (значения - строки или значения нужного типа; отсутствующие параметры не ограничивают пароль)
+    :return: политика в каноническом виде: {min_length, max_length, require, forbid}; require - кортеж требований в порядке POLICY_REQUIREMENTS
+    :raises ValueError: если политика содержит ошибку
+    """
+    unknown = set(policy) - {'min_length', 'max_length', 'require', 'forbid'}
+    if unknown:
+        raise ValueError(f'unknown policy parameters: {", ".join(sorted(unknown))}')
+
+    lengths = dict()
+    for name in ['min_length', 'max_length']:
+        value = policy.get(name)
+        if value is None or value == '':
+            lengths[name] = None
+            continue
+        if isinstance(value, str) and value.strip().isdigit():
+            value = int(value)
+        if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= POLICY_MAX_LENGTH:
+            raise ValueError(f'{name} must be an integer in the range 1..{POLICY_MAX_LENGTH}')
+        lengths[name] = value
+    if lengths['min_length'] is not None and lengths['max_length'] is not None and lengths['min_length'] > lengths['max_length']:
+        raise ValueError('min_length is greater than max_length')
+
+    require = policy.get('require') or []
+    if isinstance(require, str):
+        require = require.replace(',', ' ').split()
+    if not isinstance(require, (list, tuple)) or any(item not in POLICY_REQUIREMENTS for item in require):
+        raise ValueError(f'require must be a list of: {", ".join(POLICY_REQUIREMENTS)}')
+
+    forbid = policy.get('forbid') or ''
+    if not isinstance(forbid, str):
+        raise ValueError('forbid must be a string of characters')
+
+    return {
+        'min_length': lengths['min_length'],
+        'max_length': lengths['max_length'],
+        'require': tuple(item for item in POLICY_REQUIREMENTS if item in require),
+        'forbid': ''.join(sorted(set(forbid) - set(' \t\r\n')))
+    }
+
+
+def is_policy_empty(policy:dict) -> bool:
+    """
+    Проверка, ограничивает ли политика пароли
+    :param policy: политика в каноническом виде (см. parse_policy)
+    :return: True - политика ничего не ограничивает, False - в противном случае
+    """
+    return policy['min_length'] is None and policy['max_length'] is None and not policy['require'] and not policy['forbid']
+
+
+def get_policy_key(policy:dict) -> tuple:
+    """
+    Ключ политики для словаря скомпилированных шаблонов (одинаковые политики получают одинаковый ключ)
+    :param policy: политика в каноническом виде (см. parse_policy)
+    :return: кортеж параметров политики
+    """
+    return policy['min_length'], policy['max_length'], tuple(policy['require']), policy['forbid']
@@ -0,0 +1,186 @@
+# region Import
+import os
+import sys
+import atexit
+import threading
+from time import perf_counter_ns
+# endregion
+
+
+# region Const
+# переменные окружения: PWDGEN_PROFILE (любое непустое значение) включает профилирование, PWDGEN_PROFILE_OUTPUT задает файл,
+# в который при завершении работы записывается статистика cProfile (формат pstats) - профилирование при этом также включается
+PROFILE_ENV = 'PWDGEN_PROFILE'
+PROFILE_OUTPUT_ENV = 'PWDGEN_PROFILE_OUTPUT'
+# endregion
+
+
+# профилировщик горячих участков генерации паролей. По умолчанию выключен и ничего не делает: генераторы проверяют is_enabled()
+# один раз при создании и только во включенном состоянии заменяют свои этапы генерации обертками (timed, counted), которые
+# накапливают время выполнения и количество вызовов. При завершении работы сводка выводится в stderr, а при заданном файле вывода
+# дополнительно сохраняется статистика cProfile
+class Profiler():
+    # default constructor
+    def __init__(self) -> None:
+        self.__enabled = False
+        self.__lock = threading.Lock()
+        # этап -> [количество вызовов, суммарное время (нс), собственное время без вложенных этапов (нс)]
+        self.__stages = dict()
+        # счетчик -> значение
+        self.__counters = dict()
+        # функции, возвращающие дополнительную статистику (словарь) на момент вывода сводки
+        self.__stats_providers = dict()
+        # время вложенных этапов для вычисления собственного времени этапа (отдельно для каждого потока)
+        self.__local = threading.local()
+        self.__cprofile = None
+        self.__output = None
+
+    def enable(self, output:str=None) -> None:
+        """
+        Включение профилирования. Повторный вызов может только задать файл для статистики cProfile
+        :param output: файл, в который при завершении работы записывается статистика cProfile (None - cProfile не используется)
+        :return: None
+        """
+        if output and self.__cprofile is None:
+            import cProfile
+            self.__output = output
+            self.__cprofile = cProfile.Profile()
+            self.__cprofile.enable()
+        if not self.__enabled:
+            self.__enabled = True
+            atexit.register(self.report)
+
+    def is_enabled(self) -> bool:
+        return self.__enabled
+
+    def timed(self, stage:str, func):
+        """
+        Обертка функции, замеряющая время ее выполнения как этапа stage. Время вложенных этапов вычитается из собственного времени этапа
+        :param stage: название этапа
+        :param func: функция
+        :return: функция-обертка
+        """
+        def wrapper(*args, **kwargs):
+            nested = self.__get_nested_stack()
+            nested.append(0)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                own = elapsed - nested.pop()
+                if nested:
+                    nested[-1] += elapsed
+                with self.__lock:
+                    stats = self.__stages.setdefault(stage, [0, 0, 0])
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    stats[2] += own
+        return wrapper
+
+    def counted(self, counter:str, func):
+        """
+        Обертка функции, подсчитывающая количество ее вызовов
+        :param counter: название счетчика
+        :param func: функция
+        :return: функция-обертка
+        """
+        def wrapper(*args, **kwargs):
+            self.count(counter)
+            return func(*args, **kwargs)
+        return wrapper
+
+    def count(self, counter:str, value:int=1) -> None:
+        """
+        Увеличение счетчика
+        :param counter: название счетчика
+        :param value: величина, на которую увеличивается счетчик
+        :return: None
+        """
+        with self.__lock:
+            self.__counters[counter] = self.__counters.get(counter, 0) + value
+
+    def add_stats_provider(self, name:str, provider) -> None:
+        """
+        Регистрация источника дополнительной статистики (например, статистики пула энтропии), которая включается в сводку
+        :param name: название источника
+        :param provider: функция без аргументов, возвращающая словарь
+        :return: None
+        """
+        self.__stats_providers[name] = provider
+
+    def get_summary(self) -> dict:
+        """
+        Сводка профилирования
+        :return: словарь: stages - этап -> {calls, total_ms, self_ms, avg_us}, counters - счетчики, stats - дополнительная статистика
+        """
+        with self.__lock:
+            stages = {stage: {'calls': calls, 'total_ms': round(total / 1e6, 3), 'self_ms': round(own / 1e6, 3),
+                              'avg_us': round(total / calls / 1e3, 3)}
+                      for stage, (calls, total, own) in self.__stages.items()}
+            counters = dict(self.__counters)
+        return {'stages': stages, 'counters': counters,
+                'stats': {name: provider() for name, provider in self.__stats_providers.items()}}
+
+    def format_summary(self) -> str:
+        """
+        Сводка профилирования в виде текстовой таблицы
+        :return: сводка
+        """
+        summary = self.get_summary()
+        lines = ['[Profile] stages (self - without nested stages)',
+                 f'{"stage":<22}{"calls":>10}{"total ms":>12}{"self ms":>12}{"avg us":>14}']
+        for stage, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['self_ms']):
+            lines.append(f'{stage:<22}{stats["calls"]:>10}{stats["total_ms"]:>12.3f}{stats["self_ms"]:>12.3f}{stats["avg_us"]:>14.3f}')
+        lines.append('[Profile] counters')
+        for counter, value in sorted(summary['counters'].items()):
+            lines.append(f'{counter:<32}{value:>10}')
+        for name, stats in summary['stats'].items():
+            lines.append(f'[Profile] {name}: ' + ', '.join(f'{key}={value}' for key, value in stats.items()))
+        return '\n'.join(lines)
+
+    def report(self) -> None:
+        """
+        Вывод сводки в stderr и сохранение статистики cProfile (вызывается автоматически при завершении работы)
+        :return: None
+        """
+        if not self.__enabled:
+            return
+        if self.__cprofile is not None:
+            self.__cprofile.disable()
+            try:
+                self.__cprofile.dump_stats(self.__output)
+                sys.stderr.write(f'[Profile] cProfile statistics written to {self.__output} (python -m pstats {self.__output})\n')
+            except Exception as err:
+                sys.stderr.write(f'[Profile] {self.__output}: {err}\n')
+        sys.stderr.write(self.format_summary() + '\n')
+
+    def __get_nested_stack(self, ) -> list:
+        """
+        Стек времени вложенных этапов текущего потока
+        :return: список (стек)
+        """
+        nested = getattr(self.__local, 'nested', None)
+        if nested is None:
+            nested = self.__local.nested = list()
+        return nested
+
+
+# прокси источника случайных чисел, подсчитывающий обращения к нему (rng.<метод>); используется только при включенном профилировании
+class CountingRandomizer():
+    # default constructor
+    def __init__(self, randomizer, profiler:Profiler) -> None:
+        self.__randomizer = randomizer
+        self.__profiler = profiler
+
+    def __getattr__(self, name:str):
+        attr = getattr(self.__randomizer, name)
+        if callable(attr) and not name.startswith('_'):
+            return self.__profiler.counted(f'rng.{name}', attr)
+        return attr
+
+
+# профилировщик процесса; включается переменными окружения или опциями командной строки --profile / --profile-output
+profiler = Profiler()
+if os.environ.get(PROFILE_ENV) or os.environ.get(PROFILE_OUTPUT_ENV):
+    profiler.enable(os.environ.get(PROFILE_OUTPUT_ENV) or None)
@@ -1,14 +1,74 @@
 # region Import
-from random import SystemRandom
 from math import pow
+from threading import Lock, RLock
 from re import match
+from array import array
+from string import digits as DIGITS
+from collections import namedtuple
 
 from _libraries.dict_worker_lib import DictFileWorker
 from _libraries.configuration_lib import Config
+from _libraries.dict_cache_lib import DictCache
+from _libraries.dict_manifest_lib import DictManifest, DictionaryError
+from _libraries.entropy_pool_lib import ThreadLocalPool
+from _libraries.pwd_options_lib import CMD_OPTIONS_DEFAULTS, PassphraseOptions
+from _libraries.profiler_lib import profiler, CountingRandomizer
+from _libraries.entropy_lib import get_distribution_entropy, get_digits_entropy, get_specials_entropy, get_specials_count_entropy, get_uniform_entropy
+from _libraries.pattern_lib import parse_pattern, format_pattern
+from _libraries.policy_lib import parse_policy, is_policy_empty, get_policy_key
+from _libraries.length_lib import LengthSampler
 from _libraries import logger_lib
+
 # endregion
 
 
+# numpy - необязательная зависимость: используется только для пакетной генерации (generate_batch). Модуль импортируется при первой
+# пакетной генерации (см. _import_numpy), т.к. его импорт занимает больше времени, чем запуск остальной утилиты
+numpy = None
+_numpy_imported = False
+
+
+def _import_numpy():
+    """
+    Импорт numpy при первом обращении
+    :return: модуль numpy или None, если numpy не установлен
+    """
+    global numpy, _numpy_imported
+    if not _numpy_imported:
+        _numpy_imported = True
+        try:
+            import numpy as numpy_module
+            numpy = numpy_module
+        except ImportError:
+            numpy = None
+    return numpy
+
+
+# таблица преобразования символов для str.translate: символ src заменяется на символ dst в той же позиции;
+# символы, отсутствующие в src, заменяются на последний символ dst (так же, как при поиске позиции через str.find, возвращающем -1)
+class LayoutTable(dict):
+    # default constructor
+    def __init__(self, src:str, dst:str) -> None:
+        super().__init__(str.maketrans(src, dst))
+        self.__default = ord(dst[-1])
+
+    def __missing__(self, key:int) -> int:
+        return self.__default
+
+
+# позиция скомпилированного шаблона парольной фразы (см. PwdGen.__get_plan): часть речи, слова словаря и те же слова в английской
+# раскладке (из индекса слов), группы слов по префиксам (для способа выбора prefix, иначе None), количество букв слова в пароле,
+# правило регистра (см. pattern_lib), функция смены регистра (None - слово не изменяется), номера слов (для способа выбора prefix -
+# номера групп префиксов), допустимых политикой паролей (array('q'); None - допустимы все слова), и те же номера, разбитые на корзины
+# по длине усеченного слова в пароле ({длина: array('q')}; None - длина пароля не ограничена)
+PlanSlot = namedtuple('PlanSlot', ['part', 'words', 'layout_words', 'prefix_groups', 'char_count', 'case', 'transform', 'indexes', 'buckets'])
+# скомпилированный шаблон парольной фразы (см. PwdGen.__get_plan): позиции шаблона (кортеж PlanSlot), есть ли позиции со сменой регистра,
+# добавляются ли спецсимволы и цифры, таблица выбора длин (LengthSampler, см. length_lib: пара (количество спецсимволов, количество цифр)
+# и длины слов позиций; None - длина пароля не ограничена, количества выбираются независимо), алфавит спецсимволов и алфавит цифр
+# (None - число записывается без ведущих нулей, см. __add_numbers)
+Plan = namedtuple('Plan', ['slots', 'use_case', 'use_special', 'use_numbers', 'lengths', 'specials', 'digits'])
+
+
 # класс, реализующий генерирование паролей на основе слов русского языка
 class PwdGen(DictFileWorker, Config):    
     # region ClassConst
@@ -23,7 +83,15 @@ class PwdGen(DictFileWorker, Config):
     SPECIAL = ['!', '?', '"', '#', '$', '%', '&', '\'', '*', '+', ',', '.', '/', ':', ';', '=', '\\', '^', '|', '~']
     BRACKETS = ['(', ')', '[', ']', '{', '}', '<', '>']
 
-    # шаблоны генерируемых парольных фраз - предствляют собой последовательность частей речи
+    # раскладки клавиатуры: русская буква заменяется на английскую, расположенную на той же клавише
+    RUS_LAYOUT = 'йцукенгшщзхъфывапролджэячсмитьбюёЙЦУКЕНГШЩЗХЪФЫВАПРОЛДЖЭЯЧСМИТЬБЮЁ'
+    ENG_LAYOUT = 'qwertyuiop[]asdfghjkl;\'zxcvbnm,.`QWERTYUIOP{}ASDFGHJKL:"ZXCVBNM<>~'
+    LAYOUT_TABLE = LayoutTable(RUS_LAYOUT, ENG_LAYOUT)
+    # вариант обработки словарей для кэша словарей: при изменении раскладок кэш строится заново
+    __CACHE_VARIANT = f'pwdgen:{RUS_LAYOUT}:{ENG_LAYOUT}'
+
+    # шаблоны генерируемых парольных фраз - предствляют собой последовательность частей речи (шаблон выбирается по количеству слов);
+    # пользовательские шаблоны задаются в секции patterns конфигурационного файла или явно (см. pattern_lib, get_pattern)
     __PASSPHRASE_PATTERNS = {
         2: f'ADJF NOUN',
         3: f'NOUN INFN NOUN',
@@ -37,7 +105,9 @@ class PwdGen(DictFileWorker, Config):
     # is_numbers: использовать цифры в составе парольной фразы (в качестве разделителя, префикса или постфикса)
     # is_special: использовать дополнительные символы (спецсимволы) в составе парольной фразы (в качестве разделителя, префикса или постфикса)
     # use_upper_case: использовать заглавную букву в начале каждого слова парольной фразы
-    __PASSPHRASE_PRESETS = {
+    # пресеты неизменяемы (см. pwd_options_lib.PassphraseOptions) и разделяются всеми объектами и потоками; кастомные параметры
+    # хранятся в объекте генератора (см. __update_custom_passphrase_options), значения пресета custom - значения по умолчанию для них
+    __PASSPHRASE_PRESETS = {name: PassphraseOptions(options) for name, options in {
         'weak': {
             'words_count': 3,
             'char_count': 3,
@@ -67,35 +137,81 @@ class PwdGen(DictFileWorker, Config):
             'use_special': False,
             'use_upper_case': False
         }
-    }
+    }.items()}
 
-    CMD_OPTIONS_DEFAULTS = {
-        'count': {'min_val': 1, 'max_val': 20, 'default': 5},
-        'words_count': {'min_val': 2, 'max_val': 6, 'default': 4},
-        'char_count': {'min_val': 3, 'max_val': 5, 'default': 3},
-        'use_numbers': {'default': False},
-        'use_special': {'default': False},
-        'use_upper_case': {'default': False},
-    }
+    CMD_OPTIONS_DEFAULTS = CMD_OPTIONS_DEFAULTS
+
+    # максимальное количество цифр и специальных символов, добавляемых в парольную фразу
+    MAX_NUMBERS_COUNT = 4
+    MAX_SPECIALS_COUNT = 4
+    # количество парольных фраз, обрабатываемых за один векторизованный проход пакетной генерации (ограничивает объем временных массивов)
+    BATCH_CHUNK_SIZE = 65536
+    # для пакетов меньшего размера затраты на подготовку массивов больше выигрыша, парольные фразы создаются по одной
+    BATCH_MIN_SIZE = 64
+    # способы выбора слов: word - случайное слово словаря (пароль содержит его первые char_count букв, поэтому частые префиксы
+    # встречаются чаще остальных), prefix - равновероятный выбор из различных префиксов длины char_count, затем случайное слово
+    # с этим префиксом (для исходной фразы); при том же словаре дает максимальную энтропию слова
+    SAMPLING_MODES = ['word', 'prefix']
+    # функции смены регистра для правил регистра позиций шаблона (слова индекса уже в нижнем регистре)
+    __CASE_TRANSFORMS = {'lower': None, 'title': str.capitalize, 'upper': str.upper}
+    # максимальное количество скомпилированных шаблонов (см. __get_plan); при превышении скомпилированные шаблоны удаляются
+    MAX_PLANS = 256
     # endregion ClassConst
 
     # default constructor
-    def __init__(self, dict_files_path:str, conf_filename:str) -> None:
+    def __init__(self, dict_files_path:str, conf_filename:str, randomizer=None, cache_dir:str=None, sampling:str='word') -> None:
         # super().__init__()
         # super(DictFileWorker, self).__init__()
         DictFileWorker.__init__(self)
         # при вызове конструктора базового класса Config передаются словарь с дефолтными параметрами кастомных паролей на случай возвращения к ним 
         Config.__init__(self, conf_filename, self.__PASSPHRASE_PRESETS["custom"])
-        self.__randomizer = SystemRandom()
-        self.__dictionaries_filenames = {
-            'ADJF': f'{dict_files_path}/adjectives.txt',
-            'ADVB': f'{dict_files_path}/adverb.txt',
-            'NOUN': f'{dict_files_path}/nouns.txt',
-            'NUMR': f'{dict_files_path}/numeral.txt',
-            'INFN': f'{dict_files_path}/verbs.txt'
-        }
+        # источник случайных чисел: по умолчанию - пул энтропии, получающий случайные байты от ОС большими блоками, с отдельным буфером
+        # для каждого потока (допускается любой объект с интерфейсом random.SystemRandom: choice, randint, randrange)
+        self.__randomizer = randomizer if randomizer is not None else ThreadLocalPool()
+        # кастомные параметры парольной фразы (PassphraseOptions): при изменении заменяются новым объектом, поэтому потоки, получившие
+        # параметры ранее, продолжают генерацию по неизменным параметрам
+        self.__custom_options = self.__PASSPHRASE_PRESETS["custom"]
+        # генератор может использоваться одновременно несколькими потоками (например, потоками HTTP-сервиса или generate_batch_threaded):
+        # словари, таблицы и скомпилированные шаблоны после построения только читаются, а строятся один раз под блокировкой
+        # (повторно входимой, т.к. построение одних таблиц обращается к другим); повторное считывание конфигурационного файла
+        # выполняется одним потоком
+        self.__cache_lock = RLock()
+        self.__settings_lock = Lock()
+        # файлы и кодировки словарей описываются манифестом каталога словарей (см. dict_manifest_lib); манифест считывается, и словари
+        # всех частей речи шаблонов проверяются один раз - при первом обращении к словарям (см. __check_dictionaries)
+        self.__dict_files_path = dict_files_path
+        self.__dict_manifest = None
+        # ошибка проверки словарей: при повторных обращениях к словарям сообщается сразу, без повторной проверки
+        self.__dict_error = None
+        # индекс слов словарей: часть речи -> (список слов без символа новой строки в нижнем регистре, список тех же слов в английской раскладке)
+        # словари загружаются лениво - при первом обращении к соответствующей части речи - и далее переиспользуются
+        self.__words_index = dict()
+        # постоянный кэш обработанных словарей (по умолчанию - в каталоге кэша пользователя, см. dict_cache_lib)
+        self.__dict_cache = DictCache(cache_dir)
+        # словари в виде массивов numpy для пакетной генерации (создаются из индекса слов при первом обращении)
+        self.__words_arrays = dict()
+        # способ выбора слов (см. SAMPLING_MODES)
+        self.__sampling = sampling
+        # группы слов с одинаковым префиксом для способа выбора prefix: (часть речи, char_count) -> (префиксы, группы, ширина номера);
+        # строятся один раз и сохраняются в кэш словарей (см. __get_prefix_groups). Для пакетной генерации группы дополнительно
+        # представляются массивами numpy: (часть речи, char_count) -> (префиксы, размеры групп, начала групп, номера слов)
+        self.__prefix_groups = dict()
+        self.__prefix_groups_arrays = dict()
+        # корзины слов по длине усеченного слова для ограничения длины пароля: (часть речи, char_count, способ выбора) -> {длина: array('q')};
+        # строятся один раз для всех шаблонов с этой частью речи (см. __get_length_buckets)
+        self.__length_buckets = dict()
+        # таблицы префиксов словарей для оценки энтропии: часть речи -> (количество слов, {(char_count, use_upper_case): (количество
+        # различных префиксов, энтропия префикса)}); вычисляются один раз и сохраняются в кэш словарей (см. __get_prefix_table)
+        self.__prefix_tables = dict()
+        # скомпилированные шаблоны парольных фраз: (шаблон или words_count, char_count, use_upper_case) -> (позиции шаблона PlanSlot,
+        # есть ли позиции со сменой регистра); шаблон компилируется при первой генерации по нему (см. __get_plan)
+        self.__plans = dict()
+        # при включенном профилировании этапы генерации заменяются обертками, замеряющими время их выполнения (см. profiler_lib);
+        # при выключенном профилировании генерация не меняется
+        if profiler.is_enabled():
+            self.__instrument()
 
-        # обновляем пользовательские (кастомные) параметры парольной фразы, занося их в словарь __PASSPHRASE_PRESETS["custom"]
+        # обновляем пользовательские (кастомные) параметры парольной фразы, занося их в поле __custom_options
         # параметры хранятся в поле радительского класса Config и были предварительно считаны из conf.ini
         custom_options = self.get_options()
         self.__update_custom_passphrase_options(options=custom_options, is_upd_file=False)
@@ -114,14 +230,420 @@ class PwdGen(DictFileWorker, Config):
         """
         return list(self.__PASSPHRASE_PRESETS.keys())
     
+    def load_dictionaries(self) -> None:
+        """
+        Предварительная загрузка в индекс слов словарей всех частей речи, которые могут использоваться шаблонами парольных фраз
+        (например, перед запуском сервиса, чтобы первый запрос не ожидал загрузки словарей)
+        :return: None
+        """
+        for prt in self.PARTS_OF_SPEECH:
+            self.__get_words(prt)
+
+    def __check_dictionaries(self, ) -> None:
+        """
+        Однократная проверка словарей: считывание манифеста каталога словарей и проверка того, что для каждой части речи, которая может
+        использоваться шаблонами парольных фраз, есть непустой словарь в известной кодировке (см. DictManifest.check). При ошибке исключение DictionaryError
+        сохраняется и при следующих обращениях к словарям возбуждается сразу, поэтому генерация прекращается на первом слове,
+        а не повторяет попытку считать словарь для каждого слова
+        :return: None
+        """
+        if self.__dict_manifest is not None:
+            return
+        if self.__dict_error is not None:
+            raise self.__dict_error
+        try:
+            dict_manifest = DictManifest(self.__dict_files_path)
+            dict_manifest.check(self.PARTS_OF_SPEECH)
+        except DictionaryError as err:
+            self.__dict_error = err
+            raise
+        self.__dict_manifest = dict_manifest
+
+    def __get_dictionary_filename(self, prt_of_sppech:str) -> str:
+        """
+        Файл словаря части речи (из манифеста каталога словарей, см. __check_dictionaries)
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: файл словаря
+        """
+        self.__check_dictionaries()
+        return self.__dict_manifest.get_filename(prt_of_sppech)
+
     def get_passphrase_options(self, pwd_complexity:str) -> dict:
         """
         Метод для получения опций (параметров) парольной фразы исходя из заданного уровня сложности парольной фразы
         :param pwd_complexity: сложность парольный фразы, параметры которой необходимо получить
-        :return: словарь опций (парметров) и их значений для парольной фразы заданной сложности
+        :return: неизменяемый словарь опций (парметров) и их значений для парольной фразы заданной сложности (PassphraseOptions)
         """
+        if pwd_complexity == 'custom':
+            self.__refresh_settings()
+            return self.__custom_options
         return self.__PASSPHRASE_PRESETS.get(pwd_complexity)
 
+    def get_pattern(self, pattern:str) -> str:
+        """
+        Получение шаблона парольной фразы: по имени - из секции patterns конфигурационного файла, иначе строка считается самим шаблоном.
+        Шаблон проверяется и приводится к канонической записи (см. pattern_lib), поэтому по-разному записанные одинаковые шаблоны
+        компилируются один раз
+        :param pattern: имя шаблона или шаблон
+        :return: шаблон в канонической записи (используется как значение параметра pattern парольной фразы) или None,
+            если шаблон содержит ошибку (ошибка записывается в лог)
+        """
+        self.__refresh_settings()
+        spec = self.get_patterns().get(pattern.strip().lower(), pattern)
+        try:
+            return format_pattern(parse_pattern(spec, self.PARTS_OF_SPEECH))
+        except ValueError as err:
+            logger_lib.error(f'Pattern \'{pattern}\'', err)
+            return None
+
+    def get_policy(self, policy:dict=None) -> dict:
+        """
+        Получение политики паролей: параметры секции policy конфигурационного файла, дополненные и переопределенные заданными параметрами
+        (например, опциями командной строки или параметрами запроса к сервису)
+        :param policy: словарь с параметрами политики (см. policy_lib; параметры со значением None не переопределяют параметры файла)
+        :return: политика в каноническом виде (используется как значение параметра policy парольной фразы; политика, которая ничего
+            не ограничивает, - пустой словарь) или None, если политика содержит ошибку (ошибка записывается в лог)
+        """
+        self.__refresh_settings()
+        options = dict(self.get_policy_options())
+        options.update({name: value for name, value in (policy or dict()).items() if value is not None})
+        try:
+            policy = parse_policy(options)
+        except ValueError as err:
+            logger_lib.error('Policy', err)
+            return None
+        return dict() if is_policy_empty(policy) else policy
+
+    def get_policy_error(self, pwd_options:dict) -> str:
+        """
+        Проверка того, что политике паролей (параметр policy) удовлетворяют парольные фразы с заданными параметрами; политика
+        компилируется вместе с шаблоном парольной фразы, поэтому последующая генерация ее не компилирует повторно
+        :param pwd_options: словарь с параметрами парольной фразы (аналогично generate_passphrase)
+        :return: описание ошибки или None, если парольные фразы могут быть сгенерированы
+        """
+        try:
+            self.__get_plan(pwd_options)
+        except ValueError as err:
+            return str(err)
+        return None
+
+    def __refresh_settings(self, ) -> None:
+        """
+        Повторное считывание конфигурационного файла, только если он изменился после последнего считывания (например, был изменен
+        другим процессом утилиты или вручную во время работы сервиса); при изменении обновляются кастомные параметры парольной фразы
+        :return: None
+        """
+        with self.__settings_lock:
+            if self.reload_settings():
+                self.__update_custom_passphrase_options(options=self.get_options(), is_upd_file=False)
+
+    def __get_pattern_slots(self, pwd_options:dict) -> list:
+        """
+        Позиции шаблона парольной фразы с заданными параметрами: шаблон из параметра pattern (если задан) или встроенный шаблон
+        по количеству слов; правила, не заданные для позиции, берутся из параметров парольной фразы
+        :param pwd_options: словарь с параметрами парольной фразы (аналогично generate_passphrase)
+        :return: список позиций - кортежей (часть речи, количество букв, правило регистра)
+        """
+        pattern = pwd_options.get('pattern') or self.__PASSPHRASE_PATTERNS.get(pwd_options["words_count"])
+        default_case = 'title' if pwd_options["use_upper_case"] else 'lower'
+        return [(prt, char_count or pwd_options["char_count"], case or default_case)
+                for prt, char_count, case in parse_pattern(pattern, self.PARTS_OF_SPEECH)]
+
+    def __get_plan(self, pwd_options:dict) -> Plan:
+        """
+        Получение скомпилированного шаблона парольной фразы. Шаблон разбирается один раз: для каждой позиции заранее определяются
+        словарь (ссылки на таблицы слов индекса), группы префиксов, количество букв и функция смены регистра, поэтому генерация
+        по пользовательскому шаблону выполняется так же быстро, как по встроенному. Политика паролей (параметр policy, см. policy_lib)
+        компилируется вместе с шаблоном (см. __compile_policy), поэтому каждая парольная фраза удовлетворяет политике без повторной генерации
+        :param pwd_options: словарь с параметрами парольной фразы (аналогично generate_passphrase)
+        :return: скомпилированный шаблон Plan
+        :raises ValueError: если политика содержит ошибку или ей не может удовлетворять ни одна парольная фраза
+        """
+        policy = pwd_options.get('policy')
+        policy_key = get_policy_key(policy) if policy else None
+        # при заданном шаблоне количество слов определяется шаблоном и не входит в ключ
+        key = (pwd_options.get('pattern') or pwd_options["words_count"], pwd_options["char_count"], bool(pwd_options["use_upper_case"]),
+               bool(pwd_options["use_special"]), bool(pwd_options["use_numbers"]), policy_key)
+        plan = self.__plans.get(key)
+        if plan is None:
+            with self.__cache_lock:
+                plan = self.__plans.get(key)
+                if plan is None:
+                    policy = parse_policy(policy) if policy else None
+                    if policy is not None and not is_policy_empty(policy):
+                        plan = self.__compile_policy(pwd_options, policy)
+                    else:
+                        slots = tuple(self.__get_plan_slot(prt, char_count, case) for prt, char_count, case in self.__get_pattern_slots(pwd_options))
+                        plan = Plan(slots, any(slot.transform is not None for slot in slots), bool(pwd_options["use_special"]),
+                                    bool(pwd_options["use_numbers"]), None, self.SPECIAL, None)
+                    # количество шаблонов ограничено, т.к. шаблоны могут передаваться в запросах к сервису
+                    if len(self.__plans) >= self.MAX_PLANS:
+                        self.__plans.clear()
+                    self.__plans[key] = plan
+        return plan
+
+    def __get_plan_slot(self, prt_of_sppech:str, char_count:int, case:str, accept=None, use_lengths:bool=False) -> PlanSlot:
+        """
+        Компиляция позиции шаблона парольной фразы
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :param char_count: количество букв слова, которые используются в пароле
+        :param case: правило регистра (см. pattern_lib)
+        :param accept: функция проверки слова политикой паролей: принимает усеченное слово в английской раскладке после смены регистра
+            и возвращает True, если слово допустимо (None - допустимы все слова)
+        :param use_lengths: разбить допустимые слова на корзины по длине усеченного слова (для ограничения длины пароля)
+        :return: позиция скомпилированного шаблона
+        :raises ValueError: если политике не удовлетворяет ни одно слово словаря
+        """
+        words, layout_words = self.__get_words(prt_of_sppech)
+        prefix_groups = self.__get_prefix_groups(prt_of_sppech, char_count) if self.__sampling == 'prefix' else None
+        transform = self.__CASE_TRANSFORMS[case]
+        # при способе выбора prefix все слова группы имеют одинаковый префикс, поэтому проверяются префиксы групп
+        candidates = prefix_groups[0] if prefix_groups is not None else layout_words
+        indexes = None
+        buckets = None
+        if accept is not None:
+            indexes = array('q', (ind for ind, word in enumerate(candidates)
+                                  if accept(transform(word[:char_count]) if transform is not None else word[:char_count])))
+            if not len(indexes):
+                raise ValueError(f'no {prt_of_sppech} words satisfy the policy')
+            if use_lengths:
+                buckets = dict()
+                for ind in indexes:
+                    buckets.setdefault(min(len(candidates[ind]), char_count), array('q')).append(ind)
+        elif use_lengths:
+            buckets = self.__get_length_buckets(prt_of_sppech, char_count, candidates)
+        return PlanSlot(prt_of_sppech, words, layout_words, prefix_groups, char_count, case, transform, indexes, buckets)
+
+    def __get_length_buckets(self, prt_of_sppech:str, char_count:int, candidates) -> dict:
+        """
+        Корзины слов (при способе выбора prefix - групп префиксов) по длине усеченного слова в пароле; длина слова в английской раскладке
+        совпадает с длиной исходного слова, поэтому длина усеченного слова - min(длина слова, char_count). Корзины строятся один раз
+        для части речи и количества букв и используются всеми шаблонами с ограничением длины пароля
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :param char_count: количество букв слова, которые используются в пароле
+        :param candidates: слова в английской раскладке (при способе выбора prefix - префиксы групп)
+        :return: словарь: длина -> номера слов (array('q'))
+        """
+        key = (prt_of_sppech, char_count, self.__sampling)
+        buckets = self.__length_buckets.get(key)
+        if buckets is None:
+            with self.__cache_lock:
+                buckets = self.__length_buckets.get(key)
+                if buckets is None:
+                    buckets = dict()
+                    for ind, word in enumerate(candidates):
+                        buckets.setdefault(min(len(word), char_count), array('q')).append(ind)
+                    self.__length_buckets[key] = buckets
+        return buckets
+
+    def __compile_policy(self, pwd_options:dict, policy:dict) -> Plan:
+        """
+        Компиляция шаблона парольной фразы с политикой паролей. Требования политики включают соответствующие параметры парольной фразы
+        (цифры, спецсимволы, заглавные буквы); запрещенные символы исключаются из алфавитов спецсимволов и цифр, а слова, усеченное слово
+        которых в английской раскладке содержит запрещенный символ, - из таблиц слов. Для требования заглавной буквы слова первой позиции
+        со сменой регистра ограничиваются словами, усеченное слово которых содержит заглавную букву. При ограничении длины слова позиций
+        разбиваются на корзины по длине усеченного слова, и парольная фраза выбирается сразу нужной длины (см. length_lib): распределение
+        совпадает с распределением парольных фраз без ограничения длины при условии, что длина допустима
+        :param pwd_options: словарь с параметрами парольной фразы (аналогично generate_passphrase)
+        :param policy: политика в каноническом виде (см. policy_lib.parse_policy)
+        :return: скомпилированный шаблон Plan
+        :raises ValueError: если политике не может удовлетворять ни одна парольная фраза
+        """
+        pwd_options = dict(pwd_options)
+        for requirement, option in [('digit', 'use_numbers'), ('special', 'use_special'), ('upper', 'use_upper_case')]:
+            if requirement in policy["require"]:
+                pwd_options[option] = True
+        forbid = set(policy["forbid"])
+        specials = [ch for ch in self.SPECIAL if ch not in forbid]
+        digits = ''.join(ch for ch in DIGITS if ch not in forbid)
+        if pwd_options["use_special"] and not specials:
+            raise ValueError('all special characters are forbidden')
+        if pwd_options["use_numbers"] and not digits:
+            raise ValueError('all digits are forbidden')
+
+        pattern_slots = self.__get_pattern_slots(pwd_options)
+        upper_slot = None
+        if 'upper' in policy["require"]:
+            upper_slot = next((ind for ind, (prt, char_count, case) in enumerate(pattern_slots) if case != 'lower'), None)
+            if upper_slot is None:
+                raise ValueError('the pattern has no capitalized words')
+        use_lengths = policy["min_length"] is not None or policy["max_length"] is not None
+
+        slots = list()
+        for ind, (prt, char_count, case) in enumerate(pattern_slots):
+            need_upper = ind == upper_slot
+            accept = None
+            if forbid or need_upper:
+                def accept(word:str, need_upper:bool=need_upper) -> bool:
+                    return not forbid.intersection(word) and (not need_upper or any(ch.isupper() for ch in word))
+            slots.append(self.__get_plan_slot(prt, char_count, case, accept, use_lengths))
+
+        lengths = None
+        if use_lengths:
+            # длина пароля - сумма длин усеченных слов, количества спецсимволов и цифр (при политике число записывается ровно
+            # numbers_count цифрами); пары (количество спецсимволов, количество цифр) равновероятны, как и без ограничения длины
+            specials_counts = range(1, self.MAX_SPECIALS_COUNT + 1) if pwd_options["use_special"] else [0]
+            numbers_counts = range(1, self.MAX_NUMBERS_COUNT + 1) if pwd_options["use_numbers"] else [0]
+            extras = [((specials_count, numbers_count), specials_count + numbers_count, 1)
+                      for specials_count in specials_counts for numbers_count in numbers_counts]
+            lengths = LengthSampler([{length: len(bucket) for length, bucket in slot.buckets.items()} for slot in slots], extras,
+                                    policy["min_length"], policy["max_length"])
+            if not lengths.get_total():
+                min_length, max_length = lengths.get_lengths_range(extras)
+                raise ValueError(f'password length is always in the range {min_length}..{max_length} with these options')
+        return Plan(tuple(slots), any(slot.transform is not None for slot in slots), bool(pwd_options["use_special"]),
+                    bool(pwd_options["use_numbers"]), lengths, specials, digits)
+
+    def get_entropy(self, pwd_options:dict) -> dict:
+        """
+        Оценка энтропии парольной фразы с заданными параметрами (см. entropy_lib). Энтропия слова - энтропия его префикса из char_count
+        букв в английской раскладке: слова с одинаковым префиксом дают одинаковый пароль, поэтому учитываются различные префиксы,
+        а не различные слова (при способе выбора prefix - log2 количества префиксов). К энтропии слов добавляется энтропия вставки спецсимволов и числа в начале парольной фразы
+        :param pwd_options: словарь с параметрами парольной фразы (аналогично generate_passphrase)
+        :return: словарь: bits - энтропия парольной фразы, words - список {part, words, prefixes, bits} по позициям шаблона,
+            specials, digits - энтропия спецсимволов и цифр; None, если словарь не удалось считать (ошибка записывается в лог)
+        """
+        # при политике паролей энтропия вычисляется по скомпилированному шаблону (таблицы слов и алфавиты ограничены политикой)
+        if pwd_options.get('policy'):
+            return self.__get_policy_entropy(self.__get_plan(pwd_options))
+        pattern_slots = self.__get_pattern_slots(pwd_options)
+        words = list()
+        for prt, char_count, case in pattern_slots:
+            prefix_table = self.__get_prefix_table(prt)
+            if prefix_table is None:
+                return None
+            words_count, prefixes = prefix_table
+            # перевод всех букв в верхний регистр не объединяет префиксы, поэтому правило upper не меняет энтропию
+            prefixes_count, bits = prefixes[(char_count, case == 'title')]
+            # при выборе из различных префиксов префикс равновероятен (смена регистра первой буквы не объединяет префиксы)
+            if self.__sampling == 'prefix':
+                bits = get_uniform_entropy(prefixes_count)
+            words.append({'part': prt, 'words': words_count, 'prefixes': prefixes_count, 'bits': round(bits, 2)})
+
+        specials = get_specials_entropy(len(pattern_slots), self.MAX_SPECIALS_COUNT, len(self.SPECIAL)) if pwd_options["use_special"] else 0.0
+        digits = get_digits_entropy(self.MAX_NUMBERS_COUNT) if pwd_options["use_numbers"] else 0.0
+        return {
+            'bits': round(sum(word['bits'] for word in words) + specials + digits, 2),
+            'words': words,
+            'specials': round(specials, 2),
+            'digits': round(digits, 2)
+        }
+
+    def __get_policy_entropy(self, plan:Plan) -> dict:
+        """
+        Оценка энтропии парольной фразы, скомпилированной с политикой паролей (аналогично get_entropy): энтропия слова вычисляется
+        по префиксам слов, допустимых политикой. При ограничении длины пароля (см. length_lib) энтропия выбора пары (количество спецсимволов,
+        количество цифр) делится между спецсимволами (энтропия количества спецсимволов) и цифрами (остаток), энтропия выбора суммарной
+        длины слов относится к первому слову, а энтропия слова позиции - это энтропия выбора длины слова и среднее по длинам энтропий
+        префиксов слов корзины
+        :param plan: скомпилированный шаблон
+        :return: словарь в формате get_entropy
+        """
+        specials_counts = range(1, self.MAX_SPECIALS_COUNT + 1) if plan.use_special else [0]
+        numbers_counts = range(1, self.MAX_NUMBERS_COUNT + 1) if plan.use_numbers else [0]
+        if plan.lengths is not None:
+            labels, words_length_bits, positions = plan.lengths.get_distributions()
+        else:
+            # без ограничения длины пары равновероятны, а длины слов не выбираются
+            labels = {(specials_count, numbers_count): 1 / (len(specials_counts) * len(numbers_counts))
+                      for specials_count in specials_counts for numbers_count in numbers_counts}
+            words_length_bits, positions = 0.0, None
+
+        words = list()
+        for ind, slot in enumerate(plan.slots):
+            if positions is None:
+                words_count, prefixes_count, bits = self.__get_indexes_entropy(slot, slot.indexes)
+            else:
+                bits, lengths_probabilities = positions[ind]
+                if ind == 0:
+                    bits += words_length_bits
+                words_count = prefixes_count = 0
+                for length, probability in lengths_probabilities.items():
+                    bucket_words, bucket_prefixes, bucket_bits = self.__get_indexes_entropy(slot, slot.buckets[length])
+                    words_count += bucket_words
+                    prefixes_count += bucket_prefixes
+                    bits += probability * bucket_bits
+            words.append({'part': slot.part, 'words': words_count, 'prefixes': prefixes_count, 'bits': round(bits, 2)})
+
+        specials_probabilities = dict()
+        for (specials_count, numbers_count), probability in labels.items():
+            specials_probabilities[specials_count] = specials_probabilities.get(specials_count, 0.0) + probability
+        count_bits = get_distribution_entropy(specials_probabilities.values())
+        specials = count_bits + sum(probability * get_specials_count_entropy(len(plan.slots), specials_count, len(plan.specials))
+                                    for specials_count, probability in specials_probabilities.items())
+        digits = get_distribution_entropy(labels.values()) - count_bits
+        if plan.use_numbers:
+            mean_count = sum(probability * numbers_count for (specials_count, numbers_count), probability in labels.items())
+            digits += mean_count * get_uniform_entropy(len(plan.digits))
+        return {
+            'bits': round(sum(word['bits'] for word in words) + specials + digits, 2),
+            'words': words,
+            'specials': round(specials, 2),
+            'digits': round(digits, 2)
+        }
+
+    def __get_indexes_entropy(self, slot:PlanSlot, indexes) -> tuple:
+        """
+        Энтропия префикса слова позиции скомпилированного шаблона, выбираемого из заданных слов (при способе выбора prefix - групп префиксов)
+        :param slot: позиция скомпилированного шаблона
+        :param indexes: номера слов или групп префиксов (None - все слова словаря или все группы)
+        :return: кортеж (количество слов, количество различных префиксов, энтропия)
+        """
+        if slot.prefix_groups is not None:
+            prefixes, groups, width = slot.prefix_groups
+            indexes = indexes if indexes is not None else range(len(prefixes))
+            return sum(len(groups[ind]) // width for ind in indexes), len(indexes), get_uniform_entropy(len(indexes))
+        indexes = indexes if indexes is not None else range(len(slot.layout_words))
+        prefixes = dict()
+        for ind in indexes:
+            prefix = slot.layout_words[ind][:slot.char_count]
+            if slot.transform is not None:
+                prefix = slot.transform(prefix)
+            prefixes[prefix] = prefixes.get(prefix, 0) + 1
+        return len(indexes), len(prefixes), get_distribution_entropy(prefixes.values())
+
+    def __get_prefix_table(self, prt_of_sppech:str) -> tuple:
+        """
+        Получение таблицы префиксов словаря: для каждого допустимого значения char_count и регистра первой буквы - количество различных
+        префиксов слов в английской раскладке и энтропия префикса случайного слова. Таблица вычисляется один раз и сохраняется в кэш
+        словарей (одно поле из строк вида "char_count:use_upper_case:количество слов:количество префиксов:энтропия"), поэтому при следующих запусках оценка
+        энтропии не загружает словарь
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: кортеж (количество слов словаря, {(char_count, use_upper_case): (количество префиксов, энтропия)}) или None,
+            если словарь не удалось считать
+        """
+        prefix_table = self.__prefix_tables.get(prt_of_sppech)
+        if prefix_table is not None:
+            return prefix_table
+        with self.__cache_lock:
+            prefix_table = self.__prefix_tables.get(prt_of_sppech)
+            if prefix_table is not None:
+                return prefix_table
+
+            def build_prefix_table() -> list:
+                layout_words = list(self.__get_words(prt_of_sppech)[1])
+                lines = list()
+                for char_count in range(self.CMD_OPTIONS_DEFAULTS["char_count"]["min_val"], self.CMD_OPTIONS_DEFAULTS["char_count"]["max_val"] + 1):
+                    for use_upper_case in [False, True]:
+                        prefixes = dict()
+                        for word in layout_words:
+                            prefix = word[:char_count].capitalize() if use_upper_case else word[:char_count]
+                            prefixes[prefix] = prefixes.get(prefix, 0) + 1
+                        lines.append(f'{char_count}:{int(use_upper_case)}:{len(layout_words)}:{len(prefixes)}:'
+                                     f'{get_distribution_entropy(prefixes.values())!r}')
+                return [lines]
+
+            fields = self.__dict_cache.load(self.__get_dictionary_filename(prt_of_sppech), f'{self.__CACHE_VARIANT}:prefixes', build_prefix_table)
+            if fields is None:
+                return None
+            prefixes = dict()
+            for line in fields[0]:
+                char_count, use_upper_case, words_count, prefixes_count, bits = line.split(':')
+                prefixes[(int(char_count), use_upper_case == '1')] = (int(prefixes_count), float(bits))
+            prefix_table = (int(words_count), prefixes)
+            self.__prefix_tables[prt_of_sppech] = prefix_table
+            return prefix_table
+
     def generate_passphrase(self, pwd_options:dict) -> list:
         """
         Меетод создания парольной фразы по заданным параметрам
@@ -129,95 +651,476 @@ class PwdGen(DictFileWorker, Config):
             Параметры аналогичны ключам словаря PASSPHRASE_PRESETS. Могут использоваться готовые пресеты или пользовательские настройки
         :return: список сгенерированных парольных фраз
         """
-        # определяем шаблон парольной (сложность парольной фразы определяет количество слов в ней, и как следствие - используемый шаблон парольной фразы)
-        pwd_ptrn_prts = (self.__PASSPHRASE_PATTERNS.get(pwd_options["words_count"])).split()
+        # определяем шаблон парольной (сложность парольной фразы определяет количество слов в ней, и как следствие - используемый шаблон
+        # парольной фразы, если шаблон не задан параметром pattern); шаблон компилируется при первом обращении
+        plan = self.__get_plan(pwd_options)
+        slots = plan.slots
+
+        # при ограничении длины пароля сначала выбираются количества спецсимволов и цифр, длины слов позиций и слова в корзинах
+        # слов этих длин (см. length_lib)
+        specials_count = numbers_count = None
+        words_indexes = [None] * len(slots)
+        if plan.lengths is not None:
+            (specials_count, numbers_count), words_lengths, positions = plan.lengths.draw(self.__randomizer.randrange)
+            words_indexes = [slot.buckets[length][position] for slot, length, position in zip(slots, words_lengths, positions)]
 
-        # список для хранения слов парольнаой фразы на русском языке
+        # списки для хранения слов парольнаой фразы на русском и английском языках
         rus_passphrase = list()
-        # генерация слов, которые войдут в парольную фразу
-        for prt in pwd_ptrn_prts:
-            rus_passphrase.append(self.__get_random_word(prt).lower())
-                
-        # получение слов парольной фразы на английском языке
-        eng_passphrase = self.__change_layout(rus_passphrase)
-                
-        # отсекаем первые char_count каждого слова парольной фразы
-        eng_passphrase = [word[:pwd_options["char_count"]] for word in eng_passphrase]
-
-        # при необходимости меняем регистр первой бкувы каждого слова
-        if pwd_options["use_upper_case"]:
-            rus_passphrase = self.__set_upper_case(rus_passphrase)
-            eng_passphrase = self.__set_upper_case(eng_passphrase)
-                
+        eng_passphrase = list()
+        # генерация слов, которые войдут в парольную фразу; слово на английском языке (в английской раскладке) берется из индекса готовым
+        for slot, word_ind in zip(slots, words_indexes):
+            rus_word, layout_ind = self.__get_random_word(slot, word_ind)
+            rus_passphrase.append(rus_word)
+            eng_passphrase.append(self.__get_layout_word(slot, layout_ind))
+        # от слов на английском языке отсекаются первые char_count символов (количество задается для каждой позиции шаблона)
+        eng_passphrase = self.__truncate_words(eng_passphrase, slots)
+
+        # при необходимости меняем регистр слов (по правилу регистра каждой позиции шаблона)
+        if plan.use_case:
+            rus_passphrase = self.__set_case(rus_passphrase, slots)
+            eng_passphrase = self.__set_case(eng_passphrase, slots)
+
         # при необходимости добавляем специальные символы в паролную фразу
-        if pwd_options["use_special"]:
-            # определяем количество специльных символов, которые будут добавлены в парольную фразу
-            # с учетом того, что при трансляции слова с русского языка на английский возможно появление специальных символов, программно
-            # ограничиваем максимально возможное число добавляемых спецсимволов
-            specials_count = self.__randomizer.randint(1, 4)
-            for ind in range(specials_count):
-                # выбираем специальный символ
-                spec_ch = self.__randomizer.choice(self.SPECIAL)
-                # определяем позицию, куда специальный символ будет вставлен
-                pos = self.__randomizer.randint(0, len(rus_passphrase) + 1)
-                # добавляем специальный символ в парольную фразу
-                rus_passphrase.insert(pos, spec_ch)
-                eng_passphrase.insert(pos, spec_ch)
+        if plan.use_special:
+            self.__add_special_chars(rus_passphrase, eng_passphrase, plan.specials, specials_count)
 
         # при необходимости добавляем цифры в паролную фразу (пока цифры добавляются только в начало парольной фразы)
-        if pwd_options["use_numbers"]:
-            # определяем количество цифр, которые будут добавлены в парольную фразу
-            numbers_count = self.__randomizer.randint(1, 4)
+        if plan.use_numbers:
+            self.__add_numbers(rus_passphrase, eng_passphrase, plan.digits, numbers_count)
+
+        return [eng_passphrase, rus_passphrase]
+
+    def __truncate_words(self, pwd_prts:list, slots:tuple) -> list:
+        """
+        Усечение слов парольной фразы до заданного количества символов
+        :param pwd_prts: исходный список слов парольной фразы
+        :param slots: позиции скомпилированного шаблона (количество символов каждого слова, которые используются в пароле)
+        :return: список усеченных слов
+        """
+        return [wrd[:slot.char_count] for wrd, slot in zip(pwd_prts, slots)]
+
+    def __add_special_chars(self, rus_passphrase:list, eng_passphrase:list, specials:list, specials_count:int=None) -> None:
+        """
+        Добавление специальных символов в случайные позиции парольной фразы (одинаковые для фразы на русском и английском языках)
+        :param rus_passphrase: список слов парольной фразы на русском языке (изменяется)
+        :param eng_passphrase: список слов парольной фразы в английской раскладке (изменяется)
+        :param specials: алфавит спецсимволов (SPECIAL или алфавит, ограниченный политикой паролей)
+        :param specials_count: количество спецсимволов (None - выбирается случайно)
+        :return: None
+        """
+        # определяем количество специльных символов, которые будут добавлены в парольную фразу
+        # с учетом того, что при трансляции слова с русского языка на английский возможно появление специальных символов, программно
+        # ограничиваем максимально возможное число добавляемых спецсимволов
+        if specials_count is None:
+            specials_count = self.__randomizer.randint(1, self.MAX_SPECIALS_COUNT)
+        for ind in range(specials_count):
+            # выбираем специальный символ
+            spec_ch = self.__randomizer.choice(specials)
+            # определяем позицию, куда специальный символ будет вставлен
+            pos = self.__randomizer.randint(0, len(rus_passphrase) + 1)
+            # добавляем специальный символ в парольную фразу
+            rus_passphrase.insert(pos, spec_ch)
+            eng_passphrase.insert(pos, spec_ch)
+
+    def __add_numbers(self, rus_passphrase:list, eng_passphrase:list, digits:str=None, numbers_count:int=None) -> None:
+        """
+        Добавление в начало парольной фразы числа из случайного количества цифр
+        :param rus_passphrase: список слов парольной фразы на русском языке (изменяется)
+        :param eng_passphrase: список слов парольной фразы в английской раскладке (изменяется)
+        :param digits: алфавит цифр, ограниченный политикой паролей: число записывается ровно numbers_count цифрами, в т.ч. ведущими нулями
+            (None - цифры 0..9, число записывается без ведущих нулей)
+        :param numbers_count: количество цифр (None - выбирается случайно)
+        :return: None
+        """
+        # определяем количество цифр, которые будут добавлены в парольную фразу
+        if numbers_count is None:
+            numbers_count = self.__randomizer.randint(1, self.MAX_NUMBERS_COUNT)
+        if digits is not None:
+            number = ''.join(self.__randomizer.choice(digits) for ind in range(numbers_count))
+        else:
             number = 0
             for ind in range(numbers_count):
-                number = number + (int(self.__randomizer.random() * 10) * int(pow(10, ind)))
-            rus_passphrase.insert(0, str(number))
-            eng_passphrase.insert(0, str(number))
+                number = number + (self.__randomizer.randrange(10) * int(pow(10, ind)))
+            number = str(number)
+        rus_passphrase.insert(0, number)
+        eng_passphrase.insert(0, number)
 
-        return [eng_passphrase, rus_passphrase]
+    def __instrument(self, ) -> None:
+        """
+        Включение профилирования генератора: этапы генерации парольной фразы заменяются обертками, замеряющими время их выполнения,
+        источник случайных чисел и чтение словарей - обертками, подсчитывающими обращения (см. profiler_lib)
+        :return: None
+        """
+        if hasattr(self.__randomizer, 'get_stats'):
+            profiler.add_stats_provider('entropy_pool', self.__randomizer.get_stats)
+        self.__randomizer = CountingRandomizer(self.__randomizer, profiler)
+        self.generate_passphrase = profiler.timed('generate_passphrase', self.generate_passphrase)
+        self.generate_batch = profiler.timed('generate_batch', self.generate_batch)
+        self.__get_words = profiler.timed('dictionary_fetch', self.__get_words)
+        self.__get_random_word = profiler.timed('word_selection', self.__get_random_word)
+        self.__get_layout_word = profiler.timed('layout_change', self.__get_layout_word)
+        self.__truncate_words = profiler.timed('truncation', self.__truncate_words)
+        self.__set_case = profiler.timed('case', self.__set_case)
+        self.__add_special_chars = profiler.timed('specials', self.__add_special_chars)
+        self.__add_numbers = profiler.timed('digits', self.__add_numbers)
+        self._read_dict_file = profiler.counted('dict.text_reads', self._read_dict_file)
+        self._open_compiled_dict = profiler.counted('dict.compiled_opens', self._open_compiled_dict)
+        self.__dict_cache.load = profiler.counted('dict.cache_loads', self.__dict_cache.load)
+
+    def generate_passphrases(self, pwd_options:dict, count:int):
+        """
+        Генератор парольных фраз по заданным параметрам. Парольные фразы создаются по одной по мере запроса, поэтому потребление памяти
+        не зависит от их количества
+        :param pwd_options: словарь с параметрами генерируемой парольной фразы (аналогично generate_passphrase)
+        :param count: количество парольных фраз
+        :return: генератор парольных фраз в формате generate_passphrase
+        """
+        for ind in range(count):
+            yield self.generate_passphrase(pwd_options)
+
+    def generate_batch(self, pwd_options:dict, count:int) -> list:
+        """
+        Пакетная генерация парольных фраз. Все случайные значения (номера слов для каждой позиции шаблона, количество и позиции
+        спецсимволов, цифры) выбираются сразу для всего пакета в виде массивов numpy, а усечение слов, смена регистра, вставка
+        спецсимволов и цифр выполняются над столбцами, а не в цикле по каждой парольной фразе.
+        Распределение результатов совпадает с generate_passphrase. Если numpy не установлен или пакет меньше BATCH_MIN_SIZE,
+        парольные фразы создаются по одной
+        :param pwd_options: словарь с параметрами генерируемой парольной фразы (аналогично generate_passphrase)
+        :param count: количество парольных фраз
+        :return: список парольных фраз; каждая - в формате generate_passphrase ([eng_passphrase, rus_passphrase])
+        """
+        if count < self.BATCH_MIN_SIZE or _import_numpy() is None:
+            return list(self.generate_passphrases(pwd_options, count))
+
+        passphrases = list()
+        # пакет обрабатывается частями, чтобы объем временных массивов не зависел от количества парольных фраз
+        for start in range(0, count, self.BATCH_CHUNK_SIZE):
+            passphrases.extend(self.__generate_batch_chunk(pwd_options, min(self.BATCH_CHUNK_SIZE, count - start)))
+        return passphrases
+
+    def __generate_batch_chunk(self, pwd_options:dict, count:int) -> list:
+        """
+        Векторизованная генерация части пакета парольных фраз (см. generate_batch)
+        :param pwd_options: словарь с параметрами генерируемой парольной фразы
+        :param count: количество парольных фраз
+        :return: список парольных фраз в формате generate_passphrase
+        """
+        plan = self.__get_plan(pwd_options)
+        slots = plan.slots
+        words_count = len(slots)
+        # матрицы слов парольных фраз: строка - парольная фраза, столбец - позиция; дополнительные столбцы резервируются под
+        # спецсимволы и цифры, незанятые ячейки содержат None
+        width = words_count + self.MAX_SPECIALS_COUNT + 1
+        rus_matrix = numpy.full((count, width), None, dtype=object)
+        eng_matrix = numpy.full((count, width), None, dtype=object)
+
+        # при ограничении длины пароля количества спецсимволов и цифр, длины слов и номера слов в корзинах выбираются для каждой
+        # парольной фразы (одно случайное число на парольную фразу, см. length_lib), а слова по номерам - сразу для всех парольных фраз
+        # с одинаковой длиной слова позиции
+        if plan.lengths is not None:
+            draws = [plan.lengths.draw(self.__randomizer.randrange) for ind in range(count)]
+            counts = numpy.array([label for label, lengths, positions in draws], dtype=numpy.int64)
+            words_lengths = numpy.array([lengths for label, lengths, positions in draws], dtype=numpy.int64)
+            words_positions = numpy.array([positions for label, lengths, positions in draws], dtype=numpy.int64)
+
+        # выбор слов: для каждой позиции шаблона номера слов выбираются сразу для всего пакета
+        for col, slot in enumerate(slots):
+            words, layout_words = self.__get_words_array(slot.part)
+            if slot.buckets is not None:
+                # номера слов (групп префиксов) по номерам в корзинах выбранных длин
+                candidates = numpy.empty(count, dtype=numpy.int64)
+                for length in numpy.unique(words_lengths[:, col]).tolist():
+                    rows = numpy.flatnonzero(words_lengths[:, col] == length)
+                    candidates[rows] = numpy.frombuffer(slot.buckets[length], dtype=numpy.int64)[words_positions[rows, col]]
+            elif slot.indexes is not None:
+                candidates = numpy.frombuffer(slot.indexes, dtype=numpy.int64)[self.__batch_randbelow(len(slot.indexes), count)]
+            else:
+                candidates = None
+            if slot.prefix_groups is not None:
+                # выбор префикса, затем - слова из группы слов с этим префиксом
+                prefixes, sizes, starts, word_indexes = self.__get_prefix_groups_arrays(slot.part, slot.char_count)
+                groups = candidates if candidates is not None else self.__batch_randbelow(len(prefixes), count)
+                indexes = word_indexes[starts[groups] + self.__batch_randbelow_each(sizes[groups])]
+                layout_column = prefixes[groups]
+            else:
+                indexes = candidates if candidates is not None else self.__batch_randbelow(len(words), count)
+                layout_column = layout_words[indexes]
+            rus_column = words[indexes]
+            # слова в английской раскладке усекаются до char_count букв (приведение к строкам фиксированной длины отсекает лишние символы)
+            eng_column = layout_column.astype(f'U{slot.char_count}')
+            if slot.transform is not None:
+                case_func = numpy.char.capitalize if slot.case == 'title' else numpy.char.upper
+                rus_column = case_func(rus_column.astype(str))
+                eng_column = case_func(eng_column)
+            rus_matrix[:, col] = rus_column
+            eng_matrix[:, col] = eng_column
+
+        # вставка спецсимволов: на k-м шаге спецсимвол вставляется во все парольные фразы, где их не менее k + 1;
+        # длина таких парольных фраз одинакова (words_count + k), поэтому позиция выбирается так же, как в generate_passphrase
+        if plan.use_special:
+            if plan.lengths is not None:
+                specials_counts = counts[:, 0]
+            else:
+                specials_counts = self.__batch_randbelow(self.MAX_SPECIALS_COUNT, count) + 1
+            columns = numpy.arange(width)
+            for ind in range(self.MAX_SPECIALS_COUNT):
+                rows = numpy.flatnonzero(specials_counts > ind)
+                length = words_count + ind
+                spec_chars = numpy.array(plan.specials, dtype=object)[self.__batch_randbelow(len(plan.specials), len(rows))]
+                # позиция из диапазона [0, length + 1]; вставка в позицию length + 1 равносильна добавлению в конец
+                positions = numpy.minimum(self.__batch_randbelow(length + 2, len(rows)), length)[:, None]
+                # сдвиг элементов, стоящих не левее позиции вставки, на один столбец вправо
+                source = numpy.where(columns < positions, columns, columns - 1)
+                for matrix in [rus_matrix, eng_matrix]:
+                    shifted = numpy.take_along_axis(matrix[rows], numpy.maximum(source, 0), axis=1)
+                    shifted[columns == positions] = spec_chars
+                    matrix[rows] = shifted
+
+        # добавление цифр в начало парольной фразы: число из numbers_count случайных цифр
+        if plan.use_numbers:
+            if plan.lengths is not None:
+                numbers_counts = counts[:, 1]
+            else:
+                numbers_counts = self.__batch_randbelow(self.MAX_NUMBERS_COUNT, count) + 1
+            used = numpy.arange(self.MAX_NUMBERS_COUNT) < numbers_counts[:, None]
+            if plan.digits is not None:
+                # при политике паролей число записывается ровно numbers_count цифрами из разрешенных (см. __add_numbers)
+                digits = numpy.array(list(plan.digits))[self.__batch_randbelow(len(plan.digits), count * self.MAX_NUMBERS_COUNT)]
+                digits = numpy.where(used, digits.reshape(count, self.MAX_NUMBERS_COUNT), '')
+                numbers = digits[:, 0]
+                for ind in range(1, self.MAX_NUMBERS_COUNT):
+                    numbers = numpy.char.add(numbers, digits[:, ind])
+                numbers = numbers.astype(object)
+            else:
+                digits = self.__batch_randbelow(10, count * self.MAX_NUMBERS_COUNT).reshape(count, self.MAX_NUMBERS_COUNT)
+                weights = 10 ** numpy.arange(self.MAX_NUMBERS_COUNT)
+                numbers = (digits * weights * used).sum(axis=1)
+                numbers = numpy.char.mod('%d', numbers).astype(object)
+            for matrix in [rus_matrix, eng_matrix]:
+                matrix[:, 1:] = matrix[:, :-1].copy()
+                matrix[:, 0] = numbers
+
+        return [[[prt for prt in eng_row if prt is not None], [prt for prt in rus_row if prt is not None]]
+                for eng_row, rus_row in zip(eng_matrix.tolist(), rus_matrix.tolist())]
+
+    def __get_words_array(self, prt_of_sppech:str):
+        """
+        Получение словаря заданной части речи в виде массивов numpy (для выборки слов сразу по массиву номеров)
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: кортеж массивов (numpy.ndarray, dtype=object): слова словаря и те же слова в английской раскладке
+        """
+        arrays = self.__words_arrays.get(prt_of_sppech)
+        if arrays is None:
+            with self.__cache_lock:
+                arrays = self.__words_arrays.get(prt_of_sppech)
+                if arrays is None:
+                    arrays = tuple(numpy.array(list(words), dtype=object) for words in self.__get_words(prt_of_sppech))
+                    self.__words_arrays[prt_of_sppech] = arrays
+        return arrays
+
+    def __batch_randbelow(self, n:int, size:int):
+        """
+        Массив случайных целых чисел из диапазона [0, n) без смещения. Числа получаются из 64-битных значений, считанных из буфера
+        случайных байтов; значения из неполного последнего интервала длины n отбрасываются и выбираются повторно (rejection sampling)
+        :param n: верхняя граница диапазона (не включается), n > 0
+        :param size: количество чисел
+        :return: массив случайных целых чисел (numpy.ndarray, dtype=int64)
+        """
+        limit = (2 ** 64 // n) * n
+        result = numpy.empty(size, dtype=numpy.int64)
+        pending = numpy.arange(size)
+        while len(pending):
+            values = numpy.frombuffer(self.__get_random_bytes(8 * len(pending)), dtype='<u8')
+            accepted = values < limit
+            result[pending[accepted]] = (values[accepted] % n).astype(numpy.int64)
+            pending = pending[~accepted]
+        return result
+
+    def __batch_randbelow_each(self, n):
+        """
+        Массив случайных целых чисел без смещения, i-е число - из диапазона [0, n[i]) (аналогично __batch_randbelow)
+        :param n: массив верхних границ диапазонов (numpy.ndarray), все элементы > 0
+        :return: массив случайных целых чисел (numpy.ndarray, dtype=int64)
+        """
+        n = n.astype(numpy.uint64)
+        limits = (numpy.iinfo(numpy.uint64).max // n) * n
+        result = numpy.empty(len(n), dtype=numpy.int64)
+        pending = numpy.arange(len(n))
+        while len(pending):
+            values = numpy.frombuffer(self.__get_random_bytes(8 * len(pending)), dtype='<u8')
+            accepted = values < limits[pending]
+            result[pending[accepted]] = (values[accepted] % n[pending[accepted]]).astype(numpy.int64)
+            pending = pending[~accepted]
+        return result
+
+    def __get_random_bytes(self, count:int) -> bytes:
+        """
+        Получение случайных байтов от источника случайных чисел (пул энтропии или объект с интерфейсом random.SystemRandom)
+        :param count: количество байтов
+        :return: случайные байты
+        """
+        if hasattr(self.__randomizer, 'getbytes'):
+            return self.__randomizer.getbytes(count)
+        return self.__randomizer.randbytes(count)
     
     def __change_layout(self, pwd_prts:list) -> list:
         """
         Изменение языка слов, которые будут использоваться в составе парольной фразы. Изменение языка подразумевает замену русских букв на английские
         в соответствии с клавишами клавиатуры 
-        :param pwd_prts: исходный список слов парольной фразы
-        :return: преобразованный (замена русских букв на английские) список слов парольной фразы
+        Применяется при загрузке словаря в индекс, поэтому при генерации парольных фраз смена раскладки не выполняется.
+        :param pwd_prts: исходный список слов
+        :return: преобразованный (замена русских букв на английские) список слов
         """
-        # region Const
-        RUS_LAYOUT = 'йцукенгшщзхъфывапролджэячсмитьбюёЙЦУКЕНГШЩЗХЪФЫВАПРОЛДЖЭЯЧСМИТЬБЮЁ'
-        ENG_LAYOUT = 'qwertyuiop[]asdfghjkl;\'zxcvbnm,.`QWERTYUIOP{}ASDFGHJKL:"ZXCVBNM<>~'
-        # endregion
+        return [wrd.translate(self.LAYOUT_TABLE) for wrd in pwd_prts]
 
-        tr_pwd_prts = list()
-        # цикл по элементам списка слов, входящих в парольную фразу
-        for ind in range(len(pwd_prts)):
-            # далее буквы русского языка заменяются на буквы английского в соответствии с раскладкой
-            # инициализация слова парольной фразы после изменения
-            tr_wrd = ''
-            # цикл, где выполняется замена букв
-            for ltr in pwd_prts[ind]:
-                tr_wrd = tr_wrd + ENG_LAYOUT[RUS_LAYOUT.find(ltr)]
-            # pwd_prts[ind] = tr_wrd
-            tr_pwd_prts.append(tr_wrd)
-        return tr_pwd_prts
-
-    def __set_upper_case(self, pwd_prts:list) -> list:
-        """
-        Изменение регистра первой буквы каждого слова, которое будет использоваться в составе парольной фразы
+    def __set_case(self, pwd_prts:list, slots:tuple) -> list:
+        """
+        Изменение регистра слов, которые будут использоваться в составе парольной фразы, по правилам регистра позиций шаблона
+        (первая буква слова - заглавная или все буквы заглавные)
         :param pwd_prts: исходный список слов парольной фразы
-        :return: преобразованный (первая буква слова - заглавная) список слов парольной фразы
+        :param slots: позиции скомпилированного шаблона (функции смены регистра)
+        :return: преобразованный список слов парольной фразы
         """
-        return [wrd.capitalize() for wrd in pwd_prts]
+        return [slot.transform(wrd) if slot.transform is not None else wrd for wrd, slot in zip(pwd_prts, slots)]
 
-    def __get_random_word(self, prt_of_sppech:str) -> str:
+    def __get_random_word(self, slot:PlanSlot, ind:int=None) -> tuple:
+        """
+        Выбор случайного слова из словаря слов части речи позиции шаблона. Слова берутся из таблиц индекса __words_index, ссылки на которые
+        сохранены в скомпилированном шаблоне, поэтому файл словаря считывается только один раз - при компиляции первого шаблона с этой частью речи.
+        При способе выбора prefix равновероятно выбирается префикс из char_count букв, а затем - слово из слов с этим префиксом
+        :param slot: позиция скомпилированного шаблона (см. __get_plan)
+        :param ind: номер слова (при способе выбора prefix - группы префиксов), выбранный заранее из корзины слов нужной длины
+            (None - слово выбирается случайно)
+        :return: кортеж: случайное слово из словаря, которое далее будет использоваться в составе пароля, и номер его формы в английской
+            раскладке (при способе выбора prefix - номер группы префикса), см. __get_layout_word
         """
-        Выбор случайного слова из словаря слов заданной части речи. Считанный файл сичтывается полностью; после из него случайным образом выбирется одно слово. 
-        В конце необходимо удалить символ новой строки (\n) для выбранного слова.
-        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря, из которого будут считываться данные (строки)
-        :return: случайное слово из словаря, которое далее будет использоваться в составе пароля
+        words = slot.words
+        if slot.prefix_groups is not None:
+            prefixes, groups, width = slot.prefix_groups
+            if ind is not None:
+                group_ind = ind
+            elif slot.indexes is not None:
+                group_ind = slot.indexes[self.__randomizer.randrange(len(slot.indexes))]
+            else:
+                group_ind = self.__randomizer.randrange(len(prefixes))
+            group = groups[group_ind]
+            pos = self.__randomizer.randrange(len(group) // width) * width
+            return words[int(group[pos:pos + width], 16)], group_ind
+        if ind is not None:
+            pass
+        elif slot.indexes is not None:
+            ind = slot.indexes[self.__randomizer.randrange(len(slot.indexes))]
+        else:
+            ind = self.__randomizer.randrange(len(words))
+        return words[ind], ind
+
+    def __get_layout_word(self, slot:PlanSlot, ind:int) -> str:
         """
-        dict_content = self._read_dict_file(self.__dictionaries_filenames[prt_of_sppech])
-        return self.__randomizer.choice(dict_content)[:-1]
+        Смена раскладки выбранного слова: слово в английской раскладке берется из таблицы индекса, вычисленной при загрузке словаря
+        (см. __change_layout), при способе выбора prefix - префикс группы в английской раскладке
+        :param slot: позиция скомпилированного шаблона
+        :param ind: номер слова (при способе выбора prefix - номер группы префикса), см. __get_random_word
+        :return: слово (префикс) в английской раскладке
+        """
+        if slot.prefix_groups is not None:
+            return slot.prefix_groups[0][ind]
+        return slot.layout_words[ind]
+
+    def __get_prefix_groups(self, prt_of_sppech:str, char_count:int) -> tuple:
+        """
+        Получение групп слов словаря с одинаковым префиксом из char_count букв в английской раскладке (для способа выбора prefix).
+        Группы строятся по индексу слов один раз и сохраняются в кэш словарей двумя полями: различные префиксы и номера слов каждой группы,
+        записанные подряд шестнадцатеричными числами одинаковой ширины (поэтому слово группы выбирается без разбора всей группы)
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :param char_count: количество букв префикса
+        :return: кортеж (префиксы, группы, ширина номера слова в символах)
+        """
+        key = (prt_of_sppech, char_count)
+        entry = self.__prefix_groups.get(key)
+        if entry is None:
+            with self.__cache_lock:
+                entry = self.__prefix_groups.get(key)
+                if entry is None:
+                    layout_words = self.__get_words(prt_of_sppech)[1]
+                    # ширина номера - четное количество шестнадцатеричных цифр (целое количество байтов, см. __get_prefix_groups_arrays)
+                    width = 2 * max(1, ((len(layout_words) - 1).bit_length() + 7) // 8)
+
+                    def build_prefix_groups() -> list:
+                        groups = dict()
+                        for ind, word in enumerate(layout_words):
+                            groups.setdefault(word[:char_count], list()).append(ind)
+                        return [list(groups.keys()), [''.join(f'{ind:0{width}x}' for ind in group) for group in groups.values()]]
+
+                    fields = self.__dict_cache.load(self.__get_dictionary_filename(prt_of_sppech), f'{self.__CACHE_VARIANT}:prefix-groups:{char_count}',
+                                                    build_prefix_groups)
+                    entry = (fields[0], fields[1], width)
+                    self.__prefix_groups[key] = entry
+        return entry
+
+    def __get_prefix_groups_arrays(self, prt_of_sppech:str, char_count:int) -> tuple:
+        """
+        Группы слов с одинаковым префиксом (см. __get_prefix_groups) в виде массивов numpy для пакетной генерации
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :param char_count: количество букв префикса
+        :return: кортеж: префиксы (dtype=object), размеры групп, начала групп в массиве номеров слов, номера слов, упорядоченные по группам
+        """
+        key = (prt_of_sppech, char_count)
+        arrays = self.__prefix_groups_arrays.get(key)
+        if arrays is None:
+            with self.__cache_lock:
+                arrays = self.__prefix_groups_arrays.get(key)
+                if arrays is None:
+                    prefixes, groups, width = self.__get_prefix_groups(prt_of_sppech, char_count)
+                    groups = list(groups)
+                    sizes = numpy.array([len(group) // width for group in groups], dtype=numpy.int64)
+                    starts = numpy.concatenate(([0], numpy.cumsum(sizes)[:-1]))
+                    # номера слов разбираются сразу для всех групп: шестнадцатеричные числа -> байты (big-endian) -> целые
+                    digits = numpy.frombuffer(bytes.fromhex(''.join(groups)), dtype=numpy.uint8).reshape(-1, width // 2).astype(numpy.int64)
+                    word_indexes = (digits * (256 ** numpy.arange(width // 2 - 1, -1, -1))).sum(axis=1)
+                    arrays = (numpy.array(list(prefixes), dtype=object), sizes, starts, word_indexes)
+                    self.__prefix_groups_arrays[key] = arrays
+        return arrays
+
+    def __get_words(self, prt_of_sppech:str) -> tuple:
+        """
+        Получение слов заданной части речи из индекса __words_index. При первом обращении к части речи словарь загружается:
+        из скомпилированного файла (отображается в память) или из текстового файла (символ новой строки (\n) удаляется,
+        слова приводятся к нижнему регистру, пустые строки отбрасываются). Тогда же для всех слов вычисляется их форма
+        в английской раскладке (если она не сохранена в скомпилированном словаре вторым полем записи).
+        :param prt_of_sppech: [сокращение ~ часть речь] условное обозначение (сокращение) словаря
+        :return: кортеж (слова словаря, те же слова в английской раскладке); если словарь не удалось считать, возбуждается DictionaryError
+        """
+        entry = self.__words_index.get(prt_of_sppech)
+        if entry is None:
+            with self.__cache_lock:
+                entry = self.__words_index.get(prt_of_sppech)
+                if entry is None:
+                    filename = self.__get_dictionary_filename(prt_of_sppech)
+                    encoding = self.__dict_manifest.get_encoding(prt_of_sppech)
+                    # скомпилированный рядом с текстовым словарь (compile_dicts.py) используется напрямую, остальные словари - через кэш словарей
+                    words = self._load_compiled_dict_file(filename)
+                    if words is not None and words.get_fields_count() > 1:
+                        fields = [words, words.field(1)]
+                    else:
+                        fields = self.__dict_cache.load(filename, self.__CACHE_VARIANT, lambda: self.__build_index_fields(filename, encoding))
+                    # словарь прошел проверку, но не был считан (например, был удален после проверки) или не содержит слов
+                    if fields is None or not len(fields[0]):
+                        raise DictionaryError(f'{filename}: dictionary could not be loaded or is empty')
+                    entry = tuple(fields)
+                    self.__words_index[prt_of_sppech] = entry
+        return entry
+
+    def __build_index_fields(self, filename:str, encoding:str) -> list:
+        """
+        Обработка словаря для индекса слов: считывание слов и вычисление их формы в английской раскладке
+        :param filename: файл словаря
+        :param encoding: кодировка файла словаря
+        :return: список полей [слова словаря, те же слова в английской раскладке] или None, если словарь не удалось считать
+        """
+        words = self._load_dict_words(filename, encoding)
+        if words is None:
+            return None
+        return [list(words), self.__change_layout(words)]
     
     def show_passphrase_options(self, compl:str) -> None:
         """
@@ -226,11 +1129,12 @@ class PwdGen(DictFileWorker, Config):
         :return: None
         """
         print(f'Current {compl} passphrase options:')
-        print(f'    words count - {self.__PASSPHRASE_PRESETS[compl]["words_count"]}')
-        print(f'    chars count - {self.__PASSPHRASE_PRESETS[compl]["char_count"]}')
-        print(f'    use of numbers - {self.__PASSPHRASE_PRESETS[compl]["use_numbers"]}')
-        print(f'    use of special characters - {self.__PASSPHRASE_PRESETS[compl]["use_special"]}')
-        print(f'    capitalize the first letter of each word - {self.__PASSPHRASE_PRESETS[compl]["use_upper_case"]}')
+        options = self.get_passphrase_options(compl)
+        print(f'    words count - {options["words_count"]}')
+        print(f'    chars count - {options["char_count"]}')
+        print(f'    use of numbers - {options["use_numbers"]}')
+        print(f'    use of special characters - {options["use_special"]}')
+        print(f'    capitalize the first letter of each word - {options["use_upper_case"]}')
     
     def reset_passphrase_options_to_defaults(self) -> int:
         """
@@ -240,7 +1144,7 @@ class PwdGen(DictFileWorker, Config):
         """
         # обновляем данные в конфигурационном файле conf.ini
         res = self.set_defaults_options()
-        # обновляем пользовательские (кастомные) параметры парольной фразы, занося их в словарь __PASSPHRASE_PRESETS["custom"]
+        # обновляем пользовательские (кастомные) параметры парольной фразы, занося их в поле __custom_options
         self.__update_custom_passphrase_options(options=self.get_options(), is_upd_file=False)
         return res
     
@@ -295,33 +1199,7 @@ class PwdGen(DictFileWorker, Config):
         # каждое введенное пользователем или полученное из конфигурационного файла значение валидируется по заданным параметрам
         # если какое-либо значение не удовлетворяет заданным условиям, то оно принимает значене по умолчания для данного параметра
         try:
-            self.__PASSPHRASE_PRESETS["custom"] = {
-                # 'words_count': self.__check_custom_int_option(option=options["words_count"], default=4, min_val=2, max_val=6),
-                # 'char_count': self.__check_custom_int_option(option=options["char_count"], default=3, min_val=3, max_val=5),
-                # 'use_numbers': self.__check_custom_bool_option(option=options["use_numbers"], default=True),
-                # 'use_special': self.__check_custom_bool_option(option=options["use_special"], default=False),
-                # 'use_upper_case': self.__check_custom_bool_option(option=options["use_upper_case"], default=False)
-
-                'words_count': self.__check_custom_int_option(option_name='words_count',
-                                                              option=options["words_count"],
-                                                              default=self.CMD_OPTIONS_DEFAULTS["words_count"]["default"],
-                                                              min_val=self.CMD_OPTIONS_DEFAULTS["words_count"]["min_val"],
-                                                              max_val=self.CMD_OPTIONS_DEFAULTS["words_count"]["max_val"]),
-                'char_count': self.__check_custom_int_option(option_name='char_count',
-                                                             option=options["char_count"],
-                                                             default=self.CMD_OPTIONS_DEFAULTS["char_count"]["default"],
-                                                             min_val=self.CMD_OPTIONS_DEFAULTS["char_count"]["min_val"],
-                                                             max_val=self.CMD_OPTIONS_DEFAULTS["char_count"]["max_val"]),
-                'use_numbers': self.__check_custom_bool_option(option_name='use_numbers',
-                                                               option=options["use_numbers"],
-                                                               default=True),
-                'use_special': self.__check_custom_bool_option(option_name='use_special',
-                                                               option=options["use_special"],
-                                                               default=self.CMD_OPTIONS_DEFAULTS["use_special"]["default"]),
-                'use_upper_case': self.__check_custom_bool_option(option_name='use_upper_case',
-                                                                  option=options["use_upper_case"],
-                                                                  default=self.CMD_OPTIONS_DEFAULTS["use_upper_case"]["default"])
-            }
+            self.__custom_options = self.check_passphrase_options(options)
         except Exception as err:
             # обработка исключения - не найден ключ в словаре options; все пользовательские параметры сбрасываются к значениям по умолчанию
             logger_lib.error('Update custom passphrase options', f'Parameter {err} not found (probably, in configuration file). Default parameters will be used')
@@ -329,8 +1207,45 @@ class PwdGen(DictFileWorker, Config):
         
         # при необходимости записываем изменения в конфигурационный файл для последующего использования
         if is_upd_file:
-            self.set_options(self.__PASSPHRASE_PRESETS["custom"])
+            self.set_options(self.__custom_options)
     
+    def check_passphrase_options(self, options:dict) -> dict:
+        """
+        Проверка параметров парольной фразы (введенных пользователем, считанных из конфигурационного файла или полученных в запросе).
+        Каждое значение приводится к нужному типу; если какое-либо значение не удовлетворяет заданным условиям, то оно принимает
+        значение по умолчанию для данного параметра
+        :param options: параметры парольной фразы (значения - строки или значения соответствующих типов)
+        :return: проверенные параметры парольной фразы (PassphraseOptions)
+        :raises KeyError: если в options отсутствует какой-либо параметр
+        """
+        return PassphraseOptions({
+            # 'words_count': self.__check_custom_int_option(option=options["words_count"], default=4, min_val=2, max_val=6),
+            # 'char_count': self.__check_custom_int_option(option=options["char_count"], default=3, min_val=3, max_val=5),
+            # 'use_numbers': self.__check_custom_bool_option(option=options["use_numbers"], default=True),
+            # 'use_special': self.__check_custom_bool_option(option=options["use_special"], default=False),
+            # 'use_upper_case': self.__check_custom_bool_option(option=options["use_upper_case"], default=False)
+
+            'words_count': self.__check_custom_int_option(option_name='words_count',
+                                                          option=str(options["words_count"]),
+                                                          default=self.CMD_OPTIONS_DEFAULTS["words_count"]["default"],
+                                                          min_val=self.CMD_OPTIONS_DEFAULTS["words_count"]["min_val"],
+                                                          max_val=self.CMD_OPTIONS_DEFAULTS["words_count"]["max_val"]),
+            'char_count': self.__check_custom_int_option(option_name='char_count',
+                                                         option=str(options["char_count"]),
+                                                         default=self.CMD_OPTIONS_DEFAULTS["char_count"]["default"],
+                                                         min_val=self.CMD_OPTIONS_DEFAULTS["char_count"]["min_val"],
+                                                         max_val=self.CMD_OPTIONS_DEFAULTS["char_count"]["max_val"]),
+            'use_numbers': self.__check_custom_bool_option(option_name='use_numbers',
+                                                           option=str(options["use_numbers"]),
+                                                           default=True),
+            'use_special': self.__check_custom_bool_option(option_name='use_special',
+                                                           option=str(options["use_special"]),
+                                                           default=self.CMD_OPTIONS_DEFAULTS["use_special"]["default"]),
+            'use_upper_case': self.__check_custom_bool_option(option_name='use_upper_case',
+                                                              option=str(options["use_upper_case"]),
+                                                              default=self.CMD_OPTIONS_DEFAULTS["use_upper_case"]["default"])
+        })
+
     def __check_custom_int_option(self, option_name:str, option:str, default:int, min_val:int, max_val:int) -> int:
         """
         Метод валидации и определения целочисленных параметров пользовательской (кастомной) парольной фразы.
@@ -0,0 +1,92 @@
+# region Import
+from collections.abc import Mapping
+# endregion
+
+
+# region Const
+# допустимые диапазоны и значения по умолчанию опций командной строки и пользовательских (кастомных) параметров парольной фразы.
+# вынесены в отдельный модуль без зависимостей, чтобы интерфейс командной строки мог построить справку и проверить опции,
+# не импортируя генератор паролей
+CMD_OPTIONS_DEFAULTS = {
+    'count': {'min_val': 1, 'max_val': 20, 'default': 5},
+    'words_count': {'min_val': 2, 'max_val': 6, 'default': 4},
+    'char_count': {'min_val': 3, 'max_val': 5, 'default': 3},
+    'use_numbers': {'default': False},
+    'use_special': {'default': False},
+    'use_upper_case': {'default': False},
+}
+# endregion
+
+
+def _freeze(value):
+    """
+    Неизменяемое представление значения параметра: словари (например, политика паролей) - PassphraseOptions, списки и множества -
+    кортежи и frozenset; остальные значения возвращаются как есть
+    :param value: значение параметра
+    :return: неизменяемое значение
+    """
+    if isinstance(value, Mapping):
+        return value if isinstance(value, PassphraseOptions) else PassphraseOptions(value)
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+# Class for frozen passphrase options
+# неизменяемые параметры парольной фразы: отображение (Mapping) с доступом по ключу (options["words_count"], options.get('pattern')),
+# которое нельзя изменить после создания, поэтому один объект параметров (пресет, кастомные параметры) разделяется потоками без копирования
+# и блокировок. Измененные параметры - новый объект (см. replace); dict(options) - изменяемая копия (например, для передачи в JSON).
+# Объекты хешируемы и равны любым отображениям с теми же парами ключ-значение (в том числе обычным словарям)
+class PassphraseOptions(Mapping):
+    __slots__ = ('__items', '__hash')
+
+    # default constructor
+    def __init__(self, options:Mapping=(), **kwargs) -> None:
+        """
+        :param options: параметры парольной фразы (словарь или другое отображение)
+        :param kwargs: дополнительные параметры (переопределяют параметры options)
+        """
+        items = dict(options, **kwargs)
+        object.__setattr__(self, '_PassphraseOptions__items', {key: _freeze(value) for key, value in items.items()})
+        object.__setattr__(self, '_PassphraseOptions__hash', None)
+
+    def __setattr__(self, name:str, value) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __getitem__(self, key:str):
+        return self.__items[key]
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __hash__(self) -> int:
+        if self.__hash is None:
+            object.__setattr__(self, '_PassphraseOptions__hash', hash(frozenset(self.__items.items())))
+        return self.__hash
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.__items!r})'
+
+    def __reduce__(self) -> tuple:
+        # объект передается рабочим процессам (см. parallel_lib) как обычный словарь и создается заново
+        return type(self), (self.to_dict(),)
+
+    def replace(self, **changes) -> 'PassphraseOptions':
+        """
+        Новые параметры парольной фразы с измененными значениями (исходный объект не меняется)
+        :param changes: изменяемые параметры (например, pattern=..., policy=...)
+        :return: объект PassphraseOptions
+        """
+        return PassphraseOptions(self.__items, **changes)
+
+    def to_dict(self) -> dict:
+        """
+        Изменяемая копия параметров с обычными словарями вместо вложенных PassphraseOptions (например, для сериализации в JSON)
+        :return: словарь параметров
+        """
+        return {key: value.to_dict() if isinstance(value, PassphraseOptions) else value for key, value in self.__items.items()}
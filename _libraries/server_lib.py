@@ -0,0 +1,168 @@
+# region Import
+import os
+import json
+import stat
+import errno
+import socket
+import socketserver
+from os import path
+
+from _libraries.service_lib import PwdGenService
+from _libraries import logger_lib
+# endregion
+
+
+def get_default_socket_path() -> str:
+    """
+    Определение пути к Unix-сокету сервиса по умолчанию: $XDG_RUNTIME_DIR/pwdgen.sock или pwdgen-<uid>.sock во временном каталоге
+    :return: путь к сокету
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return path.join(runtime_dir, 'pwdgen.sock')
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return path.join(os.environ.get('TMPDIR', '/tmp'), f'pwdgen-{uid}.sock')
+
+
+def _remove_stale_socket(socket_path:str) -> None:
+    """
+    Удаление сокета, оставшегося от предыдущего (аварийно завершенного) запуска сервиса. Путь удаляется, только если это Unix-сокет,
+    к которому не удается подключиться (ECONNREFUSED): обычный файл, заданный по ошибке, и сокет работающего сервиса не удаляются
+    :param socket_path: путь к сокету
+    :return: None
+    :raises OSError: если путь занят файлом, который не является сокетом, или сокетом работающего сервиса
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, 'path exists and is not a socket')
+    test_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        test_socket.connect(socket_path)
+    except ConnectionRefusedError:
+        os.remove(socket_path)
+        return
+    finally:
+        test_socket.close()
+    raise OSError(errno.EADDRINUSE, 'another service is listening on the socket')
+
+
+# обработчик запросов к сервису генерации паролей. Протокол: по одному JSON-объекту на строку в обе стороны (формат запроса и
+# ответа описан в service_lib); в рамках одного соединения допускается несколько запросов
+class PwdGenRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.handle_request(json.loads(line))
+            except Exception as err:
+                response = {'error': str(err)}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+# сервис генерации паролей: держит в памяти готовые (с загруженными словарями) объекты PwdGen и XKCD и отвечает на запросы
+# через локальный Unix-сокет; каждое соединение обслуживается в отдельном потоке
+class PwdGenServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    # default constructor
+    def __init__(self, socket_path:str, pwd_gen, xkcd_obj) -> None:
+        """
+        :raises OSError: если путь сокета занят (см. _remove_stale_socket) или сокет не удалось создать
+        """
+        self.__service = PwdGenService(pwd_gen, xkcd_obj)
+        # отметка созданного сокета (устройство, inode): при завершении удаляется только этот сокет
+        self.__socket_id = None
+        # сокет, оставшийся от предыдущего (аварийно завершенного) запуска, удаляется
+        _remove_stale_socket(socket_path)
+        socketserver.UnixStreamServer.__init__(self, socket_path, PwdGenRequestHandler)
+
+    def server_bind(self) -> None:
+        # доступ к сокету - только у владельца: сокет создается сразу с правами 0600 (umask на время bind), поэтому нет промежутка,
+        # в котором к нему могут подключиться другие пользователи
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+        socket_stat = os.lstat(self.server_address)
+        self.__socket_id = (socket_stat.st_dev, socket_stat.st_ino)
+
+    def server_close(self) -> None:
+        socketserver.UnixStreamServer.server_close(self)
+        # путь мог быть занят сокетом сервиса, запущенного позже (после удаления этого сокета вручную), - такой сокет не удаляется
+        try:
+            socket_stat = os.lstat(self.server_address)
+        except FileNotFoundError:
+            return
+        if (socket_stat.st_dev, socket_stat.st_ino) == self.__socket_id:
+            os.remove(self.server_address)
+
+    def handle_request(self, request:dict) -> dict:
+        """
+        Обработка запроса на генерацию паролей (формат запроса и ответа описан в service_lib)
+        :param request: запрос
+        :return: ответ
+        """
+        return self.__service.handle_request(request)
+
+
+# клиент сервиса генерации паролей; соединение открывается один раз и используется для всех запросов
+class PwdGenClient():
+    # default constructor
+    def __init__(self, socket_path:str) -> None:
+        self.__file = None
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.connect(socket_path)
+        self.__file = self.__socket.makefile('rwb')
+
+    # default destructor
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__socket.close()
+            self.__file = None
+
+    def request(self, request:dict) -> dict:
+        """
+        Отправка запроса сервису и получение ответа
+        :param request: запрос (формат описан в service_lib)
+        :return: ответ сервиса
+        """
+        self.__file.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.__file.flush()
+        line = self.__file.readline()
+        if not line:
+            raise ConnectionError('connection closed by the server')
+        return json.loads(line)
+
+
+def serve(socket_path:str, pwd_gen, xkcd_obj) -> None:
+    """
+    Запуск сервиса генерации паролей; работает до прерывания (Ctrl+C / SIGINT)
+    :param socket_path: путь к Unix-сокету
+    :param pwd_gen: объект PwdGen
+    :param xkcd_obj: объект XKCD
+    :return: None
+    """
+    # словари загружаются до начала обслуживания запросов
+    pwd_gen.load_dictionaries()
+    try:
+        server = PwdGenServer(socket_path, pwd_gen, xkcd_obj)
+    except OSError as err:
+        logger_lib.error(socket_path, err)
+        return
+    with server:
+        logger_lib.info(socket_path, 'password generator service started')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    logger_lib.info(socket_path, 'password generator service stopped')
@@ -0,0 +1,85 @@
+# region Import
+from _libraries.policy_lib import parse_policy
+# endregion
+
+
+# region Const
+# максимальное количество паролей в одном запросе к сервису
+MAX_REQUEST_COUNT = 100000
+# endregion
+
+
+# обработка запросов на генерацию паролей, общая для сервиса на Unix-сокете (server_lib) и HTTP-сервиса (http_server_lib).
+# запрос: {"engine": "pwdgen" | "xkcd", "preset": "<сложность>", "options": {<параметры парольной фразы>}, "pattern": "<шаблон>",
+#          "policy": {<параметры политики паролей>}, "count": N}
+#   engine - генератор (по умолчанию pwdgen); preset - пресет сложности (для xkcd - обязателен);
+#   options - пользовательские параметры парольной фразы pwdgen (используются вместо preset);
+#   pattern - имя шаблона из конфигурационного файла или шаблон парольной фразы pwdgen (см. pattern_lib; заменяет шаблон по количеству слов);
+#   policy - параметры политики паролей pwdgen (см. policy_lib; дополняют политику конфигурационного файла сервиса);
+#            для xkcd допустимы только min_length и max_length (ограничение длины пароля);
+#   count - количество паролей (по умолчанию 1)
+# ответ: {"passwords": [...], "entropy": <оценка энтропии пароля в битах>} (для pwdgen дополнительно "phrases": [...] - исходные слова)
+#   или {"error": "<описание ошибки>"}
+class PwdGenService():
+    # default constructor
+    def __init__(self, pwd_gen, xkcd_obj) -> None:
+        self.__pwd_gen = pwd_gen
+        self.__xkcd = xkcd_obj
+
+    def handle_request(self, request:dict) -> dict:
+        """
+        Обработка запроса на генерацию паролей
+        :param request: запрос
+        :return: ответ
+        """
+        count = request.get('count', 1)
+        if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= MAX_REQUEST_COUNT:
+            return {'error': f'count must be an integer in the range 1..{MAX_REQUEST_COUNT}'}
+
+        engine = request.get('engine', 'pwdgen')
+        preset = request.get('preset')
+        if engine == 'xkcd':
+            if preset not in self.__xkcd.get_passphrase_presets():
+                return {'error': f'unknown xkcd preset: {preset}'}
+            policy = request.get('policy') or dict()
+            try:
+                if not isinstance(policy, dict) or set(policy) - {'min_length', 'max_length'}:
+                    raise ValueError
+                policy = parse_policy(policy)
+            except ValueError:
+                return {'error': f'invalid policy: {request["policy"]}'}
+            min_length, max_length = policy["min_length"], policy["max_length"]
+            error = self.__xkcd.get_length_error(preset, min_length, max_length)
+            if error is not None:
+                return {'error': f'policy cannot be satisfied: {error}'}
+            return {'passwords': self.__xkcd.generate_batch(preset, count, min_length, max_length),
+                    'entropy': self.__xkcd.get_entropy(preset, min_length, max_length)['bits']}
+
+        if engine == 'pwdgen':
+            if request.get('options') is not None:
+                pwd_options = self.__pwd_gen.check_passphrase_options(request['options'])
+            elif preset in self.__pwd_gen.get_passphrase_presets():
+                pwd_options = self.__pwd_gen.get_passphrase_options(preset)
+            else:
+                return {'error': f'unknown preset: {preset}'}
+            if request.get('pattern') is not None:
+                pattern = self.__pwd_gen.get_pattern(request['pattern']) if isinstance(request['pattern'], str) else None
+                if pattern is None:
+                    return {'error': f'invalid pattern: {request["pattern"]}'}
+                pwd_options = pwd_options.replace(pattern=pattern)
+            policy = request.get('policy') or dict()
+            policy = self.__pwd_gen.get_policy(policy) if isinstance(policy, dict) else None
+            if policy is None:
+                return {'error': f'invalid policy: {request["policy"]}'}
+            if policy:
+                pwd_options = pwd_options.replace(policy=policy)
+                error = self.__pwd_gen.get_policy_error(pwd_options)
+                if error is not None:
+                    return {'error': f'policy cannot be satisfied: {error}'}
+            passphrases = self.__pwd_gen.generate_batch(pwd_options, count)
+            entropy = self.__pwd_gen.get_entropy(pwd_options)
+            return {'passwords': [''.join(passphrase[0]) for passphrase in passphrases],
+                    'phrases': [' '.join(passphrase[1]) for passphrase in passphrases],
+                    'entropy': entropy['bits'] if entropy is not None else None}
+
+        return {'error': f'unknown engine: {engine}'}
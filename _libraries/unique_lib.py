@@ -0,0 +1,226 @@
+# region Import
+import sys
+from array import array
+from contextlib import closing
+
+from _libraries import logger_lib
+# endregion
+
+
+# множество выданных паролей для генерации без повторов (опции --unique, --issued). Пароли не хранятся: хранятся только их 64-битные
+# хэши в таблице с открытой адресацией (array('Q') с линейным пробированием, 8 байт на ячейку, заполнение не более MAX_LOAD_FACTOR),
+# поэтому миллионы паролей занимают 12-23 байта на пароль вместо ~100 байт для set строк.
+# Хэш - встроенный hash() строки (SipHash с ключом, случайным для каждого процесса). Совпадение хэшей разных паролей приводит только
+# к отбрасыванию нового пароля (вместо него генерируется другой), поэтому повтор пароля исключен, а коллизии на скорость практически
+# не влияют (вероятность хотя бы одной коллизии для 10 млн паролей - порядка 3e-6).
+# Пакеты паролей (add_batch) при наличии numpy вставляются векторно: все хэши пакета проходят пробирование одновременно
+class UniqueFilter():
+    # region ClassConst
+    INITIAL_CAPACITY = 1 << 16
+    # доля заполненных ячеек, при превышении которой таблица увеличивается вдвое
+    MAX_LOAD_FACTOR = 0.7
+    # минимальный размер пакета, для которого используется векторная вставка
+    BATCH_MIN_SIZE = 256
+    # количество ячеек старой таблицы, обрабатываемых за один шаг при увеличении таблицы
+    RESIZE_CHUNK_SIZE = 1 << 16
+    # количество хэшей, при котором векторная вставка переходит к поэлементной
+    TAIL_SIZE = 32
+    # значение пустой ячейки; хэш, равный 0, заменяется на 1
+    __EMPTY = 0
+    __HASH_MASK = 0xFFFFFFFFFFFFFFFF
+    # endregion ClassConst
+
+    # default constructor
+    def __init__(self, expected_count:int=0) -> None:
+        self.__table = self.__new_table(self.__get_capacity(expected_count))
+        self.__mask = len(self.__table) - 1
+        self.__count = 0
+        # количество отброшенных повторов (в т.ч. совпадений с ранее выданными паролями)
+        self.__rejected = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __contains__(self, value:str) -> bool:
+        key = (hash(value) & self.__HASH_MASK) or 1
+        table = self.__table
+        ind = key & self.__mask
+        while table[ind] != self.__EMPTY:
+            if table[ind] == key:
+                return True
+            ind = (ind + 1) & self.__mask
+        return False
+
+    def add(self, value:str) -> bool:
+        """
+        Добавление пароля в множество
+        :param value: пароль
+        :return: True - пароль новый (добавлен), False - пароль (или пароль с тем же хэшем) уже был выдан
+        """
+        key = (hash(value) & self.__HASH_MASK) or 1
+        table = self.__table
+        mask = self.__mask
+        ind = key & mask
+        while True:
+            current = table[ind]
+            if current == self.__EMPTY:
+                table[ind] = key
+                self.__count += 1
+                if self.__count > len(table) * self.MAX_LOAD_FACTOR:
+                    self.__resize(self.__count)
+                return True
+            if current == key:
+                self.__rejected += 1
+                return False
+            ind = (ind + 1) & mask
+
+    def add_batch(self, values:list) -> list:
+        """
+        Добавление пакета паролей в множество. Повторы внутри пакета также отбрасываются (добавляется первое вхождение)
+        :param values: список паролей
+        :return: список True/False для каждого пароля (см. add)
+        """
+        from _libraries.pwd_generator_lib import _import_numpy
+
+        numpy = _import_numpy()
+        if numpy is None or len(values) < self.BATCH_MIN_SIZE:
+            return [self.add(value) for value in values]
+
+        keys = numpy.fromiter(map(hash, values), dtype=numpy.int64, count=len(values)).view(numpy.uint64)
+        keys[keys == self.__EMPTY] = 1
+        if self.__count + len(keys) > len(self.__table) * self.MAX_LOAD_FACTOR:
+            self.__resize(self.__count + len(keys))
+        added = self.__insert_keys(numpy, keys)
+        added_count = int(added.sum())
+        self.__count += added_count
+        self.__rejected += len(keys) - added_count
+        return added.tolist()
+
+    def load_issued(self, filename:str, key=None) -> int:
+        """
+        Загрузка ранее выданных паролей из файла (по одному в строке, например, результат предыдущего запуска в режиме --bulk)
+        :param filename: файл с ранее выданными паролями
+        :param key: функция, выделяющая пароль из строки файла (по умолчанию - строка целиком)
+        :return: количество загруженных строк или -1, если файл не удалось считать
+        """
+        loaded = 0
+        try:
+            with closing(open(filename, 'r', encoding='utf-8')) as issued_file:
+                while True:
+                    # файл считывается частями примерно по 1 МиБ
+                    lines = issued_file.readlines(1 << 20)
+                    if not lines:
+                        break
+                    lines = [line.rstrip('\n') for line in lines]
+                    lines = [key(line) if key is not None else line for line in lines if line]
+                    self.add_batch(lines)
+                    loaded += len(lines)
+        except Exception as err:
+            logger_lib.error(filename, err)
+            return -1
+        # совпадения внутри файла ранее выданных паролей не являются отброшенными при генерации
+        self.__rejected = 0
+        return loaded
+
+    def get_stats(self) -> dict:
+        """
+        Статистика множества
+        :return: словарь: items - количество паролей, rejected - отброшено повторов, capacity - количество ячеек таблицы,
+            memory_mb - объем памяти, занятый таблицей
+        """
+        return {
+            'items': self.__count,
+            'rejected': self.__rejected,
+            'capacity': len(self.__table),
+            'memory_mb': round(sys.getsizeof(self.__table) / (1024 * 1024), 2)
+        }
+
+    def __get_capacity(self, count:int) -> int:
+        """
+        Количество ячеек таблицы (степень двойки), достаточное для count хэшей
+        :param count: количество хэшей
+        :return: количество ячеек
+        """
+        capacity = self.INITIAL_CAPACITY
+        while capacity * self.MAX_LOAD_FACTOR < count:
+            capacity *= 2
+        return capacity
+
+    @staticmethod
+    def __new_table(capacity:int) -> array:
+        """
+        Создание пустой таблицы
+        :param capacity: количество ячеек
+        :return: массив array('Q')
+        """
+        # повторение массива из одного элемента не создает временного объекта размером с таблицу (в отличие от bytes(8 * capacity))
+        return array('Q', [0]) * capacity
+
+    def __resize(self, count:int) -> None:
+        """
+        Увеличение таблицы до размера, достаточного для count хэшей, с повторной вставкой всех хэшей
+        :param count: количество хэшей
+        :return: None
+        """
+        from _libraries.pwd_generator_lib import _import_numpy
+
+        old_table = self.__table
+        self.__table = self.__new_table(self.__get_capacity(count))
+        self.__mask = len(self.__table) - 1
+        numpy = _import_numpy()
+        if numpy is not None:
+            # старая таблица обрабатывается частями, чтобы объем временных массивов не зависел от размера таблицы
+            old_keys = numpy.frombuffer(old_table, dtype=numpy.uint64)
+            for start in range(0, len(old_keys), self.RESIZE_CHUNK_SIZE):
+                keys = old_keys[start:start + self.RESIZE_CHUNK_SIZE]
+                self.__insert_keys(numpy, keys[keys != self.__EMPTY])
+            return
+
+        table = self.__table
+        mask = self.__mask
+        for key in old_table:
+            if key != self.__EMPTY:
+                ind = key & mask
+                while table[ind] != self.__EMPTY:
+                    ind = (ind + 1) & mask
+                table[ind] = key
+
+    def __insert_keys(self, numpy, keys):
+        """
+        Векторная вставка хэшей с линейным пробированием. Повторы внутри пакета отбрасываются заранее (остается первое вхождение),
+        далее на каждом шаге все еще не вставленные хэши сравниваются с ячейками таблицы: совпадение - повтор, занятая другим хэшем
+        ячейка - переход к следующей ячейке, пустая ячейка - запись хэша. Если в одну пустую ячейку записано несколько хэшей,
+        вставленным считается тот, который остался в ячейке, остальные сравниваются с той же ячейкой на следующем шаге.
+        Последние TAIL_SIZE хэшей вставляются поэлементно: при малом количестве хэшей шаг векторной вставки дороже.
+        Таблица должна быть достаточного размера (счетчики количества не изменяются)
+        :param numpy: модуль numpy
+        :param keys: массив хэшей (uint64), не содержащий 0
+        :return: массив bool: True - хэш вставлен, False - хэш уже был в таблице (или ранее в пакете)
+        """
+        table = numpy.frombuffer(self.__table, dtype=numpy.uint64)
+        added = numpy.zeros(len(keys), dtype=bool)
+        _, pending = numpy.unique(keys, return_index=True)
+        pending_keys = keys[pending]
+        slots = (pending_keys & numpy.uint64(self.__mask)).astype(numpy.intp)
+        while pending.size > self.TAIL_SIZE:
+            current = table[slots]
+            empty = current == self.__EMPTY
+            table[slots[empty]] = pending_keys[empty]
+            inserted = empty & (table[slots] == pending_keys)
+            added[pending[inserted]] = True
+
+            occupied = ~empty & (current != pending_keys)
+            retry = occupied | (empty & ~inserted)
+            slots = numpy.where(occupied, (slots + 1) & self.__mask, slots)[retry]
+            pending = pending[retry]
+            pending_keys = pending_keys[retry]
+
+        table = self.__table
+        mask = self.__mask
+        for ind, key, slot in zip(pending.tolist(), pending_keys.tolist(), slots.tolist()):
+            while table[slot] != self.__EMPTY and table[slot] != key:
+                slot = (slot + 1) & mask
+            if table[slot] == self.__EMPTY:
+                table[slot] = key
+                added[ind] = True
+        return added
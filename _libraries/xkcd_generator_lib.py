@@ -1,9 +1,55 @@
 # region Import
-from random import choice
-from xkcdpass import xkcd_password
+from os import path
+from array import array
+from threading import Lock
+
+from _libraries.entropy_pool_lib import ThreadLocalPool
+from _libraries.dict_cache_lib import DictCache
+from _libraries.entropy_lib import get_distribution_entropy, get_uniform_entropy
+from _libraries.length_lib import LengthSampler
 # endregion
 
 
+# реестр загруженных словарей xkcd: (файл словаря, допустимые символы, минимальная и максимальная длина слова) -> список слов.
+# Словарь загружается и фильтруется один раз на процесс, после чего список слов разделяется всеми объектами XKCD
+# (в т.ч. созданными в разных потоках сервиса генерации)
+_wordlists = dict()
+_wordlists_lock = Lock()
+
+
+def get_wordlist(filename:str, valid_chars:str, min_length:int, max_length:int, cache_dir:str=None):
+    """
+    Получение отфильтрованного списка слов словаря xkcd из реестра словарей. При первом обращении словарь загружается из кэша словарей
+    или фильтруется функцией xkcd_password.generate_wordlist (результат помещается в кэш словарей). Библиотека xkcdpass импортируется
+    только для фильтрации словаря, поэтому при наличии актуального кэша она не загружается
+    :param filename: файл словаря
+    :param valid_chars: регулярное выражение допустимых символов слова
+    :param min_length: минимальная длина слова
+    :param max_length: максимальная длина слова
+    :param cache_dir: каталог кэша словарей (None - каталог по умолчанию)
+    :return: список слов (list или поле скомпилированного словаря)
+    """
+    def build_wordlist() -> list:
+        from xkcdpass import xkcd_password
+
+        return [xkcd_password.generate_wordlist(
+            wordfile=filename,
+            valid_chars=valid_chars,
+            min_length=min_length,
+            max_length=max_length,
+        )]
+
+    key = (path.abspath(filename) if filename is not None else None, valid_chars, min_length, max_length)
+    wordlist = _wordlists.get(key)
+    if wordlist is not None:
+        return wordlist
+    # загрузка выполняется под блокировкой, чтобы потоки, одновременно обратившиеся к еще не загруженному словарю, не загружали его повторно
+    with _wordlists_lock:
+        if key not in _wordlists:
+            _wordlists[key] = DictCache(cache_dir).load(filename, f'xkcd:{valid_chars}:{min_length}:{max_length}', build_wordlist)[0]
+        return _wordlists[key]
+
+
 # класс, реализующий генерирование паролей на основе библиотеки xkcd
 # GitHub - https://github.com/redacted/XKCD-password-generator
 # webcomic - https://xkcd.com/936/
@@ -60,37 +106,298 @@ class XKCD():
             'delimiter': ''
         }
     }
+    # способы изменения регистра слов (аналогично xkcd_password.CASE_METHODS); функции принимают список слов и источник случайных чисел.
+    # при способе random каждое слово переводится в верхний регистр с вероятностью 1/2 по значению из пула энтропии
+    # (xkcd_password.random_case использует некриптографический генератор модуля random)
+    __CASE_METHODS = {
+        'alternating': lambda words, randomizer: [word.upper() if ind % 2 == 0 else word.lower() for ind, word in enumerate(words)],
+        'upper': lambda words, randomizer: [word.upper() for word in words],
+        'lower': lambda words, randomizer: [word.lower() for word in words],
+        'random': lambda words, randomizer: [word.upper() if randomizer.randrange(2) else word for word in words],
+        'first': lambda words, randomizer: [word.capitalize() for word in words],
+        'capitalize': lambda words, randomizer: [word.capitalize() for word in words]
+    }
+    # количество паролей, обрабатываемых за один проход пакетной генерации (ограничивает объем временных списков)
+    BATCH_CHUNK_SIZE = 65536
+    # максимальное количество планов генерации с ограничением длины (см. __get_length_plan); при превышении планы удаляются
+    MAX_LENGTH_PLANS = 256
     # endregion ClassConst
 
     # default constructor
-    def __init__(self, filename:str=None):
-        # загрузка словаря
-        self.__wordlist = xkcd_password.generate_wordlist(
-            wordfile=filename,
-            valid_chars='[A-Za-z0-9]', 
-            min_length=3,
-            max_length=10,
-        )
+    def __init__(self, filename:str=None, randomizer=None, cache_dir:str=None):
+        # источник случайных чисел: по умолчанию - пул энтропии (см. PwdGen)
+        self.__randomizer = randomizer if randomizer is not None else ThreadLocalPool()
+        # словарь берется из реестра словарей: загружается один раз на процесс, отфильтрованный список слов сохраняется в кэш словарей,
+        # поэтому при повторных запусках фильтрация не выполняется
+        self.__wordlist = get_wordlist(filename, '[A-Za-z0-9]', 3, 10, cache_dir)
+        # планы пакетной генерации, скомпилированные из пресетов (см. __get_batch_plan)
+        self.__batch_plans = dict()
+        # корзины слов по длине для позиций пресета: сложность -> список {длина: слова} (строятся один раз для всех ограничений длины)
+        self.__length_buckets = dict()
+        # планы генерации паролей с ограничением длины: (сложность, минимальная длина, максимальная длина) -> (корзины слов по позициям,
+        # таблица выбора длин LengthSampler, алфавит разделителей, разделитель слов) (см. __get_length_plan)
+        self.__length_plans = dict()
+        # оценки энтропии пресетов (см. get_entropy): (сложность, минимальная длина, максимальная длина) -> оценка
+        self.__entropy = dict()
+
+    def get_passphrase_presets(self) -> list:
+        """
+        Метод для получения списка, содержащего возможные (допустимые) сложности генерируемых паролей из ключей словаря __PASSPHRASE_PRESETS
+        :return: возможные сложности генерируемых паролей (список)
+        """
+        return list(self.__PASSPHRASE_PRESETS.keys())
+
+    def get_entropy(self, pwd_complexity:str, min_length:int=None, max_length:int=None) -> dict:
+        """
+        Оценка энтропии пароля заданной сложности (см. entropy_lib). Энтропия слова вычисляется по таблице слов позиции плана пакетной
+        генерации, т.е. с учетом регистра (при способе random слово и его форма в верхнем регистре - разные варианты, если они различаются);
+        энтропия разделителей - по количеству различных допустимых разделителей (разделитель ставится перед каждым словом и после последнего).
+        При ограничении длины пароля энтропия слова - энтропия выбора его длины (для первого слова - вместе с выбором суммарной длины слов)
+        и среднее по длинам энтропий слов корзины (см. length_lib)
+        :param pwd_complexity: сложность пароля
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        :return: словарь: bits - энтропия пароля, words - список {words, bits} по позициям, delimiters - энтропия разделителей
+        :raises ValueError: если ограничению длины не удовлетворяет ни один пароль
+        """
+        key = (pwd_complexity, min_length, max_length)
+        entropy = self.__entropy.get(key)
+        if entropy is None:
+            tables, delimiters, joiner = self.__get_batch_plan(pwd_complexity)
+            words = list()
+            if min_length is None and max_length is None:
+                for table in tables:
+                    words_count, bits = self.__get_table_entropy(table)
+                    words.append({'words': words_count, 'bits': round(bits, 2)})
+            else:
+                buckets, lengths, delimiters, joiner = self.__get_length_plan(pwd_complexity, min_length, max_length)
+                labels, words_length_bits, positions = lengths.get_distributions()
+                for ind, (bits, lengths_probabilities) in enumerate(positions):
+                    words_count = 0
+                    bits += words_length_bits if ind == 0 else 0.0
+                    for length, probability in lengths_probabilities.items():
+                        bucket_words, bucket_bits = self.__get_table_entropy(buckets[ind][length])
+                        words_count += bucket_words
+                        bits += probability * bucket_bits
+                    words.append({'words': words_count, 'bits': round(bits, 2)})
+            delimiters_bits = (len(tables) + 1) * get_uniform_entropy(len(set(delimiters))) if delimiters is not None else 0.0
+            entropy = {
+                'bits': round(sum(word['bits'] for word in words) + delimiters_bits, 2),
+                'words': words,
+                'delimiters': round(delimiters_bits, 2)
+            }
+            self.__entropy[key] = entropy
+        return entropy
+
+    @staticmethod
+    def __get_table_entropy(table:list) -> tuple:
+        """
+        Энтропия слова, выбираемого равновероятно из таблицы слов (одинаковые слова таблицы - один вариант)
+        :param table: таблица слов
+        :return: кортеж (количество различных слов, энтропия)
+        """
+        variants = dict()
+        for word in table:
+            variants[word] = variants.get(word, 0) + 1
+        return len(variants), get_distribution_entropy(variants.values())
+
+    def get_length_error(self, pwd_complexity:str, min_length:int=None, max_length:int=None) -> str:
+        """
+        Проверка того, что ограничению длины удовлетворяют пароли заданной сложности; план генерации с ограничением длины
+        компилируется при проверке, поэтому последующая генерация его не компилирует повторно
+        :param pwd_complexity: сложность пароля
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        :return: описание ошибки или None, если пароли могут быть сгенерированы
+        """
+        if min_length is None and max_length is None:
+            return None
+        try:
+            self.__get_length_plan(pwd_complexity, min_length, max_length)
+        except ValueError as err:
+            return str(err)
+        return None
 
-    def generate_passphrase(self, pwd_complexity:str) -> str:
+    def generate_passphrase(self, pwd_complexity:str, min_length:int=None, max_length:int=None) -> str:
         """
         Меетод создания пароля по заданной сложности параметрам
         :param pwd_complexity: сложность генерируемого пароля. Сложность аналогичная ключам словаря __PASSPHRASE_PRESETS.
             Используются только готовые пресеты
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
         :return: сгенерированный пароль заданной сложности
         """
+        if min_length is not None or max_length is not None:
+            # длины и слова выбираются по одному случайному числу из корзин слов позиций (см. __get_length_plan)
+            buckets, lengths, delimiters, joiner = self.__get_length_plan(pwd_complexity, min_length, max_length)
+            label, words_lengths, positions = lengths.draw(self.__randomizer.randrange)
+            words = [buckets[ind][length][position] for ind, (length, position) in enumerate(zip(words_lengths, positions))]
+            if delimiters is None:
+                return joiner.join(words)
+            return ''.join(self.__randomizer.choice(delimiters) + word for word in words) + self.__randomizer.choice(delimiters)
         pwd_options = self.__PASSPHRASE_PRESETS.get(pwd_complexity)
-        return xkcd_password.generate_xkcdpassword(
-               wordlist=self.__wordlist,
-               numwords=pwd_options["numwords"],
-               case=pwd_options["case"],
-               random_delimiters=pwd_options["random_delimiters"],
-               valid_delimiters=pwd_options["valid_delimiters"],
-               delimiter='' # pwd_options["valid_delimiters"]
-        )
+        # слова, регистр и разделители выбираются так же, как в xkcd_password.generate_xkcdpassword, но без вызова библиотеки
+        # и с использованием пула энтропии вместо отдельного обращения к ОС на каждый выбор
+        words = [self.__randomizer.choice(self.__wordlist) for ind in range(pwd_options["numwords"])]
+        words = self.__CASE_METHODS[pwd_options["case"]](words, self.__randomizer)
+        if not pwd_options["random_delimiters"]:
+            return pwd_options["delimiter"].join(words)
+        # случайный разделитель ставится перед каждым словом и после последнего слова
+        valid_delimiters = pwd_options["valid_delimiters"]
+        return ''.join(self.__randomizer.choice(valid_delimiters) + word for word in words) + self.__randomizer.choice(valid_delimiters)
+
+    def generate_passphrases(self, pwd_complexity:str, count:int, min_length:int=None, max_length:int=None):
+        """
+        Генератор паролей заданной сложности. Пароли создаются по одному по мере запроса, поэтому потребление памяти не зависит от их количества
+        :param pwd_complexity: сложность генерируемого пароля (аналогично generate_passphrase)
+        :param count: количество паролей
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        :return: генератор паролей
+        """
+        for ind in range(count):
+            yield self.generate_passphrase(pwd_complexity, min_length, max_length)
+
+    def generate_batch(self, pwd_complexity:str, count:int, min_length:int=None, max_length:int=None) -> list:
+        """
+        Пакетная генерация паролей заданной сложности. Пресет один раз компилируется в план (таблицы слов для каждой позиции
+        с уже примененным регистром, алфавит разделителей), после чего для каждой позиции сразу для всего пакета выбираются номера
+        слов или разделителей, а пароли собираются из столбцов. Распределение результатов совпадает с generate_passphrase
+        :param pwd_complexity: сложность генерируемого пароля (аналогично generate_passphrase)
+        :param count: количество паролей
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        :return: список паролей
+        """
+        tables, delimiters, joiner = self.__get_batch_plan(pwd_complexity)
+        use_lengths = min_length is not None or max_length is not None
+        if use_lengths:
+            buckets, lengths, delimiters, joiner = self.__get_length_plan(pwd_complexity, min_length, max_length)
+        passwords = list()
+        # пакет обрабатывается частями, чтобы объем временных списков не зависел от количества паролей
+        for start in range(0, count, self.BATCH_CHUNK_SIZE):
+            size = min(self.BATCH_CHUNK_SIZE, count - start)
+            columns = list()
+            if use_lengths:
+                # при ограничении длины слова всех позиций выбираются по одному случайному числу на пароль (см. length_lib)
+                draws = [lengths.draw(self.__randomizer.randrange) for ind in range(size)]
+                words_columns = [[buckets[col][words_lengths[col]][positions[col]] for label, words_lengths, positions in draws]
+                                 for col in range(len(tables))]
+            else:
+                words_columns = [[table[ind] for ind in self.__batch_randbelow(len(table), size)] for table in tables]
+            for words_column in words_columns:
+                if delimiters is not None:
+                    columns.append([delimiters[ind] for ind in self.__batch_randbelow(len(delimiters), size)])
+                columns.append(words_column)
+            if delimiters is None:
+                passwords.extend(joiner.join(row) for row in zip(*columns))
+            else:
+                # случайный разделитель ставится перед каждым словом и после последнего слова
+                columns.append([delimiters[ind] for ind in self.__batch_randbelow(len(delimiters), size)])
+                passwords.extend(''.join(row) for row in zip(*columns))
+        return passwords
+
+    def __get_batch_plan(self, pwd_complexity:str) -> tuple:
+        """
+        Компиляция пресета в план пакетной генерации. Регистр слов применяется заранее ко всему словарю: для каждой позиции пароля
+        строится таблица слов, из которой слово выбирается равновероятно. При способе random таблица содержит каждое слово дважды -
+        без изменения и в верхнем регистре, поэтому равновероятный выбор из нее равносилен выбору слова и регистра с вероятностью 1/2
+        :param pwd_complexity: сложность генерируемого пароля
+        :return: кортеж: список таблиц слов (по одной на позицию), алфавит разделителей (None - без случайных разделителей),
+            разделитель слов (для пресетов без случайных разделителей)
+        """
+        plan = self.__batch_plans.get(pwd_complexity)
+        if plan is None:
+            pwd_options = self.__PASSPHRASE_PRESETS.get(pwd_complexity)
+            words = list(self.__wordlist)
+            case = pwd_options["case"]
+            if case == 'random':
+                tables = [words + [word.upper() for word in words]] * pwd_options["numwords"]
+            elif case == 'alternating':
+                upper_words = [word.upper() for word in words]
+                lower_words = [word.lower() for word in words]
+                tables = [upper_words if ind % 2 == 0 else lower_words for ind in range(pwd_options["numwords"])]
+            else:
+                tables = [self.__CASE_METHODS[case](words, self.__randomizer)] * pwd_options["numwords"]
+            delimiters = list(pwd_options["valid_delimiters"]) if pwd_options["random_delimiters"] else None
+            plan = (tables, delimiters, pwd_options["delimiter"])
+            self.__batch_plans[pwd_complexity] = plan
+        return plan
+
+    def __get_length_plan(self, pwd_complexity:str, min_length:int, max_length:int) -> tuple:
+        """
+        Компиляция пресета в план генерации паролей с ограничением длины: слова таблицы каждой позиции плана пакетной генерации
+        разбиваются на корзины по длине (длины слов ограничены фильтром словаря, см. __init__), количество и длина разделителей
+        пресета фиксированы, поэтому длина пароля определяется длинами слов. Пароль выбирается сразу нужной длины (см. length_lib):
+        распределение совпадает с распределением паролей без ограничения длины при условии, что длина допустима
+        :param pwd_complexity: сложность генерируемого пароля
+        :param min_length: минимальная длина пароля (None - не ограничена)
+        :param max_length: максимальная длина пароля (None - не ограничена)
+        :return: кортеж: корзины слов по позициям ({длина: слова}), таблица выбора длин LengthSampler, алфавит разделителей
+            (None - без случайных разделителей), разделитель слов
+        :raises ValueError: если ограничению длины не удовлетворяет ни один пароль
+        """
+        key = (pwd_complexity, min_length, max_length)
+        plan = self.__length_plans.get(key)
+        if plan is None:
+            tables, delimiters, joiner = self.__get_batch_plan(pwd_complexity)
+            buckets = self.__length_buckets.get(pwd_complexity)
+            if buckets is None:
+                # таблицы позиций с одинаковым регистром - один и тот же список, поэтому корзины строятся один раз на таблицу
+                table_buckets = dict()
+                for table in tables:
+                    if id(table) not in table_buckets:
+                        table_buckets[id(table)] = dict()
+                        for word in table:
+                            table_buckets[id(table)].setdefault(len(word), list()).append(word)
+                buckets = [table_buckets[id(table)] for table in tables]
+                self.__length_buckets[pwd_complexity] = buckets
+            # разделитель ставится перед каждым словом и после последнего (случайные разделители) или между словами
+            delimiters_length = len(tables) + 1 if delimiters is not None else len(joiner) * (len(tables) - 1)
+            extras = [(None, delimiters_length, 1)]
+            lengths = LengthSampler([{length: len(bucket) for length, bucket in position_buckets.items()} for position_buckets in buckets],
+                                    extras, min_length, max_length)
+            if not lengths.get_total():
+                lengths_range = lengths.get_lengths_range(extras)
+                raise ValueError(f'password length is always in the range {lengths_range[0]}..{lengths_range[1]} with these options')
+            plan = (buckets, lengths, delimiters, joiner)
+            # количество планов ограничено, т.к. ограничения длины могут передаваться в запросах к сервису
+            if len(self.__length_plans) >= self.MAX_LENGTH_PLANS:
+                self.__length_plans.clear()
+                self.__entropy.clear()
+            self.__length_plans[key] = plan
+        return plan
+
+    def __batch_randbelow(self, n:int, size:int) -> list:
+        """
+        Список случайных целых чисел из диапазона [0, n) без смещения. Случайные байты для всего списка запрашиваются одним обращением
+        к источнику случайных чисел и разбираются как беззнаковые целые (array, обычно 32 бита); значения из неполного последнего интервала длины n
+        отбрасываются и выбираются повторно (rejection sampling)
+        :param n: верхняя граница диапазона (не включается), n > 0 (много меньше 2^32)
+        :param size: количество чисел
+        :return: список случайных целых чисел
+        """
+        itemsize = array('I').itemsize
+        limit = (2 ** (8 * itemsize) // n) * n
+        result = list()
+        while len(result) < size:
+            values = array('I', self.__get_random_bytes((size - len(result)) * itemsize))
+            result.extend(value % n for value in values if value < limit)
+        return result
+
+    def __get_random_bytes(self, count:int) -> bytes:
+        """
+        Получение случайных байтов от источника случайных чисел (пул энтропии или объект с интерфейсом random.SystemRandom)
+        :param count: количество байтов
+        :return: случайные байты
+        """
+        if hasattr(self.__randomizer, 'getbytes'):
+            return self.__randomizer.getbytes(count)
+        return self.__randomizer.randbytes(count)
 
     def __weak(self):
         # Не используется. Метод генерации слабого пароля: 3 слова без раздетилей
+        from xkcdpass import xkcd_password
         return xkcd_password.generate_xkcdpassword(
                wordlist=self.__wordlist,
                numwords=3, 
@@ -99,6 +406,7 @@ class XKCD():
 
     def __normal(self):
         # Не используется. Метод генерации слабого пароля: 4 слова, разделитель в виде случайной цифры
+        from xkcdpass import xkcd_password
         return xkcd_password.generate_xkcdpassword(
             self.__wordlist,
             numwords=4,
@@ -109,6 +417,7 @@ class XKCD():
 
     def __strong(self):
         # Не используется. Метод генерации слабого пароля: 5 слов и большой выбор разделителей  
+        from xkcdpass import xkcd_password
         return xkcd_password.generate_xkcdpassword(
             self.__wordlist,
             numwords=5,
@@ -136,10 +445,12 @@ class XKCD():
 
     def __custom(self):
         # Не используется. Метод генерации кастомных паролей
+        from random import choice
         delimiters_full = self.DELIMITERS_NUMBERS + self.DELIMITERS_SPECIAL
         # count: int, separators: bool, prefixes: bool
         count, separators, prefixes = self.__get_custom_password_params()
         # Произвольный пароль: сложность зависит от настроек пользователя
+        from xkcdpass import xkcd_password
         pwd = xkcd_password.generate_xkcdpassword(
             self.__wordlist,
             numwords=count,
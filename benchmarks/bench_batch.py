@@ -0,0 +1,30 @@
+# region Import
+import tempfile
+from os import path
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+# endregion
+
+
+# бенчмарк пакетной генерации: скорость generate_batch (numpy) в сравнении с последовательными вызовами generate_passphrase
+def main():
+    count = 200000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    pwd_options = {'words_count': 3, 'char_count': 4, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+    try:
+        pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'))
+        # первый вызов загружает словари; он не входит в замер
+        pwd_gen.generate_batch(pwd_options, 1)
+        sequential = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), count)
+        batch = measure_rate(lambda: pwd_gen.generate_batch(pwd_options, count), 1) * count
+        print(f'generate_passphrase: {sequential:12.0f} passphrases/s')
+        print(f'generate_batch:      {batch:12.0f} passphrases/s ({batch / sequential:.1f}x)')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+# region Import
+import tracemalloc
+from random import SystemRandom
+from time import perf_counter
+
+from bench_utils import DIR_DICTIONARIES, measure_rate
+from _libraries.dict_worker_lib import DictFileWorker, COMPILED_DICT_EXTENSION
+# endregion
+
+
+# бенчмарк скомпилированного словаря: время загрузки, выделенная память и скорость случайного выбора слова
+# для текстового словаря (список строк) и скомпилированного (mmap + таблица смещений) на примере ru/nouns.txt
+def main():
+    filename = f'{DIR_DICTIONARIES}/ru/nouns.txt'
+    compiled_filename = filename[:-len('.txt')] + COMPILED_DICT_EXTENSION
+    worker = DictFileWorker()
+    if worker._compile_dict_file(filename, compiled_filename, 'utf-8') != 0:
+        return
+    randomizer = SystemRandom()
+
+    for title, loader in [('text', lambda: worker._read_dict_words(filename, 'utf-8')),
+                          ('compiled', lambda: worker._open_compiled_dict(compiled_filename))]:
+        tracemalloc.start()
+        start = perf_counter()
+        words = loader()
+        load_time = perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        rate = measure_rate(lambda: randomizer.choice(words), 200000)
+        print(f'{title:>8}: load {load_time * 1000:8.1f} ms, allocated {allocated / 2 ** 20:7.2f} MiB, '
+              f'{rate:10.0f} random picks/s ({len(words)} words)')
+        del words
+
+
+if __name__ == '__main__':
+    main()
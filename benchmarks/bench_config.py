@@ -0,0 +1,103 @@
+# region Import
+import shutil
+import tempfile
+from os import path
+from itertools import cycle
+from configparser import ConfigParser
+from multiprocessing import Process
+
+from bench_utils import measure_rate
+from _libraries import configuration_lib
+from _libraries.configuration_lib import Config
+# endregion
+
+
+DEFAULTS = {'words_count': 4, 'char_count': 3, 'use_numbers': True, 'use_special': False, 'use_upper_case': False}
+
+
+def writer(conf_filename:str, count:int, words_count:int) -> None:
+    """
+    Процесс, многократно записывающий в конфигурационный файл свой набор параметров
+    :param conf_filename: конфигурационный файл
+    :param count: количество записей
+    :param words_count: значение words_count, по которому отличаются наборы параметров разных процессов
+    :return: None
+    """
+    config = Config(conf_filename, DEFAULTS)
+    for ind in range(count):
+        # значение чередуется, чтобы каждая запись изменяла файл
+        config.set_options(dict(DEFAULTS, words_count=words_count, char_count=3 + ind % 3))
+
+
+def reader(conf_filename:str, count:int) -> None:
+    """
+    Процесс, многократно считывающий конфигурационный файл напрямую (без кэша) и проверяющий, что файл не записан частично
+    :param conf_filename: конфигурационный файл
+    :param count: количество считываний
+    :return: None
+    """
+    torn = 0
+    for ind in range(count):
+        config = ConfigParser()
+        config.read(conf_filename)
+        if not config.has_section('passphrase') or len(config['passphrase']) != len(DEFAULTS):
+            torn += 1
+    if torn:
+        raise SystemExit(f'{torn} torn reads')
+
+
+# бенчмарк конфигурационного файла: считывание с разбором файла и из кэша процесса, повторное считывание без изменения файла,
+# запись (атомарная, под блокировкой) с изменением и без изменения параметров, одновременная запись несколькими процессами
+# с проверкой того, что читающий процесс ни разу не увидел частично записанный файл
+def main():
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    conf_filename = path.join(conf_dir, 'conf.ini')
+    count = 5000
+    try:
+        config = Config(conf_filename, DEFAULTS)
+
+        def read_plain():
+            ConfigParser().read(conf_filename)
+
+        def write_plain():
+            plain_config = ConfigParser()
+            plain_config.read_dict({'passphrase': DEFAULTS})
+            with open(conf_filename, 'w') as ini_file:
+                plain_config.write(ini_file)
+
+        # другой объект Config того же процесса (например, генератор другого рабочего потока) - файл берется из кэша процесса
+        other_config = Config(conf_filename, DEFAULTS)
+
+        def read_other():
+            other_config._Config__stamp = None
+            other_config.read_settings()
+
+        def read_uncached():
+            configuration_lib._settings_cache.clear()
+            read_other()
+
+        print(f'ConfigParser.read (old)    {measure_rate(read_plain, count):10.0f}/s')
+        print(f'read_settings (parse)      {measure_rate(read_uncached, count):10.0f}/s')
+        print(f'read_settings (cache)      {measure_rate(read_other, count):10.0f}/s')
+        print(f'read_settings (no change)  {measure_rate(config.read_settings, count):10.0f}/s')
+        print(f'reload_settings (no change){measure_rate(config.reload_settings, count):10.0f}/s')
+        print(f'ConfigParser.write (old)   {measure_rate(write_plain, count // 5):10.0f}/s')
+        config.read_settings()
+        print(f'set_options (no change)    {measure_rate(lambda: config.set_options(DEFAULTS), count):10.0f}/s')
+        # параметры чередуются, чтобы каждая запись изменяла файл
+        options = cycle([dict(DEFAULTS, char_count=4), dict(DEFAULTS, char_count=5)])
+        print(f'set_options (changed)      {measure_rate(lambda: config.set_options(next(options)), count // 5):10.0f}/s')
+
+        processes = [Process(target=writer, args=(conf_filename, 300, words_count)) for words_count in range(2, 6)]
+        processes.append(Process(target=reader, args=(conf_filename, 3000)))
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        print(f'concurrent writers: 4 x 300 writes, reader exit code {processes[-1].exitcode} (0 - no torn reads)')
+    finally:
+        shutil.rmtree(conf_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
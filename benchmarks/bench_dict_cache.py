@@ -0,0 +1,35 @@
+# region Import
+import tempfile
+from os import path
+from time import perf_counter
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.xkcd_generator_lib import XKCD
+# endregion
+
+
+# бенчмарк постоянного кэша словарей: время создания генераторов и первой парольной фразы (загрузка словарей)
+# без кэша (разбор текстовых словарей и запись кэша) и с актуальным кэшем (открытие файлов кэша)
+def main():
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    cache_dir = tempfile.mkdtemp(prefix='pwdgen-bench-cache-')
+    pwd_options = {'words_count': 3, 'char_count': 4, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+    try:
+        for title in ['cold (no cache)', 'warm (cached)']:
+            start = perf_counter()
+            PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir=cache_dir).generate_passphrase(pwd_options)
+            pwd_gen_time = perf_counter() - start
+            start = perf_counter()
+            XKCD(f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt', cache_dir=cache_dir).generate_passphrase('super')
+            xkcd_time = perf_counter() - start
+            print(f'{title:>16}: PwdGen {pwd_gen_time * 1000:9.1f} ms, XKCD {xkcd_time * 1000:7.1f} ms')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+        cleanup_dictionaries(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
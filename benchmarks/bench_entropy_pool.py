@@ -0,0 +1,55 @@
+# region Import
+import tempfile
+from os import path
+from random import SystemRandom
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.xkcd_generator_lib import XKCD
+from _libraries.entropy_pool_lib import EntropyPool
+# endregion
+
+
+# SystemRandom с подсчетом обращений к ОС: каждый вызов random() и getrandbits() - отдельный вызов os.urandom
+class CountingSystemRandom(SystemRandom):
+    def __init__(self):
+        super().__init__()
+        self.syscalls = 0
+
+    def random(self):
+        self.syscalls += 1
+        return super().random()
+
+    def getrandbits(self, k):
+        self.syscalls += 1
+        return super().getrandbits(k)
+
+
+# микробенчмарк пула энтропии: количество системных вызовов на парольную фразу и скорость генерации
+# для SystemRandom (вызов ОС на каждый выбор) и EntropyPool (блоки по 64 KiB)
+def main():
+    count = 20000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    # парольная фраза из трех слов (NOUN INFN NOUN) с цифрами, спецсимволами и заглавными буквами
+    pwd_options = {'words_count': 3, 'char_count': 4, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+    try:
+        for title, randomizer in [('SystemRandom', CountingSystemRandom()), ('EntropyPool', EntropyPool())]:
+            pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), randomizer=randomizer)
+            pwd_gen.generate_passphrase(pwd_options)
+            rate = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), count)
+            syscalls = randomizer.syscalls if isinstance(randomizer, CountingSystemRandom) else randomizer.get_stats()['refills']
+            print(f'PwdGen {title:>12}: {rate:10.0f} passphrases/s, {syscalls / (count + 1):8.4f} syscalls/passphrase')
+
+        for title, randomizer in [('SystemRandom', CountingSystemRandom()), ('EntropyPool', EntropyPool())]:
+            xkcd_obj = XKCD(f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt', randomizer=randomizer)
+            rate = measure_rate(lambda: xkcd_obj.generate_passphrase('super'), count)
+            syscalls = randomizer.syscalls if isinstance(randomizer, CountingSystemRandom) else randomizer.get_stats()['refills']
+            print(f'XKCD   {title:>12}: {rate:10.0f} passphrases/s, {syscalls / count:8.4f} syscalls/passphrase')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# region Import
+from time import perf_counter
+
+from bench_utils import DIR_DICTIONARIES
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.dict_worker_lib import DictFileWorker
+# endregion
+
+
+def legacy_change_layout(word:str) -> str:
+    """
+    Прежний способ смены раскладки: посимвольный поиск буквы в строке раскладки и конкатенация строк
+    :param word: слово на русском языке
+    :return: слово в английской раскладке
+    """
+    tr_wrd = ''
+    for ltr in word:
+        tr_wrd = tr_wrd + PwdGen.ENG_LAYOUT[PwdGen.RUS_LAYOUT.find(ltr)]
+    return tr_wrd
+
+
+# бенчмарк смены раскладки: время на миллион слов для посимвольной замены, str.translate и выборки готового слова из таблицы
+def main():
+    words = DictFileWorker()._read_dict_words(f'{DIR_DICTIONARIES}/ru/nouns.txt', 'utf-8')
+    words = (words * (1000000 // len(words) + 1))[:1000000]
+
+    start = perf_counter()
+    legacy = [legacy_change_layout(word) for word in words]
+    legacy_time = perf_counter() - start
+
+    start = perf_counter()
+    translated = [word.translate(PwdGen.LAYOUT_TABLE) for word in words]
+    translate_time = perf_counter() - start
+
+    # при генерации слово в английской раскладке берется из предварительно вычисленной таблицы и усекается
+    start = perf_counter()
+    for ind in range(len(translated)):
+        translated[ind][:4]
+    lookup_time = perf_counter() - start
+
+    assert legacy == translated
+    print(f'per-character find + concat: {legacy_time:8.3f} s per million words')
+    print(f'str.translate:               {translate_time:8.3f} s per million words')
+    print(f'precomputed lookup + slice:  {lookup_time:8.3f} s per million words')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# region Import
+import tempfile
+from os import path
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.xkcd_generator_lib import XKCD
+from _libraries.policy_lib import parse_policy
+# endregion
+
+
+def with_rejection(generate, min_length:int, max_length:int):
+    """
+    Генерация с отбраковкой: пароли генерируются без ограничения длины, пока длина пароля не окажется допустимой
+    :param generate: функция генерации пароля (возвращает строку пароля)
+    :param min_length: минимальная длина пароля
+    :param max_length: максимальная длина пароля
+    :return: функция генерации пароля допустимой длины
+    """
+    def generate_password() -> str:
+        while True:
+            password = generate()
+            if min_length <= len(password) <= max_length:
+                return password
+    return generate_password
+
+
+# бенчмарк генерации паролей заданной длины: генерация с отбраковкой (пароли без ограничения длины до пароля допустимой длины)
+# и генерация по корзинам слов по длине (см. length_lib) - по одному и пакетами, а также энтропия пароля при ограничении длины.
+# Для PwdGen основой служит политика с требованием цифры, при которой число записывается фиксированным количеством цифр, как и при
+# ограничении длины, поэтому оба способа дают одинаковое распределение
+def main():
+    count = 20000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    try:
+        pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir='')
+        pwd_gen.load_dictionaries()
+        base_options = dict(pwd_gen.get_passphrase_options('strong'), policy=parse_policy({'require': 'digit'}))
+        for min_length, max_length in [(25, 25), (22, 22), (20, 23)]:
+            options = dict(base_options, policy=parse_policy({'require': 'digit', 'min_length': min_length, 'max_length': max_length}))
+            rejection = measure_rate(with_rejection(lambda: ''.join(pwd_gen.generate_passphrase(base_options)[0]), min_length, max_length),
+                                     count // 20)
+            # первые генерации компилируют шаблон и создают массивы словарей и не входят в замер
+            pwd_gen.generate_batch(options, pwd_gen.BATCH_MIN_SIZE)
+            bucketed = measure_rate(lambda: pwd_gen.generate_passphrase(options), count)
+            batch = measure_rate(lambda: pwd_gen.generate_batch(options, count * 5), 1) * count * 5
+            print(f'pwdgen strong {min_length}..{max_length:<3} rejection {rejection:8.0f}/s, bucketed {bucketed:8.0f}/s, '
+                  f'batch {batch:8.0f}/s, entropy {pwd_gen.get_entropy(options)["bits"]:6.2f} bits')
+
+        xkcd_obj = XKCD(f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt', cache_dir='')
+        for preset, min_length, max_length in [('super', 48, 48), ('super', 36, 36), ('strong', 30, 32)]:
+            rejection = measure_rate(with_rejection(lambda: xkcd_obj.generate_passphrase(preset), min_length, max_length), count // 20)
+            xkcd_obj.generate_batch(preset, 1, min_length, max_length)
+            bucketed = measure_rate(lambda: xkcd_obj.generate_passphrase(preset, min_length, max_length), count)
+            batch = measure_rate(lambda: xkcd_obj.generate_batch(preset, count * 5, min_length, max_length), 1) * count * 5
+            print(f'xkcd {preset:<6} {min_length}..{max_length:<5} rejection {rejection:8.0f}/s, bucketed {bucketed:8.0f}/s, '
+                  f'batch {batch:8.0f}/s, entropy {xkcd_obj.get_entropy(preset, min_length, max_length)["bits"]:6.2f} bits')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# region Import
+import os
+import sys
+import hashlib
+import tempfile
+from os import path
+from time import perf_counter
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.parallel_lib import ParallelGen
+# endregion
+
+
+# бенчмарк масштабирования многопроцессной генерации (--workers): скорость ParallelGen для 1..N рабочих процессов
+# в сравнении с генерацией в одном процессе. Время включает запуск рабочих процессов и загрузку словарей из кэша.
+# Затем проверяется воспроизводимость: вывод с заданным seed (хеш всех блоков) должен совпадать при любом количестве рабочих процессов;
+# при расхождении бенчмарк завершается с ненулевым кодом
+def main():
+    count = 1000000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    cache_dir = tempfile.mkdtemp(prefix='pwdgen-bench-cache-')
+    pwd_options = {'words_count': 3, 'char_count': 4, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+    cpu_count = os.cpu_count() or 1
+    workers_list = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)) | {1, 2})
+    try:
+        # словари помещаются в кэш до замеров (так же, как это делает --workers перед запуском рабочих процессов)
+        pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir=cache_dir)
+        pwd_gen.load_dictionaries()
+        start = perf_counter()
+        for block_start in range(0, count, 16384):
+            '\n'.join(f"{''.join(passphrase[0])}\t {' '.join(passphrase[1])}"
+                      for passphrase in pwd_gen.generate_batch(pwd_options, min(16384, count - block_start)))
+        single = count / (perf_counter() - start)
+        print(f'CPU count: {cpu_count}, passphrases: {count}')
+        print(f'single process: {single:12.0f} passphrases/s')
+        for workers in workers_list:
+            parallel_gen = ParallelGen(workers, dict_dir, path.join(conf_dir, 'conf.ini'), None, cache_dir)
+            start = perf_counter()
+            lines = sum(block.count('\n') for block in parallel_gen.generate_passphrase_blocks(pwd_options, count))
+            rate = lines / (perf_counter() - start)
+            print(f'workers={workers:<3}     {rate:12.0f} passphrases/s ({rate / single:.2f}x)')
+
+        digests = dict()
+        for workers in [1, 2, 3]:
+            parallel_gen = ParallelGen(workers, dict_dir, path.join(conf_dir, 'conf.ini'), f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt',
+                                       cache_dir, seed='bench')
+            digest = hashlib.md5()
+            for blocks in [parallel_gen.generate_passphrase_blocks(pwd_options, 40000), parallel_gen.generate_xkcd_blocks('super', 40000)]:
+                for block in blocks:
+                    digest.update(block.encode('utf-8'))
+            digests[workers] = digest.hexdigest()
+            print(f'seeded output, workers={workers}: {digests[workers]}')
+        if len(set(digests.values())) != 1:
+            sys.exit('seeded output depends on the number of workers')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+        cleanup_dictionaries(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# region Import
+import tempfile
+from os import path
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+# endregion
+
+
+# бенчмарк скомпилированных шаблонов парольных фраз: скорость генерации по встроенному шаблону (по количеству слов), по такому же
+# пользовательскому шаблону и по шаблону с правилами позиций (количество букв и регистр), по одной и пакетами. Пользовательский
+# шаблон компилируется один раз, поэтому генерация по нему не должна быть медленнее генерации по встроенному шаблону
+def main():
+    count = 200000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    try:
+        pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir='')
+        pwd_gen.load_dictionaries()
+        base_options = {'words_count': 5, 'char_count': 3, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+        cases = [
+            ('built-in (words_count=5)', base_options),
+            ('user, same parts', dict(base_options, pattern=pwd_gen.get_pattern('ADJF NOUN INFN ADJF NOUN'))),
+            ('user, NUMR and rules', dict(base_options, pattern=pwd_gen.get_pattern('ADJF:4 NOUN INFN NUMR:5:upper NOUN:lower'))),
+        ]
+        for name, pwd_options in cases:
+            # первая генерация компилирует шаблон и не входит в замер
+            pwd_gen.generate_batch(pwd_options, pwd_gen.BATCH_MIN_SIZE)
+            sequential = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), count // 4)
+            batch = measure_rate(lambda: pwd_gen.generate_batch(pwd_options, count), 1) * count
+            print(f'{name:<26} generate_passphrase {sequential:8.0f}/s, generate_batch {batch:8.0f}/s')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
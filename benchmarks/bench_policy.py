@@ -0,0 +1,65 @@
+# region Import
+import tempfile
+from os import path
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.policy_lib import parse_policy
+# endregion
+
+
+def satisfies(passphrase:list, policy:dict) -> bool:
+    """
+    Проверка пароля политикой паролей (для генерации с отбраковкой)
+    :param passphrase: парольная фраза в формате generate_passphrase
+    :param policy: политика в каноническом виде (см. policy_lib)
+    :return: True - пароль удовлетворяет политике, False - в противном случае
+    """
+    password = ''.join(passphrase[0])
+    checks = {'digit': str.isdigit, 'upper': str.isupper, 'special': lambda ch: ch in PwdGen.SPECIAL}
+    return ((policy['min_length'] is None or len(password) >= policy['min_length'])
+            and (policy['max_length'] is None or len(password) <= policy['max_length'])
+            and all(any(checks[item](ch) for ch in password) for item in policy['require'])
+            and not set(policy['forbid']).intersection(password))
+
+
+# бенчмарк политики паролей: генерация с отбраковкой (generate_passphrase в цикле до пароля, удовлетворяющего политике) и генерация
+# по скомпилированной политике (каждая парольная фраза удовлетворяет политике), а также энтропия пароля при политике
+def main():
+    count = 20000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    pwd_options = {'words_count': 4, 'char_count': 3, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+    policies = [
+        ('forbid quotes', {'forbid': '"\'\\`'}),
+        ('forbid layout', {'forbid': '"\'\\`[]{};:,.<>'}),
+        ('length 16, forbid', {'min_length': 16, 'max_length': 16, 'forbid': '"\'\\`[]{};:,.<>'}),
+    ]
+    try:
+        pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir='')
+        pwd_gen.load_dictionaries()
+        base_rate = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), count)
+        print(f'{"no policy":<18} generate_passphrase {base_rate:8.0f}/s, entropy {pwd_gen.get_entropy(pwd_options)["bits"]:6.2f} bits')
+        for name, policy in policies:
+            policy = parse_policy(policy)
+            options = dict(pwd_options, policy=policy)
+
+            def generate_with_rejection() -> list:
+                while True:
+                    passphrase = pwd_gen.generate_passphrase(pwd_options)
+                    if satisfies(passphrase, policy):
+                        return passphrase
+
+            rejection = measure_rate(generate_with_rejection, count // 4)
+            pwd_gen.generate_passphrase(options)
+            compiled = measure_rate(lambda: pwd_gen.generate_passphrase(options), count)
+            batch = measure_rate(lambda: pwd_gen.generate_batch(options, count * 5), 1) * count * 5
+            print(f'{name:<18} rejection {rejection:8.0f}/s, compiled {compiled:8.0f}/s, batch {batch:8.0f}/s, '
+                  f'entropy {pwd_gen.get_entropy(options)["bits"]:6.2f} bits')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
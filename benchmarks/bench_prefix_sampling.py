@@ -0,0 +1,38 @@
+# region Import
+import tempfile
+from os import path
+from collections import Counter
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+# endregion
+
+
+# бенчмарк способов выбора слов (PwdGen.SAMPLING_MODES): энтропия пароля, неравномерность префиксов (отношение частоты самого частого
+# префикса к средней) и скорость генерации для выбора случайного слова (word) и случайного префикса (prefix)
+def main():
+    count = 200000
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    try:
+        for char_count in [3, 4, 5]:
+            pwd_options = {'words_count': 3, 'char_count': char_count, 'use_numbers': False, 'use_special': False, 'use_upper_case': False}
+            for sampling in PwdGen.SAMPLING_MODES:
+                # кэш словарей отключен: группы префиксов строятся заново при первом обращении, оно не входит в замер
+                pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir='', sampling=sampling)
+                pwd_gen.generate_batch(pwd_options, pwd_gen.BATCH_MIN_SIZE)
+                sequential = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), count // 4)
+                passphrases = list()
+                batch = measure_rate(lambda: passphrases.extend(pwd_gen.generate_batch(pwd_options, count)), 1) * count
+                # неравномерность - по префиксам второго слова (глагол)
+                prefixes = Counter(passphrase[0][1] for passphrase in passphrases)
+                skew = max(prefixes.values()) / (count / len(prefixes))
+                print(f'char_count={char_count} {sampling:<7} entropy {pwd_gen.get_entropy(pwd_options)["bits"]:6.2f} bits, '
+                      f'top prefix {skew:6.1f}x mean, generate_passphrase {sequential:8.0f}/s, generate_batch {batch:8.0f}/s')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# region Import
+import tempfile
+from os import path
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.drbg_lib import RNG_MODES, make_randomizer
+# endregion
+
+
+# бенчмарк источников случайных байтов (drbg_lib.RNG_MODES): скорость выдачи байтов, скорость генерации парольных фраз по одной
+# и пакетами, а также проверка воспроизводимости: два генератора с одним seed должны выдать одинаковые парольные фразы
+def main():
+    count = 200000
+    block_size = 1 << 20
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    pwd_options = {'words_count': 4, 'char_count': 4, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}
+    try:
+        for rng, seed in [(RNG_MODES[0], None), (RNG_MODES[1], None), (RNG_MODES[1], 'bench')]:
+            randomizer = make_randomizer(rng, seed, 'pwdgen')
+            bytes_rate = measure_rate(lambda: randomizer.getbytes(block_size), 64) * block_size / 2 ** 20
+            pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), randomizer=randomizer, cache_dir='')
+            pwd_gen.generate_batch(pwd_options, pwd_gen.BATCH_MIN_SIZE)
+            sequential = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), count // 4)
+            batch = measure_rate(lambda: pwd_gen.generate_batch(pwd_options, count), 1) * count
+            print(f'{rng:<6} seed={str(seed):<5} bytes {bytes_rate:7.0f} MiB/s, generate_passphrase {sequential:8.0f}/s, '
+                  f'generate_batch {batch:8.0f}/s')
+
+        streams = list()
+        for ind in range(2):
+            pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), randomizer=make_randomizer('drbg', 'bench', 'pwdgen'), cache_dir='')
+            streams.append([pwd_gen.generate_passphrase(pwd_options) for ind in range(1000)] + pwd_gen.generate_batch(pwd_options, 10000))
+        print(f'seeded streams identical: {streams[0] == streams[1]}')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
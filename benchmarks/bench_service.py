@@ -0,0 +1,47 @@
+# region Import
+import tempfile
+import threading
+from os import path
+from time import perf_counter
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.xkcd_generator_lib import XKCD
+from _libraries.server_lib import PwdGenServer, PwdGenClient
+# endregion
+
+
+# бенчмарк сервиса генерации паролей: задержка запроса через Unix-сокет при постоянном соединении клиента
+def main():
+    count = 5000
+    dict_dir = prepare_dictionaries()
+    work_dir = tempfile.mkdtemp(prefix='pwdgen-bench-service-')
+    socket_path = path.join(work_dir, 'pwdgen.sock')
+    try:
+        pwd_gen = PwdGen(dict_dir, path.join(work_dir, 'conf.ini'))
+        pwd_gen.load_dictionaries()
+        server = PwdGenServer(socket_path, pwd_gen, XKCD(f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt'))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = PwdGenClient(socket_path)
+        requests = {
+            'pwdgen': {'engine': 'pwdgen', 'options': {'words_count': 3, 'char_count': 4, 'use_numbers': True, 'use_special': True, 'use_upper_case': True}},
+            'xkcd': {'engine': 'xkcd', 'preset': 'super'}
+        }
+        for title, request in requests.items():
+            latencies = list()
+            for ind in range(count):
+                start = perf_counter()
+                client.request(request)
+                latencies.append(perf_counter() - start)
+            latencies.sort()
+            print(f'{title:>6}: p50 {latencies[len(latencies) // 2] * 1000:.3f} ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms')
+        client.close()
+        server.shutdown()
+        server.server_close()
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+# region Import
+import bench_utils
+from _libraries.benchmark_lib import STARTUP_MODES, measure_startup
+# endregion
+
+
+# бенчмарк времени запуска утилиты в каждом режиме (интерпретатор, импорт модулей, создание только необходимых генераторов)
+def main():
+    for mode, args in STARTUP_MODES.items():
+        result = measure_startup(args, 5)
+        print(f'{mode:<8} wall {result["wall_ms"]:8.1f} ms, imports {result["import_ms"]:8.1f} ms, '
+              f'peak RSS {result["peak_rss_mb"]} MiB   (main.py {" ".join(args)})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# region Import
+import sys
+import time
+import tempfile
+import threading
+from os import path
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.entropy_pool_lib import EntropyPool
+from _libraries.parallel_lib import generate_batch_threaded
+# endregion
+
+
+def run_threads(pwd_gen:PwdGen, pwd_options:dict, threads:int, count:int) -> tuple:
+    """
+    Одновременная генерация парольных фраз по одной в нескольких потоках одним генератором
+    :param pwd_gen: генератор PwdGen
+    :param pwd_options: параметры парольной фразы
+    :param threads: количество потоков
+    :param count: количество парольных фраз на поток
+    :return: кортеж (парольных фраз в секунду, количество различных паролей, количество паролей)
+    """
+    results = [None] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(ind:int) -> None:
+        barrier.wait()
+        results[ind] = [''.join(pwd_gen.generate_passphrase(pwd_options)[0]) for _ in range(count)]
+
+    workers = [threading.Thread(target=worker, args=(ind,)) for ind in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    passwords = [password for result in results for password in result]
+    return len(passwords) / elapsed, len(set(passwords)), len(passwords)
+
+
+# нагрузочный тест генератора PwdGen, разделяемого потоками: генерация по одной парольной фразе в 1..32 потоках с пулом энтропии,
+# общим для всех потоков (одна блокировка), и с буфером пула в каждом потоке (по умолчанию), а также пакетная генерация
+# пулом потоков (generate_batch_threaded). Каждый прогон проверяет, что потоки не выдают одинаковые пароли (общий буфер пула
+# без блокировки выдавал бы одни и те же байты нескольким потокам). На сборках CPython со включенным GIL потоки
+# выполняются по очереди, и тест показывает накладные расходы синхронизации; на сборках без GIL (free-threaded) - масштабирование.
+# При повторе паролей тест завершается с ненулевым кодом
+def main():
+    count = 4000
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+    print(f'python {sys.version.split()[0]}, GIL {"enabled" if gil_enabled else "disabled (free-threaded build)"}')
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    try:
+        generators = {
+            'shared pool': PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), randomizer=EntropyPool(), cache_dir=''),
+            'thread pools': PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'), cache_dir='')
+        }
+        for name, pwd_gen in generators.items():
+            pwd_options = pwd_gen.get_passphrase_options('strong')
+            # первая генерация загружает словари и компилирует шаблон и не входит в замер
+            pwd_gen.generate_passphrase(pwd_options)
+            for threads in [1, 2, 4, 8, 16, 32]:
+                rate, unique, total = run_threads(pwd_gen, pwd_options, threads, count)
+                print(f'{name:<13} {threads:>2} threads {rate:9.0f}/s  unique {unique}/{total}')
+                if unique != total:
+                    sys.exit(f'{name}, {threads} threads: {total - unique} repeated passwords')
+
+        pwd_gen = generators['thread pools']
+        pwd_options = pwd_gen.get_passphrase_options('strong')
+        batch_count = 200000
+        for threads in [1, 2, 4, 8]:
+            passphrases = list()
+            rate = measure_rate(lambda: passphrases.append(generate_batch_threaded(pwd_gen, pwd_options, batch_count, threads)), 1) * batch_count
+            unique = len({''.join(passphrase[0]) for passphrase in passphrases[-1]})
+            print(f'batch threaded {threads:>2} threads {rate:9.0f}/s  unique {unique}/{batch_count}')
+            if unique != batch_count:
+                sys.exit(f'batch threaded, {threads} threads: {batch_count - unique} repeated passwords')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(conf_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# region Import
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from bench_utils import DIR_DICTIONARIES
+from _libraries.xkcd_generator_lib import XKCD
+from _libraries.unique_lib import UniqueFilter
+# endregion
+
+
+def measure(build) -> tuple:
+    """
+    Замер времени и пикового объема памяти, выделенной при построении множества. Память замеряется отдельным запуском,
+    т.к. tracemalloc замедляет выделение памяти
+    :param build: функция без аргументов, строящая множество
+    :return: кортеж (время, с; объем памяти, МиБ; множество)
+    """
+    start = perf_counter()
+    build()
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    result = build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), result
+
+
+# бенчмарк множества выданных паролей (опция --unique): скорость добавления и объем памяти UniqueFilter в сравнении с set строк,
+# а также загрузка файла ранее выданных паролей (опция --issued). Пароли генерируются заранее и в замер не входят
+def main():
+    count = 1000000
+    passwords = XKCD(f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt').generate_batch('strong', count)
+    # хэш строки вычисляется при первом обращении и кэшируется в строке, поэтому вычисляется до замеров, одинаково для всех вариантов
+    for password in passwords:
+        hash(password)
+
+    def build_filter():
+        unique_filter = UniqueFilter()
+        for password in passwords:
+            unique_filter.add(password)
+        return unique_filter
+
+    def build_filter_batch():
+        # пакетами по BULK_BLOCK_SIZE, как при выводе в режиме --unique
+        unique_filter = UniqueFilter()
+        for start in range(0, count, 4096):
+            unique_filter.add_batch(passwords[start:start + 4096])
+        return unique_filter
+
+    def build_set():
+        seen = set()
+        for password in passwords:
+            if password not in seen:
+                seen.add(password)
+        return seen
+
+    # строки паролей уже созданы, поэтому для set учитывается только память самого множества; при чтении файла ранее выданных паролей
+    # set хранил бы и строки (см. строку 'strings' ниже)
+    filter_time, filter_memory, _ = measure(build_filter)
+    batch_time, batch_memory, unique_filter = measure(build_filter_batch)
+    set_time, set_memory, _ = measure(build_set)
+    strings_memory = sum(map(sys.getsizeof, passwords)) / (1024 * 1024)
+    print(f'{count} passwords')
+    print(f'UniqueFilter.add:       {count / filter_time:10.0f} inserts/s, {filter_memory:7.1f} MiB '
+          f'({filter_memory * 1024 * 1024 / count:5.1f} bytes/password)')
+    print(f'UniqueFilter.add_batch: {count / batch_time:10.0f} inserts/s, {batch_memory:7.1f} MiB '
+          f'({batch_memory * 1024 * 1024 / count:5.1f} bytes/password)')
+    print(f'set:                    {count / set_time:10.0f} inserts/s, {set_memory:7.1f} MiB '
+          f'({set_memory * 1024 * 1024 / count:5.1f} bytes/password, + ~{strings_memory:.0f} MiB of strings)')
+    print(f'UniqueFilter.add_batch duplicates rejected: {unique_filter.get_stats()["rejected"]}')
+
+    fd, issued_filename = tempfile.mkstemp(prefix='pwdgen-issued-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as issued_file:
+            issued_file.write('\n'.join(passwords) + '\n')
+
+        def load_issued():
+            issued_filter = UniqueFilter()
+            issued_filter.load_issued(issued_filename)
+            return issued_filter
+
+        load_time, load_memory, _ = measure(load_issued)
+        print(f'load_issued:            {count / load_time:10.0f} lines/s, {load_memory:7.1f} MiB')
+    finally:
+        os.remove(issued_filename)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# region Import
+import sys
+import shutil
+import tempfile
+from os import path, listdir
+from re import split
+from time import perf_counter
+# endregion
+
+
+# region Params
+DIR_BASE = '/'.join(split(r'[\\/]', path.abspath(__file__))[:-2])
+DIR_DICTIONARIES = DIR_BASE + '/_dictionaries'
+# endregion
+
+# корень репозитория добавляется в sys.path, чтобы бенчмарки запускались как отдельные скрипты
+if DIR_BASE not in sys.path:
+    sys.path.insert(0, DIR_BASE)
+
+
+def prepare_dictionaries() -> str:
+    """
+    Подготовка каталога со словарями для бенчмарков: текстовые словари _dictionaries/ru и их манифест копируются во временный каталог,
+    поэтому скомпилированные словари (compile_dicts.py), если они есть, не используются, а кэш словарей строится по новым файлам
+    :return: путь к временному каталогу со словарями (удаляется вызывающим кодом через cleanup_dictionaries)
+    """
+    from _libraries.dict_manifest_lib import DICT_MANIFEST_FILENAME
+
+    dict_dir = tempfile.mkdtemp(prefix='pwdgen-bench-')
+    for name in listdir(f'{DIR_DICTIONARIES}/ru'):
+        if name.endswith('.txt') or name == DICT_MANIFEST_FILENAME:
+            shutil.copyfile(f'{DIR_DICTIONARIES}/ru/{name}', f'{dict_dir}/{name}')
+    return dict_dir
+
+
+def cleanup_dictionaries(dict_dir:str) -> None:
+    """
+    Удаление временного каталога со словарями, созданного prepare_dictionaries
+    :param dict_dir: путь к временному каталогу
+    :return: None
+    """
+    shutil.rmtree(dict_dir, ignore_errors=True)
+
+
+def measure_rate(func, count:int) -> float:
+    """
+    Замер производительности: функция вызывается count раз подряд
+    :param func: функция без аргументов, производительность которой замеряется
+    :param count: количество вызовов
+    :return: количество вызовов в секунду
+    """
+    start = perf_counter()
+    for ind in range(count):
+        func()
+    return count / (perf_counter() - start)
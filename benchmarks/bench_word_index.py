@@ -0,0 +1,43 @@
+# region Import
+import tempfile
+from os import path
+from random import SystemRandom
+
+from bench_utils import prepare_dictionaries, cleanup_dictionaries, measure_rate
+from _libraries.pwd_generator_lib import PwdGen
+from _libraries.dict_worker_lib import DictFileWorker
+# endregion
+
+
+# бенчмарк индекса слов PwdGen: сравнение скорости генерации парольных фраз (пресет weak: NOUN INFN NOUN)
+# до (словарь считывается из файла при выборе каждого слова) и после (словари загружаются в индекс один раз)
+def main():
+    dict_dir = prepare_dictionaries()
+    conf_filename = path.join(tempfile.mkdtemp(prefix='pwdgen-bench-conf-'), 'conf.ini')
+    try:
+        pwd_gen = PwdGen(dict_dir, conf_filename)
+        pwd_options = pwd_gen.get_passphrase_options('weak')
+
+        # воспроизведение прежнего пути: чтение файла словаря на каждое слово парольной фразы
+        worker = DictFileWorker()
+        randomizer = SystemRandom()
+        filenames = {'NOUN': f'{dict_dir}/nouns.txt', 'INFN': f'{dict_dir}/verbs.txt'}
+
+        def legacy_passphrase():
+            return [randomizer.choice(worker._read_dict_file(filenames[prt], 'utf-8'))[:-1].lower() for prt in ['NOUN', 'INFN', 'NOUN']]
+
+        before = measure_rate(legacy_passphrase, 20)
+        # первый вызов загружает словари в индекс; он не входит в замер
+        pwd_gen.generate_passphrase(pwd_options)
+        after = measure_rate(lambda: pwd_gen.generate_passphrase(pwd_options), 20000)
+
+        print(f'before (read per word): {before:12.1f} passphrases/s')
+        print(f'after (word index):     {after:12.1f} passphrases/s')
+        print(f'speedup:                {after / before:12.1f}x')
+    finally:
+        cleanup_dictionaries(dict_dir)
+        cleanup_dictionaries(path.dirname(conf_filename))
+
+
+if __name__ == '__main__':
+    main()
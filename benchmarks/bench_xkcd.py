@@ -0,0 +1,39 @@
+# region Import
+from time import perf_counter
+from xkcdpass import xkcd_password
+
+from bench_utils import DIR_DICTIONARIES, measure_rate
+from _libraries.xkcd_generator_lib import XKCD
+# endregion
+
+
+# бенчмарк генератора XKCD: создание объекта (загрузка словаря и обращение к реестру словарей) и скорость генерации паролей
+# в сравнении с xkcd_password.generate_xkcdpassword
+def main():
+    count = 100000
+    filename = f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt'
+    # cache_dir='' отключает кэш словарей: первое создание объекта фильтрует словарь функцией generate_wordlist
+    start = perf_counter()
+    xkcd_obj = XKCD(filename, cache_dir='')
+    print(f'XKCD() first (filtering): {(perf_counter() - start) * 1000:9.3f} ms')
+    start = perf_counter()
+    XKCD(filename, cache_dir='')
+    print(f'XKCD() again (registry):  {(perf_counter() - start) * 1000:9.3f} ms')
+
+    wordlist = xkcd_password.generate_wordlist(wordfile=filename, valid_chars='[A-Za-z0-9]', min_length=3, max_length=10)
+    delimiters = XKCD.DELIMITERS_NUMBERS + XKCD.DELIMITERS_SPECIAL + XKCD.DELIMITERS_BRACKETS
+    library = measure_rate(lambda: xkcd_password.generate_xkcdpassword(wordlist, numwords=6, case='capitalize', delimiter='',
+                                                                        random_delimiters=True, valid_delimiters=delimiters), count)
+    native = measure_rate(lambda: xkcd_obj.generate_passphrase('super'), count)
+    print(f'generate_xkcdpassword (super): {library:10.0f} passwords/s')
+    print(f'generate_passphrase (super):   {native:10.0f} passwords/s ({native / library:.1f}x)')
+    for pwd_complexity in xkcd_obj.get_passphrase_presets():
+        # первый вызов компилирует план пресета; он не входит в замер
+        xkcd_obj.generate_batch(pwd_complexity, 1)
+        single = measure_rate(lambda: xkcd_obj.generate_passphrase(pwd_complexity), count)
+        batch = measure_rate(lambda: xkcd_obj.generate_batch(pwd_complexity, count), 1) * count
+        print(f'{pwd_complexity:<8} generate_passphrase {single:10.0f}/s, generate_batch {batch:10.0f}/s ({batch / single:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# region Import
+import json
+import asyncio
+import argparse
+import tempfile
+import threading
+from os import path
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries
+# endregion
+
+
+async def run_client(host:str, port:int, target:str, requests_count:int, latencies:list, errors:list) -> None:
+    """
+    Клиент нагрузочного теста: отправляет запросы последовательно по одному соединению (keep-alive)
+    :param host: адрес HTTP-сервиса
+    :param port: порт HTTP-сервиса
+    :param target: путь и параметры запроса
+    :param requests_count: количество запросов
+    :param latencies: список, в который добавляются задержки успешных запросов (секунды)
+    :param errors: список, в который добавляются коды ответов неуспешных запросов
+    :return: None
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f'GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode('latin-1')
+    for ind in range(requests_count):
+        start = perf_counter()
+        writer.write(request)
+        head = await reader.readuntil(b'\r\n\r\n')
+        status = int(head.split(b' ', 2)[1])
+        length = int([line for line in head.split(b'\r\n') if line.lower().startswith(b'content-length:')][0].split(b':')[1])
+        json.loads(await reader.readexactly(length))
+        if status == 200:
+            latencies.append(perf_counter() - start)
+        else:
+            errors.append(status)
+    writer.close()
+
+
+async def run_load(url:str, concurrency:int, requests_count:int) -> None:
+    """
+    Нагрузочный тест: concurrency параллельных клиентов, всего requests_count запросов; выводит p50/p99 задержки и запросы в секунду
+    :param url: адрес запроса (например, http://127.0.0.1:8080/passphrase?compl=strong&count=1)
+    :param concurrency: количество параллельных соединений
+    :param requests_count: общее количество запросов
+    :return: None
+    """
+    parts = urlsplit(url)
+    target = parts.path + (f'?{parts.query}' if parts.query else '')
+    latencies = list()
+    errors = list()
+    start = perf_counter()
+    await asyncio.gather(*[run_client(parts.hostname, parts.port, target, requests_count // concurrency, latencies, errors)
+                           for ind in range(concurrency)])
+    elapsed = perf_counter() - start
+    latencies.sort()
+    if latencies:
+        print(f'{url}: {len(latencies) / elapsed:9.0f} req/s, p50 {latencies[len(latencies) // 2] * 1000:7.3f} ms, '
+              f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.3f} ms, errors {len(errors)}')
+    else:
+        print(f'{url}: all {len(errors)} requests failed')
+
+
+def start_local_server(port:int) -> list:
+    """
+    Запуск HTTP-сервиса в отдельном потоке этого же процесса (если адрес сервиса не указан)
+    :param port: порт
+    :return: список временных каталогов, которые необходимо удалить после теста
+    """
+    from _libraries.pwd_generator_lib import PwdGen
+    from _libraries.xkcd_generator_lib import XKCD
+    from _libraries.http_server_lib import PwdGenHttpServer
+
+    dict_dir = prepare_dictionaries()
+    conf_dir = tempfile.mkdtemp(prefix='pwdgen-bench-conf-')
+    pwd_gen = PwdGen(dict_dir, path.join(conf_dir, 'conf.ini'))
+    pwd_gen.load_dictionaries()
+    http_server = PwdGenHttpServer(pwd_gen, XKCD(f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt'))
+    started = threading.Event()
+
+    async def run():
+        server = await http_server.start('127.0.0.1', port)
+        started.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(run()), daemon=True).start()
+    started.wait()
+    return [dict_dir, conf_dir]
+
+
+# нагрузочный тест HTTP-сервиса генерации паролей (main.py --http PORT); без опции --url сервис запускается в этом же процессе
+def main():
+    parser = argparse.ArgumentParser(description='Load test for the password generator HTTP service')
+    parser.add_argument('--url', action='append', help='Request URL (may be repeated); a local service is started if omitted')
+    parser.add_argument('--concurrency', type=int, default=32, help='Number of parallel keep-alive connections')
+    parser.add_argument('--requests', type=int, default=20000, help='Total number of requests per URL')
+    parser.add_argument('--port', type=int, default=8765, help='Port of the local service')
+    args = parser.parse_args()
+
+    temp_dirs = list()
+    urls = args.url
+    if not urls:
+        temp_dirs = start_local_server(args.port)
+        urls = [f'http://127.0.0.1:{args.port}/passphrase?words_count=3&char_count=4&use_numbers=yes&use_special=yes&use_upper_case=yes',
+                f'http://127.0.0.1:{args.port}/xkcd?compl=super']
+    try:
+        for url in urls:
+            asyncio.run(run_load(url, args.concurrency, args.requests))
+    finally:
+        for temp_dir in temp_dirs:
+            cleanup_dictionaries(temp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+# region Import
+import json
+import argparse
+
+from bench_utils import DIR_DICTIONARIES, prepare_dictionaries, cleanup_dictionaries
+from _libraries.benchmark_lib import Benchmark
+# endregion
+
+
+# набор бенчмарков утилиты (аналог main.py --benchmark) для запуска отдельным скриптом. Словари PwdGen копируются из _dictionaries/ru
+# во временный каталог (см. prepare_dictionaries), поэтому скомпилированные словари (compile_dicts.py) не влияют на замеры загрузки словарей
+def main():
+    parser = argparse.ArgumentParser(description='Password generator benchmark suite (JSON output)')
+    parser.add_argument('-o', '--output', help='Output file (stdout by default)')
+    args = parser.parse_args()
+
+    dict_dir = prepare_dictionaries()
+    try:
+        results = json.dumps(Benchmark(dict_dir, f'{DIR_DICTIONARIES}/xkcd/eff_large_wordlist.txt').run(), ensure_ascii=False, indent=2)
+    finally:
+        cleanup_dictionaries(dict_dir)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out_file:
+            out_file.write(results + '\n')
+    else:
+        print(results)
+
+
+if __name__ == '__main__':
+    main()
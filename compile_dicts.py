@@ -0,0 +1,40 @@
+# region Import
+from os import path
+from re import split
+# endregion
+
+
+# region Params
+DIR_BASE = '/'.join(split(r'[\\/]', path.abspath(__file__))[:-1])
+# каталог словарей генератора PwdGen; файлы и кодировки словарей описаны в его манифесте (см. dict_manifest_lib)
+DIR_DICTIONARIES = DIR_BASE + '/_dictionaries/ru'
+# endregion
+
+
+# компиляция текстовых словарей в бинарный формат с таблицей смещений (см. dict_worker_lib) - слово и его форма в английской
+# раскладке; скомпилированный словарь записывается рядом с текстовым и используется PwdGen вместо него, пока текстовый файл
+# не будет изменен
+def main():
+    from _libraries.dict_worker_lib import DictFileWorker, COMPILED_DICT_EXTENSION
+    from _libraries.dict_manifest_lib import DictManifest, DictionaryError
+    from _libraries.pwd_generator_lib import PwdGen
+    from _libraries import logger_lib
+
+    try:
+        manifest = DictManifest(DIR_DICTIONARIES)
+        manifest.check(manifest.get_parts())
+    except DictionaryError as err:
+        logger_lib.error('Dictionaries', err)
+        return
+
+    worker = DictFileWorker()
+    for prt in manifest.get_parts():
+        src_filename = manifest.get_filename(prt)
+        dst_filename = path.splitext(src_filename)[0] + COMPILED_DICT_EXTENSION
+        # вторым полем записи сохраняется слово в английской раскладке (см. PwdGen.LAYOUT_TABLE)
+        if worker._compile_dict_file(src_filename, dst_filename, manifest.get_encoding(prt), [PwdGen.LAYOUT_TABLE]) == 0:
+            print(f'{prt}: {path.basename(src_filename)} -> {path.basename(dst_filename)}')
+
+
+if __name__ in '__main__':
+    main()